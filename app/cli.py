@@ -0,0 +1,282 @@
+"""
+Headless batch mode: transforms many exports at once without the Streamlit app.
+
+Example:
+    python app/cli.py exports/ --server "GS SGV2" --cutoff "2024-01-01 00:00:00" --workers 4
+    python app/cli.py "exports/*.csv" --manifest servers.csv --cutoff "2024-01-01 00:00:00" --format csv
+"""
+
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional
+
+from src.core.datetimes import parse_cutoff
+from src.core.engine import add_null_columns
+from src.core.profiles import SERVER_PROFILES
+from src.core.rollups import daily_rollups, rollup_report
+from src.core.schema import file_extension
+from src.core.transform import ENGINES, calculate_adjusted_datetime, process_uploaded_file, processed_filename
+from src.core.validation import ValidationReport
+from src.exports import SQL_BATCH_ROWS, frame_to_csv, write_excel, write_sql_script
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx")
+
+
+class BatchTask(NamedTuple):
+    """A single file to transform."""
+
+    path: str
+    server: str
+    cutoff: str
+    exclude_values: Optional[List[str]]
+    add_lat_lon: bool
+    output_dir: str
+    output_format: str
+    table_name: str
+    engine: str
+    validate: bool
+    rollups: bool
+
+
+class BatchResult(NamedTuple):
+    """The outcome of transforming a single file."""
+
+    path: str
+    server: str
+    rows: int
+    seconds: float
+    output: Optional[str]
+    error: Optional[str]
+    rejected_rows: int = 0
+
+
+def collect_files(inputs: List[str]) -> List[str]:
+    """
+    Expands directories and glob patterns into a sorted list of CSV/XLSX files.
+
+    Args:
+        inputs (List[str]): File paths, directories or glob patterns.
+
+    Returns:
+        List[str]: The matching files, without duplicates.
+    """
+    files = set()
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*")
+        for path in glob.glob(pattern):
+            if os.path.isfile(path) and file_extension(path) in SUPPORTED_EXTENSIONS:
+                files.add(path)
+    return sorted(files)
+
+
+def read_manifest(path: str) -> Dict[str, str]:
+    """
+    Reads a CSV manifest with "file" and "server" columns.
+
+    Args:
+        path (str): Path to the manifest.
+
+    Returns:
+        Dict[str, str]: Mapping of file path or file name to server.
+    """
+    with open(path, newline="", encoding="utf-8") as manifest:
+        return {row["file"].strip(): row["server"].strip() for row in csv.DictReader(manifest)}
+
+
+def resolve_server(path: str, manifest: Dict[str, str], default_server: Optional[str]) -> str:
+    """
+    Looks up the server of a file in the manifest by path, then by file name.
+
+    Args:
+        path (str): The file path.
+        manifest (Dict[str, str]): Mapping of file path or file name to server.
+        default_server (Optional[str]): Server used for files missing from the manifest.
+
+    Returns:
+        str: The server name.
+
+    Raises:
+        ValueError: If no server is known for the file.
+    """
+    server = manifest.get(path) or manifest.get(os.path.basename(path)) or default_server
+    if server is None:
+        raise ValueError(f"No server given for {path}; use --server or add it to the manifest")
+    if server not in SERVER_PROFILES:
+        raise ValueError(f"Unknown server '{server}' for {path}")
+    return server
+
+
+def run_task(task: BatchTask) -> BatchResult:
+    """
+    Transforms one file and writes the output. Runs inside a worker process.
+
+    Args:
+        task (BatchTask): The file to transform.
+
+    Returns:
+        BatchResult: The outcome, with the error message if the file failed.
+    """
+    start = time.perf_counter()
+    report = ValidationReport()
+    try:
+        with open(task.path, "rb") as file:
+            df_processed = process_uploaded_file(
+                file,
+                task.cutoff,
+                calculate_adjusted_datetime(task.server),
+                task.server,
+                exclude_values=task.exclude_values,
+                engine=task.engine,
+                validate=task.validate,
+                report=report,
+            )
+
+        if task.add_lat_lon:
+            add_null_columns(df_processed, ["lat", "lng"])
+
+        output = os.path.join(task.output_dir, processed_filename(task.server, task.path, task.output_format))
+        if task.output_format == "csv":
+            frame_to_csv(df_processed, output)
+        elif task.output_format == "sql":
+            write_sql_script(df_processed, output, task.table_name, SQL_BATCH_ROWS)
+        else:
+            write_excel(df_processed, output)
+
+        # Rows left out by validation are written next to the output, with the codes of the rules they break
+        if report.rejected_rows:
+            rejected = os.path.join(task.output_dir, processed_filename(task.server, task.path, "csv", "rejected"))
+            frame_to_csv(report.rejected, rejected)
+
+        if task.rollups:
+            rollups = os.path.join(task.output_dir, processed_filename(task.server, task.path, "csv", "rollups"))
+            frame_to_csv(rollup_report(daily_rollups(df_processed, task.server)), rollups)
+
+        seconds = time.perf_counter() - start
+        return BatchResult(task.path, task.server, len(df_processed), seconds, output, None, report.rejected_rows)
+    except Exception as e:
+        return BatchResult(task.path, task.server, 0, time.perf_counter() - start, None, str(e))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command-line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Transform robot portal exports into the database input format.")
+    parser.add_argument("inputs", nargs="+", help="CSV/XLSX files, directories or glob patterns")
+    parser.add_argument("--server", choices=list(SERVER_PROFILES), help="Server used for every file")
+    parser.add_argument("--manifest", help="CSV file with 'file' and 'server' columns, overriding --server per file")
+    parser.add_argument("--cutoff", required=True, help='Receive task report time cutoff, e.g. "2024-01-01 12:00:00"')
+    parser.add_argument("--exclude", default="", help="Comma-separated S/N values to exclude")
+    parser.add_argument("--lat-lon", action="store_true", help="Add the lat and lng NULL columns")
+    parser.add_argument("--output-dir", default="transformed", help="Directory the outputs are written to")
+    parser.add_argument(
+        "--format", dest="output_format", choices=["xlsx", "csv", "sql"], default="xlsx", help="Output file format"
+    )
+    parser.add_argument("--table", default="task_reports", help="Table name used in the INSERT statements of --format sql")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--engine", choices=list(ENGINES), default="auto", help="Engine the files are transformed with")
+    parser.add_argument("--rollups", action="store_true", help="Also write the daily totals per robot and map of each file")
+    parser.add_argument(
+        "--no-validation", dest="validate", action="store_false", help="Keep rows breaking the data-quality rules"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the batch transform.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; defaults to sys.argv.
+
+    Returns:
+        int: 0 if every file was transformed, 1 otherwise.
+    """
+    args = parse_args(argv)
+
+    try:
+        parse_cutoff(args.cutoff)
+    except ValueError:
+        print(f"Invalid cutoff '{args.cutoff}', expected YYYY-MM-DD HH:MM:SS", file=sys.stderr)
+        return 1
+
+    files = collect_files(args.inputs)
+    if not files:
+        print("No CSV/XLSX files found", file=sys.stderr)
+        return 1
+
+    manifest = read_manifest(args.manifest) if args.manifest else {}
+    exclude_values = [value.strip() for value in args.exclude.split(",") if value.strip()] or None
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    tasks = []
+    failures = 0
+    for path in files:
+        try:
+            server = resolve_server(path, manifest, args.server)
+        except ValueError as e:
+            print(f"FAIL {path}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+        tasks.append(
+            BatchTask(
+                path,
+                server,
+                args.cutoff,
+                exclude_values,
+                args.lat_lon,
+                args.output_dir,
+                args.output_format,
+                args.table,
+                args.engine,
+                args.validate,
+                args.rollups,
+            )
+        )
+
+    # Outputs are named after the server and the file name only, so files of the same name in different
+    # directories, or a CSV and an Excel export of the same name, would overwrite each other's output
+    by_output: Dict[str, List[BatchTask]] = {}
+    for task in tasks:
+        name = os.path.normcase(processed_filename(task.server, task.path, task.output_format))
+        by_output.setdefault(name, []).append(task)
+    tasks = []
+    for name, group in by_output.items():
+        if len(group) == 1:
+            tasks.extend(group)
+            continue
+        for task in group:
+            others = ", ".join(other.path for other in group if other is not task)
+            print(f"FAIL {task.path}: output {name} would also be written for {others}; rename one of the files", file=sys.stderr)
+            failures += 1
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [executor.submit(run_task, task) for task in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            if result.error is None:
+                rows = f"{result.rows} rows" + (f", {result.rejected_rows} rejected" if result.rejected_rows else "")
+                print(f"OK   {result.path} [{result.server}] {rows} in {result.seconds:.2f}s -> {result.output}")
+            else:
+                failures += 1
+                print(f"FAIL {result.path} [{result.server}] after {result.seconds:.2f}s: {result.error}", file=sys.stderr)
+
+    print(f"Processed {len(files) - failures}/{len(files)} files in {time.perf_counter() - start:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
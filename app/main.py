@@ -1,20 +1,91 @@
 from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+import pandas as pd
 import streamlit as st
 
-# uncomment the following line if you want to use the SQLAlchemy engine for database operations
-# from sqlalchemy import create_engine
-
+from sqlalchemy import Engine
+
+from src.cache import ResultCache, make_cache_key
+from src.core.datetimes import parse_cutoff
+from src.core.engine import add_null_columns, compile_profile, stamp_datetime_columns
+from src.core.instrumentation import configure_logging, instrumentation_enabled, records_to_frame, recording
+from src.core.jobs import JobManager, JobQueueFull
+from src.core.profiles import SERVER_PROFILES, get_profile
+from src.core.rollups import daily_rollups, rollup_report
+from src.core.schema import SchemaMismatchError, suggest_server
+from src.core.validation import ValidationReport, describe_rejections
+from src.loader import DEFAULT_BATCH_ROWS, DEFAULT_KEY_COLUMNS, LOAD_MODES, build_url, create_pooled_engine, load_frame
 from src.utils import (
     calculate_adjusted_datetime,
     display_time,
-    process_uploaded_file,
+    process_uploaded_files,
 )
 
+from src.exports import SQL_BATCH_ROWS, compress_clipboard_text, frame_to_csv, spool_sql_bytes, to_excel_bytes
+from src.watermark import WatermarkStore, latest_report_time
+from src.fingerprints import FingerprintIndex
+from src.rollup_store import RollupStore
 from src.ui_components import (
     copy_content_to_clipboard,
     download_processed_data,
+    download_rejected_rows,
+    download_rollups,
+    download_sql_script,
+    preview_copied_content,
+    preview_processed_data,
 )
 
+
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """Returns the result cache shared by every session of the app."""
+    return ResultCache()
+
+
+@st.cache_resource
+def get_watermark_store() -> WatermarkStore:
+    """Returns the store of the last processed report time of each server."""
+    return WatermarkStore()
+
+
+@st.cache_resource
+def get_fingerprint_index() -> FingerprintIndex:
+    """Returns the index of the task reports already loaded into a database, shared by every session of the app."""
+    return FingerprintIndex()
+
+
+@st.cache_resource
+def get_rollup_store() -> RollupStore:
+    """Returns the store of the daily rollups of loaded task reports."""
+    return RollupStore()
+
+
+@st.cache_resource
+def get_engine(url: str) -> Engine:
+    """Returns the pooled engine of a database URL, reused across reruns and sessions."""
+    engine: Engine = create_pooled_engine(url)
+    return engine
+
+
+@st.cache_resource
+def get_job_manager() -> JobManager[pd.DataFrame]:
+    """Returns the background job queue shared by every session of the app."""
+    return JobManager()
+
+
+# SQLAlchemy drivers of the databases the processed data can be inserted into
+DATABASE_DRIVERS = {"MySQL": "mysql+pymysql", "SQLite": "sqlite"}
+
+# Seconds between refreshes of the progress of a running job
+JOB_POLL_SECONDS = 0.5
+
+# Rows of the rejected rows shown in their preview
+PREVIEW_REJECTED_ROWS = 100
+
+# Functions showing the messages queued for the next run of the script
+MESSAGE_LEVELS = {"success": st.success, "info": st.info, "warning": st.warning, "error": st.error}
+
+
 # Streamlit App Setup
 st.title("Data Processing and Transformation with Streamlit")
 st.markdown("#### This web app performs data processing and transformation to fit the database input format.")
@@ -22,17 +93,60 @@ st.markdown("#### This web app performs data processing and transformation to fi
 # Display times
 sg_time = display_time()
 
+# File upload section
+uploaded_file_label = " ##### Upload one or more CSV or XLSX files for processing."
+uploaded_files = st.file_uploader(uploaded_file_label, type=["csv", "xlsx"], accept_multiple_files=True)
+
+# Name of the uploads in the output file names; several files are merged into one output
+source_name = uploaded_files[0].name if len(uploaded_files) == 1 else "merged"
+
+# Check the headers of the uploads against the selected server before the server selectbox is drawn
+servers = list(SERVER_PROFILES)
+upload_ids = [uploaded_file.file_id for uploaded_file in uploaded_files]
+suggested_server, schema_mismatches = suggest_server(uploaded_files, st.session_state.get("selected_server", servers[0]))
+
+# Switch to the only server matching new uploads; a server picked afterwards is kept and reported instead
+if suggested_server and st.session_state.get("probed_uploads") != upload_ids:
+    st.session_state.selected_server = suggested_server
+    st.info(f"The uploaded files only match {suggested_server}, which is now selected.")
+    schema_mismatches = []
+st.session_state.probed_uploads = upload_ids
+
+for report in schema_mismatches:
+    st.error(report.describe())
+
 # Sidebar options
-servers = ["GS SGV1", "GS SGV2", "GS AUS", "GS QA", "GS CA"]
-selected_server = st.sidebar.selectbox("Select Server", servers)
+selected_server = st.sidebar.selectbox("Select Server", servers, key="selected_server")
+
+# Stage timings, also turned on with the GS_INSTRUMENTATION environment variable
+record_stages = st.sidebar.checkbox("Record Stage Timings", value=instrumentation_enabled())
+track_memory = record_stages and st.sidebar.checkbox("Track Peak Memory (slower)", value=False)
+if record_stages:
+    configure_logging()
+
+# Stage records of the last processed result, kept across reruns
+if "stage_records" not in st.session_state:
+    st.session_state.stage_records = []
+
+T = TypeVar("T")
+
+
+def recorded(builder: Callable[[], T]) -> Callable[[], T]:
+    """Wraps an export builder so its stages are recorded even when it runs on download, outside the script."""
+    if not record_stages:
+        return builder
+    records = st.session_state.stage_records
+
+    def run() -> T:
+        with recording(track_memory, {"server": selected_server}, records):
+            return builder()
+
+    return run
+
 
 # Determine task type and adjusted datetime
 adjusted_datetime = calculate_adjusted_datetime(selected_server)
 
-# File upload section
-uploaded_file_label = " ##### Upload a CSV or XLSX file for processing."
-uploaded_file = st.file_uploader(uploaded_file_label, type=["csv", "xlsx"])
-
 # Input for dynamic exclusion of 'S/N' values
 exclude_sn = st.checkbox("Exclude Specific S/N Values (Check to Expand the Text Field)", value=False)
 exclude_values = None
@@ -46,27 +160,127 @@ if exclude_sn:  # Show text field when toggle is ON
 # Checkbox to add two null columns: lat and lon
 add_lat_lon = st.checkbox("Add Extra Columns for Latitude (lat) and Longitude (lon)")
 
+# Checkbox to drop task reports loaded into a database by an earlier run
+skip_loaded = st.checkbox("Skip Task Reports Already Loaded into a Database", value=True)
+
+# Last report time loaded or exported for the selected server, used when no datetime is entered
+watermark_store = get_watermark_store()
+watermark = watermark_store.get(selected_server)
+
 # Datetime input
 selected_datetime_str = st.text_input(
     "Please Enter the [Receive Task Report Time]",
     value="",
     max_chars=19,
     key="selected_datetime",
+    placeholder=watermark or "YYYY-MM-DD HH:MM:SS",
 )
+if watermark:
+    st.caption(f"Leave empty to continue from the last loaded or exported report time of {selected_server}: {watermark}")
+
+# Initialize the key of the processed result in session state
+if "result_key" not in st.session_state:
+    st.session_state.result_key = None
+
+result_cache = get_result_cache()
+fingerprint_index = get_fingerprint_index()
+rollup_store = get_rollup_store()
+job_manager = get_job_manager()
+
+
+def rejected_key(result_key: str) -> str:
+    """Returns the result cache key of the rows rejected by validation."""
+    return f"{result_key}:rejected"
+
+
+def rollups_key(result_key: str) -> str:
+    """Returns the result cache key of the daily rollups of a result."""
+    return f"{result_key}:rollups"
+
+
+def process_in_background(process_args: Dict[str, object], add_lat_lon: bool, skip_loaded: bool, result_key: str) -> pd.DataFrame:
+    """Processes the uploaded files in a background job and stores the result and its rejected rows in the result cache."""
+    report = ValidationReport()
+    df_processed: pd.DataFrame = process_uploaded_files(**process_args, report=report)
+
+    # Drop the task reports an earlier run already loaded into a database
+    if skip_loaded:
+        df_processed = fingerprint_index.drop_loaded(df_processed)
+
+    # Optionally add 'lat' and 'lon' columns if the checkbox is checked
+    if add_lat_lon:
+        add_null_columns(df_processed, ["lat", "lng"])
+
+    result_cache.put_frame(result_key, df_processed)
+    if report.rejected_rows:
+        result_cache.put_frame(rejected_key(result_key), report.rejected)
+    return df_processed
+
+
+def advance_watermark(df_processed: pd.DataFrame, server: str) -> None:
+    """Moves the server's watermark to the latest report time of a result once it was loaded into a database or exported."""
+    latest = latest_report_time(df_processed)
+    if latest is not None:
+        watermark_store.advance(server, latest)
+
+
+def exported(build: Callable[[], T], df_processed: pd.DataFrame, server: str) -> Callable[[], T]:
+    """Wraps the builder of a download, which only runs when the button is clicked, so the download advances the watermark."""
+
+    def build_and_advance() -> T:
+        artifact = build()
+        advance_watermark(df_processed, server)
+        return artifact
 
-# Initialize df_processed in session state
-if "df_processed" not in st.session_state:
-    st.session_state.df_processed = None
+    return build_and_advance
 
-# Process button
-if st.button("Process"):
+
+def finish_processing(result_key: str, df_processed: pd.DataFrame) -> None:
+    """Queues the messages shown once the result is ready."""
+    # Store the result key in session state; the frame itself lives in the cache
+    st.session_state.result_key = result_key
+    messages: List[Tuple[str, str]] = [("success", "File processed successfully!")]
+
+    # Report cells that could not be parsed as numbers or timestamps
+    invalid_cells = df_processed.attrs.get("invalid_cells")
+    if invalid_cells:
+        details = ", ".join(f"{column} ({count})" for column, count in invalid_cells.items())
+        messages.append(("warning", f"Some values could not be parsed as numbers or timestamps and were set to NULL: {details}"))
+
+    # Report task reports left out because an earlier run loaded them
+    already_loaded = df_processed.attrs.get("already_loaded_rows")
+    if already_loaded:
+        messages.append(("info", f"{already_loaded} task reports were already loaded into a database and were left out."))
+
+    # Report rows left out because they break a data-quality rule
+    rejected_rows = df_processed.attrs.get("rejected_rows")
+    df_rejected = result_cache.get_frame(rejected_key(result_key))
+    if rejected_rows and df_rejected is not None:
+        messages.append(("warning", describe_rejections(rejected_rows, len(df_rejected))))
+    st.session_state.process_messages = messages
+
+
+# Process button, disabled while the uploads do not match the selected server
+process_clicked = st.button("Process", disabled=bool(schema_mismatches))
+
+# Continue from the watermark when no datetime is entered
+if process_clicked and not selected_datetime_str and watermark:
+    selected_datetime_str = watermark
+
+# Parse the input datetime
+selected_datetime: Optional[datetime] = None
+if process_clicked:
     try:
-        # Parse the input datetime
-        selected_datetime = datetime.strptime(selected_datetime_str, "%Y-%m-%d %H:%M:%S")
+        selected_datetime = parse_cutoff(selected_datetime_str)
+    except ValueError:
+        st.error("Invalid datetime format.")
 
-        # Prepare arguments for process_uploaded_file
+# Process the uploads once the input datetime is valid
+if selected_datetime is not None:
+    try:
+        # Prepare arguments for process_uploaded_files
         process_args = {
-            "uploaded_file": uploaded_file,
+            "uploaded_files": uploaded_files,
             "selected_datetime": selected_datetime_str,
             "adjusted_datetime": adjusted_datetime,
             "selected_server": selected_server,
@@ -76,75 +290,257 @@ if st.button("Process"):
         if exclude_sn and exclude_values:
             process_args["exclude_values"] = exclude_values
 
-        # Process the uploaded file
-        df_processed = process_uploaded_file(**process_args)
-
-        # Optionally add 'lat' and 'lon' columns if the checkbox is checked
-        if add_lat_lon:
-            df_processed["lat"] = "NULL"
-            df_processed["lng"] = "NULL"
-
-        # Store result in session state
-        st.session_state.df_processed = df_processed
-        st.success("File processed successfully!")
-
-    except ValueError:
-        st.error("Invalid datetime format.")
+        # Reuse the cached result of the same file content and options
+        if not uploaded_files:
+            raise RuntimeError("Please upload a CSV or XLSX file.")
+        result_key = make_cache_key(
+            [uploaded_file.getvalue() for uploaded_file in uploaded_files],
+            selected_server,
+            selected_datetime_str,
+            process_args.get("exclude_values"),
+            add_lat_lon,
+            skip_loaded,
+        )
+        df_processed = result_cache.get_frame(result_key)
+
+        if df_processed is not None:
+            # Task reports of the cached result may have been loaded since it was processed
+            if skip_loaded:
+                df_remaining = fingerprint_index.drop_loaded(df_processed)
+                if len(df_remaining) < len(df_processed):
+                    result_cache.discard(rollups_key(result_key))
+                    df_processed = df_remaining
+            # Stamp created_at/updated_at with the current time, dropping the exports built with the old one
+            plan = compile_profile(get_profile(selected_server))
+            df_processed = stamp_datetime_columns(df_processed, plan, adjusted_datetime)
+            result_cache.put_frame(result_key, df_processed)
+            finish_processing(result_key, df_processed)
+        else:
+            # Process the uploaded files in the background, dropping task reports repeated across files.
+            # A job already running for the same files and options is attached to instead of started again.
+            st.session_state.stage_records = []
+            job = job_manager.submit(
+                result_key, recorded(lambda: process_in_background(process_args, add_lat_lon, skip_loaded, result_key))
+            )
+            st.session_state.job_key = job.key
+
+    except JobQueueFull as e:
+        st.warning(str(e))
     except Exception as e:
         st.error(f"An error occurred: {e}")
 
-# Load processed DataFrame from session state
-df_processed = st.session_state.get("df_processed", None)
+
+@st.fragment(run_every=JOB_POLL_SECONDS if st.session_state.get("job_key") else None)
+def job_status() -> None:
+    """Shows the progress of the session's job and collects its result once it finishes."""
+    job_key = st.session_state.get("job_key")
+    job = job_manager.get(job_key) if job_key else None
+    if job is None:
+        st.session_state.job_key = None
+        return
+
+    if not job.done:
+        if job.state == "queued":
+            st.caption("Waiting for a free worker...")
+        for stage_name, fraction in job.progress.snapshot().items():
+            st.progress(fraction, text=f"{stage_name} ({fraction:.0%})")
+        if st.button("Cancel", key="cancel_job"):
+            job.cancel()
+        return
+
+    st.session_state.job_key = None
+    if job.state == "done":
+        finish_processing(job.key, job.result())
+    elif job.state == "cancelled":
+        st.session_state.process_messages = [("warning", "Processing was cancelled.")]
+    else:
+        error = job.future.exception()
+        if isinstance(error, SchemaMismatchError):
+            messages = [("error", str(error))]
+            # Point to the server to switch to when the file matches exactly one
+            if len(error.report.servers) == 1:
+                messages.append(("info", f"Select {error.report.servers[0]} in the sidebar to process this file."))
+            st.session_state.process_messages = messages
+        else:
+            st.session_state.process_messages = [("error", f"An error occurred: {error}")]
+
+    # Rerun the whole script so the result is shown
+    st.rerun()
+
+
+job_status()
+
+# Messages of the last processing run, shown once
+for level, message in st.session_state.pop("process_messages", []):
+    MESSAGE_LEVELS[level](message)
+
+# Load processed DataFrame from the result cache
+result_key = st.session_state.get("result_key", None)
+df_processed = result_cache.get_frame(result_key) if result_key else None
+
+if result_key and df_processed is None:
+    st.info("The processed result has expired from the cache. Please click Process again.")
 
 # Display processed data and metadata
 if df_processed is not None:
     st.markdown("### Processed DataFrame:")
-    st.dataframe(df_processed)
+    preview_processed_data(df_processed)
 
     num_rows, num_cols = df_processed.shape
     st.markdown(f"Processed DataFrame Size: {num_cols} columns and {num_rows} rows")
 
     # Add Copy Content Button
     st.markdown("### Copy Content Without Headers:")
-    copy_text = df_processed.to_csv(index=False, header=False)
+    clipboard_payload = result_cache.get_or_build(
+        result_key, "clipboard", recorded(lambda: compress_clipboard_text(df_processed))
+    )
 
     # Collapsible section for content preview
     with st.expander("Preview Copied Content"):
-        st.text_area("Content Preview (excluding headers):", copy_text, height=200)
+        preview_copied_content(df_processed, clipboard_payload)
 
     # Buttons for Copy Content and Download
     col1, col2 = st.columns(2)
 
     with col1:
-        copy_content_to_clipboard(df_processed)
+        copy_content_to_clipboard(df_processed, clipboard_payload)
+        # Copying happens in the browser, so the user confirms it before the watermark moves
+        if st.button("Mark Copied Content as Exported", help="The next run continues after this result."):
+            advance_watermark(df_processed, selected_server)
 
     with col2:
-        download_processed_data(df_processed, uploaded_file.name, selected_server)
-
-    # # Optional: Insert into MySQL database (commented out for now)
-    # # Insert into MySQL section (stays visible after processing)
-    # with st.expander("Insert into MySQL Database (Temporary Credentials)"):
-    #     st.markdown("##### Enter MySQL database credentials:")
-
-    #     host = st.text_input("Host", placeholder="e.g., localhost or mysql.example.com")
-    #     port = st.text_input("Port", value="3306")
-    #     username = st.text_input("Username")
-    #     password = st.text_input("Password", type="password")
-    #     db_name = st.text_input("Database Name")
-    #     table_name = st.text_input("Target Table Name")
-
-    #     if st.button("Insert into MySQL"):
-    #         if not all([host, port, username, password, db_name, table_name]):
-    #             st.error("All fields are required.")
-    #         else:
-    #             try:
-    #                 conn_str = f"mysql+pymysql://{username}:{password}@{host}:{port}/{db_name}"
-    #                 engine = create_engine(conn_str)
-
-    #                 df_to_insert = df_processed.replace("NULL", None)
-    #                 df_to_insert.to_sql(table_name, engine, index=False, if_exists="append")
-
-    #                 st.success(f"Data inserted into `{table_name}` successfully!")
-
-    #             except Exception as e:
-    #                 st.error(f"Failed to insert data: {e}")
+        download_processed_data(
+            df_processed,
+            source_name,
+            selected_server,
+            exported(
+                lambda: result_cache.get_or_build(result_key, "xlsx", recorded(lambda: to_excel_bytes(df_processed))),
+                df_processed,
+                selected_server,
+            ),
+        )
+
+    # Rows left out by validation, with the codes of the rules they break
+    df_rejected = result_cache.get_frame(rejected_key(result_key))
+    if df_rejected is not None:
+        with st.expander(f"Rejected Rows ({len(df_rejected)})"):
+            st.dataframe(df_rejected.head(PREVIEW_REJECTED_ROWS), hide_index=True)
+            download_rejected_rows(
+                df_rejected,
+                source_name,
+                selected_server,
+                lambda: result_cache.get_or_build(
+                    rejected_key(result_key), "csv", recorded(lambda: str(frame_to_csv(df_rejected)))
+                ),
+            )
+
+    # Daily totals per robot and map, of this result and of every task report loaded so far
+    with st.expander("Daily Rollups"):
+        df_rollups = result_cache.get_frame(rollups_key(result_key))
+        if df_rollups is None:
+            df_rollups = rollup_report(daily_rollups(df_processed, selected_server))
+            result_cache.put_frame(rollups_key(result_key), df_rollups)
+        st.dataframe(df_rollups, hide_index=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            download_rollups(
+                lambda: result_cache.get_or_build(
+                    rollups_key(result_key), "csv", recorded(lambda: str(frame_to_csv(df_rollups)))
+                ),
+                source_name,
+                selected_server,
+            )
+        with col2:
+            download_rollups(
+                recorded(lambda: str(frame_to_csv(rollup_report(rollup_store.read(selected_server))))),
+                "history",
+                selected_server,
+                "Download Rollup History",
+            )
+
+    # SQL script with multi-row INSERT statements for the target table
+    with st.expander("Download SQL Script"):
+        sql_table_name = st.text_input("Table Name in INSERT Statements", placeholder="e.g., task_reports")
+        sql_batch_rows = int(st.number_input("Rows per INSERT Statement", value=SQL_BATCH_ROWS, min_value=1, step=100))
+
+        if sql_table_name:
+            download_sql_script(
+                df_processed,
+                source_name,
+                selected_server,
+                sql_table_name,
+                sql_batch_rows,
+                exported(
+                    recorded(lambda: spool_sql_bytes(df_processed, sql_table_name, sql_batch_rows)),
+                    df_processed,
+                    selected_server,
+                ),
+            )
+
+    # Insert into a database section (stays visible after processing)
+    with st.expander("Insert into Database"):
+        database_type = st.radio("Database", list(DATABASE_DRIVERS), horizontal=True)
+        driver = DATABASE_DRIVERS[database_type]
+
+        if driver == "sqlite":
+            st.markdown("##### Enter the path of the local SQLite database:")
+            db_name = st.text_input("Database File", placeholder="e.g., reports.db")
+            host, port, username, password = None, None, None, None
+        else:
+            st.markdown("##### Enter MySQL database credentials:")
+            host = st.text_input("Host", placeholder="e.g., localhost or mysql.example.com")
+            port = st.number_input("Port", value=3306, min_value=1, max_value=65535)
+            username = st.text_input("Username")
+            password = st.text_input("Password", type="password")
+            db_name = st.text_input("Database Name")
+
+        table_name = st.text_input("Target Table Name")
+        load_mode = st.radio(
+            "Mode",
+            LOAD_MODES,
+            horizontal=True,
+            help=f"'upsert' updates rows that already exist for the same {' and '.join(DEFAULT_KEY_COLUMNS)}.",
+        )
+        batch_rows = st.number_input("Rows per Batch", value=DEFAULT_BATCH_ROWS, min_value=1, step=1000)
+
+        if st.button("Insert into Database"):
+            required = [db_name, table_name] if driver == "sqlite" else [host, username, password, db_name, table_name]
+            if not all(required):
+                st.error("All fields are required.")
+            else:
+                try:
+                    url = build_url(driver, db_name, host, int(port) if port else None, username, password)
+                    engine = get_engine(url.render_as_string(hide_password=False))
+
+                    progress_bar = st.progress(0.0, text="Inserting rows...")
+                    result = load_frame(
+                        df_processed,
+                        engine,
+                        table_name,
+                        mode=load_mode,
+                        batch_rows=int(batch_rows),
+                        progress=lambda loaded, total: progress_bar.progress(loaded / total, text=f"{loaded}/{total} rows"),
+                    )
+
+                    st.success(
+                        f"{result.rows} rows inserted into `{table_name}` in {result.seconds:.2f}s "
+                        f"({result.rows_per_second:,.0f} rows/s)."
+                    )
+
+                    # Remember the loaded task reports, so later uploads skip them, and add the new ones to the daily rollups
+                    new_rows = fingerprint_index.record_loaded(df_processed, selected_server)
+                    rollup_store.merge(daily_rollups(df_processed[new_rows], selected_server))
+                    advance_watermark(df_processed, selected_server)
+
+                except Exception as e:
+                    st.error(f"Failed to insert data: {e}")
+
+# Stage timings of the last processed result
+if record_stages:
+    with st.sidebar.expander("Stage Timings"):
+        if st.session_state.stage_records:
+            st.dataframe(records_to_frame(st.session_state.stage_records), hide_index=True)
+            st.caption("Downloads are added to the table on the next rerun.")
+        else:
+            st.caption("Process a file to record the time spent in each stage.")
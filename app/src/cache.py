@@ -0,0 +1,174 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, TypeVar, Union, cast
+
+import pandas as pd
+
+# Default memory budget of the result cache, shared by every session of the app
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+Artifact = Union[str, bytes]
+ArtifactT = TypeVar("ArtifactT", str, bytes)
+
+
+class CacheEntry(NamedTuple):
+    """A processed frame and the artifacts serialized from it."""
+
+    frame: Optional[pd.DataFrame]
+    artifacts: Dict[str, Artifact]
+    size: int
+
+
+def make_cache_key(
+    contents: List[bytes],
+    selected_server: str,
+    selected_datetime: str,
+    exclude_values: Optional[List[str]] = None,
+    add_lat_lon: bool = False,
+    skip_loaded: bool = False,
+) -> str:
+    """
+    Builds the cache key of the uploaded files from their content hashes and the processing options.
+
+    The adjusted datetime is deliberately not part of the key, so repeated interactions reuse
+    the first result instead of reprocessing every second; the app stamps the reused result with
+    the current adjusted datetime instead.
+
+    Args:
+        contents (List[bytes]): The raw content of each uploaded file.
+        selected_server (str): The selected server.
+        selected_datetime (str): The "Receive task report time" cutoff.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+        add_lat_lon (bool): Whether the lat and lng columns are added.
+        skip_loaded (bool): Whether task reports already loaded into a database are dropped.
+
+    Returns:
+        str: The hex digest identifying the result.
+    """
+    digest = hashlib.sha256()
+    for content in contents:
+        digest.update(hashlib.sha256(content).digest())
+    options = [selected_server, selected_datetime, ",".join(sorted(exclude_values or [])), str(add_lat_lon), str(skip_loaded)]
+    digest.update("\0".join(options).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _artifact_size(artifact: Artifact) -> int:
+    """Returns the size of an artifact in bytes."""
+    return len(artifact.encode("utf-8")) if isinstance(artifact, str) else len(artifact)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of processed frames and their serialized artifacts (CSV text, xlsx bytes).
+
+    Entries are evicted, least recently used first, once their total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cached frames and artifacts."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get_frame(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Returns the cached frame of a key, if any.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[pd.DataFrame]: The processed frame, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry.frame
+
+    def put_frame(self, key: str, frame: pd.DataFrame) -> None:
+        """
+        Caches a processed frame, replacing any previous entry of the key.
+
+        Args:
+            key (str): The cache key.
+            frame (pd.DataFrame): The processed frame.
+        """
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            self._store(key, CacheEntry(frame, {}, size))
+
+    def get_or_build(self, key: str, name: str, builder: Callable[[], ArtifactT]) -> ArtifactT:
+        """
+        Returns a cached artifact of a key, building and caching it on a miss.
+
+        Args:
+            key (str): The cache key.
+            name (str): The artifact name (e.g. "csv" or "xlsx").
+            builder (Callable[[], ArtifactT]): Builds the artifact when it is not cached.
+
+        Returns:
+            ArtifactT: The CSV text or file bytes.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and name in entry.artifacts:
+                self._entries.move_to_end(key)
+                return cast(ArtifactT, entry.artifacts[name])
+
+        # Build outside the lock so other sessions are not blocked
+        artifact = builder()
+
+        with self._lock:
+            entry = self._entries.get(key) or CacheEntry(None, {}, 0)
+            size = entry.size + _artifact_size(artifact)
+            if name in entry.artifacts:
+                size -= _artifact_size(entry.artifacts[name])
+            artifacts = {**entry.artifacts, name: artifact}
+            self._store(key, CacheEntry(entry.frame, artifacts, size))
+        return artifact
+
+    def discard(self, key: str) -> None:
+        """
+        Removes the entry of a key, if any.
+
+        Args:
+            key (str): The cache key.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry.size
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        """Stores an entry and evicts old entries until the cache fits its budget. Must hold the lock."""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= previous.size
+        self._entries[key] = entry
+        self._size += entry.size
+
+        # Evict least recently used entries, always keeping the newest one
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
@@ -0,0 +1,5 @@
+"""
+The transform core: server profiles, readers, engines and schema checks, without UI dependencies.
+
+Importing it loads pandas but not Streamlit; openpyxl, DuckDB and Polars are imported when first used.
+"""
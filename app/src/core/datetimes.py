@@ -0,0 +1,257 @@
+import threading
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple, cast
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+from .numeric import CellSeries
+
+# Format of the portal's timestamps, and of the timestamps the writers render
+DEFAULT_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Formats a report time cutoff is accepted in; watermarks keep the fractional seconds of the report they stop at
+CUTOFF_FORMATS = (DEFAULT_DATETIME_FORMAT, f"{DEFAULT_DATETIME_FORMAT}.%f")
+
+# Formats tried when detecting the layout of a timestamp column, in order of preference
+CANDIDATE_FORMATS = (
+    DEFAULT_DATETIME_FORMAT,
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+)
+
+# Number of values a format is detected from
+SAMPLE_SIZE = 200
+
+# (server, column) a detected format is cached under
+FormatKey = Tuple[str, str]
+
+
+class ParsedDatetimes(NamedTuple):
+    """A parsed timestamp column, the format it was parsed with and the mask of cells that could not be parsed."""
+
+    values: "pd.Series[pd.Timestamp]"
+    format: str
+    invalid: "pd.Series[bool]"
+
+
+class FormatCache:
+    """Thread-safe cache of the timestamp format detected for each server and column."""
+
+    def __init__(self) -> None:
+        self._formats: Dict[FormatKey, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Optional[FormatKey]) -> Optional[str]:
+        """
+        Returns the cached format of a key, if any.
+
+        Args:
+            key (Optional[FormatKey]): The (server, column) pair, or None.
+
+        Returns:
+            Optional[str]: The format, or None if nothing is cached.
+        """
+        if key is None:
+            return None
+        with self._lock:
+            return self._formats.get(key)
+
+    def set(self, key: Optional[FormatKey], datetime_format: str) -> None:
+        """
+        Caches the format of a key; does nothing if the key is None.
+
+        Args:
+            key (Optional[FormatKey]): The (server, column) pair, or None.
+            datetime_format (str): The detected format.
+        """
+        if key is None:
+            return
+        with self._lock:
+            self._formats[key] = datetime_format
+
+    def clear(self) -> None:
+        """Forgets every detected format."""
+        with self._lock:
+            self._formats.clear()
+
+
+# Formats detected by this process, shared by every session of the app
+format_cache = FormatCache()
+
+
+def parse_cutoff(text: str) -> datetime:
+    """
+    Parses a report time cutoff typed by the user or taken from a watermark.
+
+    Args:
+        text (str): The cutoff, as "YYYY-MM-DD HH:MM:SS" with optional fractional seconds.
+
+    Returns:
+        datetime: The cutoff.
+
+    Raises:
+        ValueError: If the text matches none of `CUTOFF_FORMATS`.
+    """
+    for cutoff_format in CUTOFF_FORMATS:
+        try:
+            return datetime.strptime(text, cutoff_format)
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid cutoff '{text}', expected YYYY-MM-DD HH:MM:SS")
+
+
+def detect_format(values: CellSeries) -> Optional[str]:
+    """
+    Detects the format matching most of a sample of timestamp strings.
+
+    Args:
+        values (pd.Series): The raw values; only strings are considered.
+
+    Returns:
+        Optional[str]: The best candidate format, or None if no candidate matches any value.
+    """
+    head = values.head(SAMPLE_SIZE)
+    sample = head[head.map(lambda value: isinstance(value, str)).astype(bool)]
+    if sample.empty:
+        return None
+
+    best_format, best_matches = None, 0
+    for candidate in CANDIDATE_FORMATS:
+        matches = int(pd.to_datetime(sample, format=candidate, errors="coerce").notna().sum())
+        if matches > best_matches:
+            best_format, best_matches = candidate, matches
+        if matches == len(sample):
+            break
+    return best_format
+
+
+def _parse_mixed(values: CellSeries) -> "pd.Series[pd.Timestamp]":
+    """
+    Parses values of any layout one by one; the slow path for cells that match no detected format.
+
+    Args:
+        values (pd.Series): The raw values.
+
+    Returns:
+        pd.Series: The timezone-naive timestamps, NaT where a value cannot be parsed.
+    """
+    parsed = pd.to_datetime(values, errors="coerce", format="mixed")
+    if getattr(parsed.dt, "tz", None) is not None:
+        parsed = parsed.dt.tz_localize(None)
+    return parsed
+
+
+def parse_datetimes(values: CellSeries, key: Optional[FormatKey] = None, cache: FormatCache = format_cache) -> ParsedDatetimes:
+    """
+    Parses a timestamp column in one vectorized pass with the format of its (server, column) key.
+
+    The format is detected from a sample on first use and cached. Only the cells that do not match
+    it are parsed again: with a newly detected format when most of the column stopped matching the
+    cached one, and value by value as a last resort.
+
+    Args:
+        values (pd.Series): The raw column; datetime64 columns are returned as they are.
+        key (Optional[FormatKey]): The (server, column) pair the format is cached under.
+        cache (FormatCache): The format cache.
+
+    Returns:
+        ParsedDatetimes: The datetime64 column, its format and the mask of cells that could not be parsed.
+    """
+    if is_datetime64_any_dtype(values):
+        timestamps = cast("pd.Series[pd.Timestamp]", values)
+        return ParsedDatetimes(timestamps, cache.get(key) or DEFAULT_DATETIME_FORMAT, pd.Series(False, index=values.index))
+
+    present = values.notna()
+    datetime_format = cache.get(key)
+    if datetime_format is None:
+        datetime_format = detect_format(values[present]) or DEFAULT_DATETIME_FORMAT
+        cache.set(key, datetime_format)
+
+    parsed = pd.to_datetime(values, format=datetime_format, errors="coerce")
+    unmatched = parsed.isna() & present
+
+    # The cached format no longer fits most of the column, e.g. after an export layout change
+    if unmatched.sum() > present.sum() / 2:
+        detected = detect_format(values[unmatched])
+        if detected is not None and detected != datetime_format:
+            datetime_format = detected
+            cache.set(key, datetime_format)
+            parsed[unmatched] = pd.to_datetime(values[unmatched], format=datetime_format, errors="coerce")
+            unmatched = parsed.isna() & present
+
+    if unmatched.any():
+        parsed[unmatched] = _parse_mixed(values[unmatched])
+        unmatched = parsed.isna() & present
+
+    return ParsedDatetimes(parsed, datetime_format, unmatched)
+
+
+def to_timestamps(values: CellSeries, key: Optional[FormatKey] = None) -> "pd.Series[pd.Timestamp]":
+    """
+    Parses a column kept as read, such as the start and end times, when its times are needed.
+
+    Args:
+        values (pd.Series): The column; datetime64 columns are returned as they are.
+        key (Optional[FormatKey]): The (server, column) pair the format is cached under.
+
+    Returns:
+        pd.Series: The datetime64 column; cells that are neither text nor timestamps, like the 0
+            the "-" placeholder is written as, become NaT.
+    """
+    if is_datetime64_any_dtype(values):
+        return cast("pd.Series[pd.Timestamp]", values)
+    readable = values.map(lambda value: isinstance(value, (str, datetime))).astype(bool)
+    return parse_datetimes(values.astype(object).where(readable), key).values
+
+
+class DatetimeParser:
+    """Parses single cells, as streamed from Excel files, with the cached format of a (server, column) key."""
+
+    def __init__(self, key: Optional[FormatKey] = None, cache: FormatCache = format_cache) -> None:
+        self.key = key
+        self.cache = cache
+        self.format = cache.get(key) or DEFAULT_DATETIME_FORMAT
+        # Cells that matched no candidate format, with their last-resort parse, so each distinct value is tried once
+        self._unmatched: Dict[str, Optional[datetime]] = {}
+
+    def __call__(self, value: object) -> Optional[datetime]:
+        """
+        Converts a cell value to a datetime.
+
+        Args:
+            value (object): The cell value, either a datetime or a string.
+
+        Returns:
+            Optional[datetime]: The parsed datetime, or None if the cell is empty or cannot be parsed.
+        """
+        if isinstance(value, datetime):
+            return value
+        if not isinstance(value, str) or not value:
+            return None
+        # No candidate format matches these cells, whichever format is current
+        if value in self._unmatched:
+            return self._unmatched[value]
+        try:
+            return datetime.strptime(value, self.format)
+        except ValueError:
+            pass
+
+        # Switch to the layout of this cell if it matches another known format
+        detected = detect_format(pd.Series([value]))
+        if detected is not None:
+            self.format = detected
+            self.cache.set(self.key, detected)
+            return datetime.strptime(value, detected)
+
+        timestamp = pd.to_datetime(value, errors="coerce")
+        parsed = None if pd.isna(timestamp) else timestamp.tz_localize(None).to_pydatetime()
+        self._unmatched[value] = parsed
+        return parsed
@@ -0,0 +1,283 @@
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from .datetimes import CANDIDATE_FORMATS, DEFAULT_DATETIME_FORMAT, SAMPLE_SIZE, detect_format, format_cache
+from .engine import SORT_COLUMN, ColumnStep, TransformPlan, assemble_frame, keeps_integers
+from .instrumentation import instrumented
+from .jobs import checkpoint
+from .numeric import INTEGER_PATTERN, NOISE_PATTERN, NULL_STRINGS, PLACEHOLDERS
+
+if TYPE_CHECKING:
+    import duckdb
+
+# CSV uploads at least this large are transformed by DuckDB when it is installed and the engine is "auto"
+DUCKDB_MIN_BYTES = 64 * 1024 * 1024
+
+# Environment variable capping DuckDB's memory (e.g. "2GB"); above it, DuckDB spills to its temp directory
+DUCKDB_MEMORY_ENV = "GS_DUCKDB_MEMORY_LIMIT"
+
+# Directory DuckDB spills to when a query does not fit in memory
+DUCKDB_TEMP_DIRECTORY = os.path.join(tempfile.gettempdir(), "gs_transformation_duckdb")
+
+
+def duckdb_available() -> bool:
+    """Returns whether the optional duckdb package is installed."""
+    return importlib.util.find_spec("duckdb") is not None
+
+
+def connect() -> "duckdb.DuckDBPyConnection":
+    """
+    Opens an in-memory DuckDB database using every core and spilling to disk under memory pressure.
+
+    Returns:
+        duckdb.DuckDBPyConnection: The connection.
+
+    Raises:
+        ImportError: If duckdb is not installed.
+    """
+    try:
+        import duckdb
+    except ImportError:
+        raise ImportError("The DuckDB engine needs the duckdb package: pip install 'gs-excel-transformation-webapp[duckdb]'")
+
+    config: Dict[str, Union[str, bool, int, float, List[str]]] = {
+        "threads": os.cpu_count() or 1,
+        "temp_directory": DUCKDB_TEMP_DIRECTORY,
+        "preserve_insertion_order": True,
+    }
+    memory_limit = os.environ.get(DUCKDB_MEMORY_ENV)
+    if memory_limit:
+        config["memory_limit"] = memory_limit
+    return duckdb.connect(config=config)
+
+
+def _quote(name: str) -> str:
+    """Quotes an identifier for DuckDB."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(text: str) -> str:
+    """Quotes a string literal for DuckDB."""
+    return "'" + text.replace("'", "''") + "'"
+
+
+@contextmanager
+def _csv_path(file: io.BytesIO) -> Iterator[str]:
+    """
+    Yields a path DuckDB can read the CSV from: the file itself when it is on disk, otherwise a temporary copy.
+
+    Args:
+        file (io.BytesIO): The uploaded file, or a file opened from disk.
+
+    Yields:
+        str: The path of the CSV file.
+    """
+    name = getattr(file, "name", None)
+    if not isinstance(file, io.BytesIO) and isinstance(name, str) and os.path.isfile(name):
+        yield name
+        return
+
+    os.makedirs(DUCKDB_TEMP_DIRECTORY, exist_ok=True)
+    with tempfile.NamedTemporaryFile(suffix=".csv", dir=DUCKDB_TEMP_DIRECTORY, delete=False) as copy:
+        file.seek(0)
+        shutil.copyfileobj(file, copy)
+    try:
+        yield copy.name
+    finally:
+        os.remove(copy.name)
+
+
+def _datetime_expression(column: str, datetime_format: str) -> str:
+    """
+    Parses a text column with its detected format, falling back to the other candidate formats.
+
+    Args:
+        column (str): The quoted column.
+        datetime_format (str): The detected format.
+
+    Returns:
+        str: The SQL expression; NULL where no format matches.
+    """
+    candidates = ", ".join(_literal(candidate) for candidate in CANDIDATE_FORMATS)
+    return f"coalesce(try_strptime({column}, {_literal(datetime_format)}), try_strptime({column}, [{candidates}]))"
+
+
+def _numeric_expression(column: str) -> str:
+    """
+    Converts a text column to DOUBLE the way `coerce_numeric` does: plain numbers first, then the
+    text with thousands separators, percent signs and whitespace stripped, with "-" placeholders as 0.
+
+    Args:
+        column (str): The quoted column.
+
+    Returns:
+        str: The SQL expression; NULL where the cell cannot be parsed.
+    """
+    stripped = f"regexp_replace({column}, {_literal(NOISE_PATTERN)}, '', 'g')"
+    placeholders = ", ".join(_literal(placeholder) for placeholder in PLACEHOLDERS)
+    return (
+        f"CASE WHEN try_cast({column} AS DOUBLE) IS NOT NULL THEN try_cast({column} AS DOUBLE) "
+        f"WHEN {stripped} IN ({placeholders}) THEN 0.0 "
+        f"ELSE try_cast({stripped} AS DOUBLE) END"
+    )
+
+
+def _detect_column_format(connection: "duckdb.DuckDBPyConnection", relation: str, server: str, column: str) -> str:
+    """
+    Returns the cached format of a timestamp column, detecting it from a sample of the relation on first use.
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection.
+        relation (str): The table or table function the column is read from.
+        server (str): The server the format is cached for.
+        column (str): The column name.
+
+    Returns:
+        str: The format.
+    """
+    key = (server, column)
+    datetime_format = format_cache.get(key)
+    if datetime_format is None:
+        quoted = _quote(column)
+        sample = connection.sql(f"SELECT {quoted} FROM {relation} WHERE {quoted} IS NOT NULL LIMIT {SAMPLE_SIZE}").df()
+        datetime_format = detect_format(sample[column]) or DEFAULT_DATETIME_FORMAT
+        format_cache.set(key, datetime_format)
+    return datetime_format
+
+
+@instrumented("duckdb")
+def process_csv_duckdb(
+    file: io.BytesIO,
+    plan: TransformPlan,
+    selected_datetime: datetime,
+    adjusted_datetime: Union[datetime, str],
+    exclude_values: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Runs a compiled plan as SQL over a CSV export with DuckDB, multi-threaded and spilling to disk if needed.
+
+    The filtered rows are materialized once in a temporary table, from which one aggregate query
+    reproduces the dtypes pandas would infer and counts the invalid cells, and one query computes
+    the output columns sorted by report time. Reports received in the same second keep their file
+    order, whereas the pandas path leaves their order unspecified.
+
+    Args:
+        file (io.BytesIO): The CSV file.
+        plan (TransformPlan): The compiled plan.
+        selected_datetime (datetime): Rows with a report time at or before this are dropped.
+        adjusted_datetime (Union[datetime, str]): Value written to the "datetime" columns.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+
+    Returns:
+        pd.DataFrame: The same frame `apply_plan` builds from the pandas readers.
+    """
+    label = f"Reading {file.name}"
+    with _csv_path(file) as path, connect() as connection:
+        null_strings = ", ".join(_literal(text) for text in NULL_STRINGS)
+        source = (
+            f"read_csv({_literal(path)}, header = true, all_varchar = true, delim = ',', quote = '\"', escape = '\"', "
+            f"nullstr = [{null_strings}])"
+        )
+        report_format = _detect_column_format(connection, source, plan.server, SORT_COLUMN)
+
+        # Keep the needed columns of the rows newer than the cutoff, in file order
+        columns = ", ".join(_quote(column) for column in plan.usecols)
+        connection.execute(
+            f"CREATE TEMP TABLE filtered AS SELECT {columns}, {_datetime_expression(_quote(SORT_COLUMN), report_format)} "
+            f'AS __report FROM {source} WHERE __report > $cutoff AND NOT coalesce(list_contains($excluded, "S/N"), false)',
+            {"cutoff": selected_datetime, "excluded": exclude_values or []},
+        )
+        checkpoint(label, 1.0)
+
+        source_steps = [step for step in plan.steps if step.kind in ("copy", "numeric", "timestamp")]
+        formats = {
+            step.target: _detect_column_format(connection, "filtered", plan.server, str(step.source))
+            for step in source_steps
+            if step.kind == "timestamp"
+        }
+
+        # Invalid cell counts over the filtered rows, and column flags over every row of the file,
+        # which decide the dtypes like a single `pd.read_csv` call
+        counts = ["count(*)"]
+        flags = []
+        for step in source_steps:
+            column = _quote(str(step.source))
+            if step.kind == "timestamp":
+                counts.append(f"count({column}) - count({_datetime_expression(column, formats[step.target])})")
+                continue
+            if step.kind == "numeric":
+                counts.append(f"count({column}) - count({_numeric_expression(column)})")
+            else:
+                number = f"try_cast({column} AS DOUBLE) IS NOT NULL"
+                flags.append(f"coalesce(bool_and({number}) FILTER ({column} IS NOT NULL), true)")
+            if step.kind == "copy" or keeps_integers(step):
+                integer = f"regexp_full_match({column}, {_literal(INTEGER_PATTERN)})"
+                flags.append(f"count({column}) = count(*) AND coalesce(bool_and({integer}), true)")
+        summary = connection.sql(f"SELECT {', '.join(counts)} FROM filtered").fetchone() or ()
+        flag_values = ()
+        if flags:
+            flag_values = connection.sql(f"SELECT {', '.join(flags)} FROM {source}").fetchone() or ()
+        num_rows = int(summary[0])
+
+        invalid_cells: Dict[str, int] = {}
+        expressions = []
+        invalid_values = iter(summary[1:])
+        flag_iter = iter(flag_values)
+        for step in source_steps:
+            column = _quote(str(step.source))
+            invalid = int(next(invalid_values)) if step.kind != "copy" else 0
+            all_numeric = bool(next(flag_iter)) if step.kind == "copy" else False
+            all_integer = bool(next(flag_iter)) if step.kind == "copy" or keeps_integers(step) else False
+            if invalid:
+                invalid_cells[step.target] = invalid
+            expressions.append(_step_expression(step, column, formats.get(step.target), all_numeric, all_integer))
+
+        selected = ", ".join(f"{expression} AS {_quote(step.target)}" for step, expression in zip(source_steps, expressions))
+        result = connection.sql(f"SELECT {selected} FROM filtered ORDER BY __report DESC, rowid").df()
+        checkpoint("Transforming", 1.0)
+
+    return assemble_frame(result, plan, adjusted_datetime, num_rows, invalid_cells)
+
+
+def _step_expression(step: ColumnStep, column: str, datetime_format: Optional[str], all_numeric: bool, all_integer: bool) -> str:
+    """
+    Returns the SQL expression of an output column read from the file.
+
+    Copy columns whose every cell is a number are cast like `pd.read_csv` infers them: BIGINT when
+    every cell is an integer, DOUBLE otherwise. Numeric columns follow `coerce_numeric`, except that
+    integer columns without a unit conversion stay BIGINT as pandas leaves them.
+
+    Args:
+        step (ColumnStep): The step.
+        column (str): The quoted source column.
+        datetime_format (Optional[str]): The detected format of "timestamp" steps.
+        all_numeric (bool): Whether every non-empty cell of a "copy" column is a number.
+        all_integer (bool): Whether every cell is an integer and none is empty.
+
+    Returns:
+        str: The SQL expression.
+    """
+    if step.kind == "timestamp":
+        return _datetime_expression(column, datetime_format or DEFAULT_DATETIME_FORMAT)
+    if step.kind == "numeric":
+        if all_integer and keeps_integers(step):
+            return f"CAST({column} AS BIGINT)"
+        expression = _numeric_expression(column)
+        if step.factor != 1.0:
+            expression = f"({expression}) * {step.factor!r}"
+        if step.decimals is not None:
+            expression = f"round_even({expression}, {step.decimals})"
+        return expression
+    if all_integer:
+        return f"CAST({column} AS BIGINT)"
+    if all_numeric:
+        return f"CAST({column} AS DOUBLE)"
+    return column
@@ -0,0 +1,296 @@
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .datetimes import parse_datetimes
+from .instrumentation import instrumented
+from .jobs import checkpoint
+from .numeric import CellSeries, NumericResult, coerce_numeric
+from .profiles import ServerProfile
+
+# Column used to sort the output, newest report first
+SORT_COLUMN = "Receive task report time"
+
+
+@dataclass(frozen=True)
+class ColumnStep:
+    """
+    A single output column of a compiled transform plan.
+
+    Attributes:
+        target (str): The output column name.
+        kind (str): One of "copy", "numeric", "timestamp", "datetime" or "null".
+        source (Optional[str]): The source column name, None for "null" columns.
+        factor (float): Multiplier applied to "numeric" columns.
+        decimals (Optional[int]): Number of decimals "numeric" columns are rounded to, if any.
+        categorical (bool): Whether a "copy" column is stored as a categorical.
+    """
+
+    target: str
+    kind: str
+    source: Optional[str] = None
+    factor: float = 1.0
+    decimals: Optional[int] = None
+    categorical: bool = False
+
+
+@dataclass(frozen=True)
+class TransformPlan:
+    """
+    A server profile compiled into one step per output column.
+
+    Attributes:
+        server (str): The profile name, under which detected timestamp formats are cached.
+        usecols (Tuple[str, ...]): Source columns the readers need to materialize.
+        steps (Tuple[ColumnStep, ...]): Output columns in order.
+    """
+
+    server: str
+    usecols: Tuple[str, ...]
+    steps: Tuple[ColumnStep, ...]
+
+
+@lru_cache(maxsize=None)
+def compile_profile(profile: ServerProfile) -> TransformPlan:
+    """
+    Compiles a server profile into a column-wise transform plan.
+
+    Args:
+        profile (ServerProfile): The server profile.
+
+    Returns:
+        TransformPlan: The compiled plan.
+
+    Raises:
+        ValueError: If a NULL column is placed after a column that is not in the output.
+    """
+    renames = dict(profile.renames)
+    numeric = {spec.column: spec for spec in profile.numeric_columns}
+
+    steps: List[ColumnStep] = []
+    for column in profile.columns:
+        target = renames.get(column, column)
+        if column in profile.datetime_columns:
+            steps.append(ColumnStep(target, "datetime", column))
+        elif column in profile.timestamp_columns:
+            steps.append(ColumnStep(target, "timestamp", column))
+        elif column in numeric:
+            spec = numeric[column]
+            steps.append(ColumnStep(target, "numeric", column, spec.factor, spec.decimals))
+        else:
+            steps.append(ColumnStep(target, "copy", column, categorical=column in profile.categorical_columns))
+
+    # Insert NULL columns after the column they follow
+    for null_column in profile.null_columns:
+        position = 0
+        if null_column.after is not None:
+            targets = [step.target for step in steps]
+            if null_column.after not in targets:
+                raise ValueError(f"Cannot place '{null_column.name}' after missing column '{null_column.after}'")
+            position = targets.index(null_column.after) + 1
+        steps.insert(position, ColumnStep(null_column.name, "null"))
+
+    return TransformPlan(server=profile.name, usecols=profile.columns, steps=tuple(steps))
+
+
+def null_column(num_rows: int) -> pd.Categorical:
+    """
+    Returns a column of missing values, stored as one byte per row.
+
+    Args:
+        num_rows (int): Number of rows.
+
+    Returns:
+        pd.Categorical: The column; the writers render its cells as NULL.
+    """
+    dtype: "pd.CategoricalDtype[object]" = pd.CategoricalDtype([])
+    return pd.Categorical.from_codes(np.full(num_rows, -1, dtype=np.int8), dtype=dtype)
+
+
+def constant_column(value: object, num_rows: int) -> pd.Categorical:
+    """
+    Returns a column repeating a single value, stored as one byte per row.
+
+    Args:
+        value (object): The value.
+        num_rows (int): Number of rows.
+
+    Returns:
+        pd.Categorical: The column.
+    """
+    dtype: "pd.CategoricalDtype[object]" = pd.CategoricalDtype([value])
+    return pd.Categorical.from_codes(np.zeros(num_rows, dtype=np.int8), dtype=dtype)
+
+
+def add_null_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    Appends columns of missing values, rendered as NULL by the writers.
+
+    Args:
+        df (pd.DataFrame): The processed DataFrame.
+        columns (List[str]): Names of the columns to append.
+
+    Returns:
+        pd.DataFrame: The same DataFrame, modified in place.
+    """
+    for column in columns:
+        df[column] = null_column(len(df))
+    return df
+
+
+def stamp_datetime_columns(df: pd.DataFrame, plan: TransformPlan, adjusted_datetime: Union[datetime, str]) -> pd.DataFrame:
+    """
+    Rewrites the "datetime" columns of a processed frame, so a reused result carries the current time.
+
+    Args:
+        df (pd.DataFrame): The processed DataFrame.
+        plan (TransformPlan): The plan the frame was built with.
+        adjusted_datetime (Union[datetime, str]): Value written to the "datetime" columns.
+
+    Returns:
+        pd.DataFrame: A shallow copy of the frame with the new values; the other columns are shared.
+    """
+    df_stamped: pd.DataFrame = df.copy(deep=False)
+    for step in plan.steps:
+        if step.kind == "datetime" and step.target in df_stamped:
+            df_stamped[step.target] = constant_column(adjusted_datetime, len(df_stamped))
+    return df_stamped
+
+
+def fill_column(series: CellSeries) -> CellSeries:
+    """
+    Replaces "-" placeholders with 0; missing values are kept and only rendered as NULL by the writers.
+
+    Args:
+        series (pd.Series): The source column.
+
+    Returns:
+        pd.Series: The filled column.
+    """
+    if series.dtype == "object":
+        series = series.replace("-", 0)
+    return series
+
+
+def keeps_integers(step: ColumnStep) -> bool:
+    """Whether a "numeric" step leaves a column of integers as integers, as it has no unit conversion."""
+    return step.kind == "numeric" and step.factor == 1.0 and step.decimals is None
+
+
+def assemble_frame(
+    result: pd.DataFrame,
+    plan: TransformPlan,
+    adjusted_datetime: Union[datetime, str],
+    num_rows: int,
+    invalid_cells: Dict[str, int],
+) -> pd.DataFrame:
+    """
+    Builds the output frame of a plan from the source columns computed by another engine, with the
+    dtypes `apply_plan` produces.
+
+    Args:
+        result (pd.DataFrame): The sorted "copy", "numeric" and "timestamp" columns, named after their targets.
+        plan (TransformPlan): The compiled plan.
+        adjusted_datetime (Union[datetime, str]): Value written to the "datetime" columns.
+        num_rows (int): Number of output rows.
+        invalid_cells (Dict[str, int]): Number of cells that could not be parsed per output column.
+
+    Returns:
+        pd.DataFrame: The transformed DataFrame.
+    """
+    data: Dict[str, object] = {}
+    for step in plan.steps:
+        if step.kind == "null":
+            data[step.target] = null_column(num_rows)
+        elif step.kind == "datetime":
+            data[step.target] = constant_column(adjusted_datetime, num_rows)
+        else:
+            series = result[step.target]
+            if step.kind == "timestamp":
+                series = series.astype("datetime64[ns]")
+            elif series.dtype == "object":
+                # Arrow-based engines return missing text as None where pandas has NaN
+                series = fill_column(series.where(series.notna(), np.nan))
+            data[step.target] = series.astype("category") if step.categorical else series
+
+    df_output: pd.DataFrame = pd.DataFrame(data, index=pd.RangeIndex(num_rows))
+    df_output.attrs["invalid_cells"] = invalid_cells
+    return df_output
+
+
+def _clean_numeric(series: CellSeries, step: ColumnStep) -> NumericResult:
+    """
+    Converts the column to numbers and applies the unit conversion.
+
+    Args:
+        series (pd.Series): The raw source column.
+        step (ColumnStep): The "numeric" step of the column.
+
+    Returns:
+        NumericResult: The converted column and the mask of cells that could not be parsed.
+    """
+    result = coerce_numeric(series)
+    if step.factor == 1.0 and step.decimals is None:
+        return result
+
+    values = result.values * step.factor
+    if step.decimals is not None:
+        values = values.round(step.decimals)
+    return NumericResult(values, result.invalid)
+
+
+@instrumented("transform")
+def apply_plan(df: pd.DataFrame, plan: TransformPlan, adjusted_datetime: Union[datetime, str]) -> pd.DataFrame:
+    """
+    Builds the output frame of a plan in a single pass over the filtered source columns.
+
+    Rows are sorted by report time, newest first, and every output column is computed from
+    its source column exactly once before the output frame is assembled. Columns keep compact
+    dtypes (categoricals, floats, datetimes) with missing values as NA; the CSV, xlsx and SQL
+    writers render them as NULL. Timestamp columns are parsed with the format cached for their server.
+
+    Args:
+        df (pd.DataFrame): The filtered source DataFrame.
+        plan (TransformPlan): The compiled plan.
+        adjusted_datetime (Union[datetime, str]): Value written to the "datetime" columns.
+
+    Returns:
+        pd.DataFrame: The transformed DataFrame.
+    """
+    positions = df[SORT_COLUMN].reset_index(drop=True).sort_values(ascending=False).index.to_numpy()
+    num_rows = len(positions)
+
+    data: Dict[str, object] = {}
+    invalid_cells: Dict[str, int] = {}
+    for number, step in enumerate(plan.steps):
+        checkpoint("Transforming", number / len(plan.steps))
+        if step.kind == "null":
+            data[step.target] = null_column(num_rows)
+        elif step.kind == "datetime":
+            data[step.target] = constant_column(adjusted_datetime, num_rows)
+        else:
+            series = df[step.source].take(positions).reset_index(drop=True)
+            invalid = 0
+            if step.kind == "numeric":
+                result = _clean_numeric(series, step)
+                series = result.values
+                invalid = int(result.invalid.sum())
+            elif step.kind == "timestamp":
+                parsed = parse_datetimes(series, (plan.server, str(step.source)))
+                series = parsed.values
+                invalid = int(parsed.invalid.sum())
+            if invalid:
+                invalid_cells[step.target] = invalid
+            series = fill_column(series)
+            data[step.target] = series.astype("category") if step.categorical else series
+
+    checkpoint("Transforming", 1.0)
+
+    df_output: pd.DataFrame = pd.DataFrame(data, index=pd.RangeIndex(num_rows))
+    # Cells that could not be parsed as numbers or timestamps are written as NULL and reported per column
+    df_output.attrs["invalid_cells"] = invalid_cells
+    return df_output
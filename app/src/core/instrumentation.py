@@ -0,0 +1,224 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, ParamSpec, Tuple, TypeVar, Union
+
+import pandas as pd
+
+# Environment variable that turns stage recording on by default
+INSTRUMENTATION_ENV = "GS_INSTRUMENTATION"
+
+logger = logging.getLogger("gs_transformation.stages")
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class StageRecord(NamedTuple):
+    """Wall time, row counts and peak memory of one stage run."""
+
+    stage: str
+    seconds: float
+    rows_in: Optional[int]
+    rows_out: Optional[int]
+    peak_bytes: Optional[int]
+
+
+class Recorder:
+    """Collects the stage records of one run and emits each of them as a JSON log line."""
+
+    def __init__(
+        self,
+        track_memory: bool = False,
+        labels: Optional[Dict[str, str]] = None,
+        records: Optional[List[StageRecord]] = None,
+    ) -> None:
+        self.run_id = uuid.uuid4().hex[:12]
+        self.track_memory = track_memory
+        self.labels = labels or {}
+        self.records = records if records is not None else []
+        self._lock = threading.Lock()
+
+    def add(self, record: StageRecord) -> None:
+        """
+        Stores a record and logs it.
+
+        Args:
+            record (StageRecord): The finished stage.
+        """
+        with self._lock:
+            self.records.append(record)
+        logger.info(json.dumps({"event": "stage", "run_id": self.run_id, **self.labels, **record._asdict()}))
+
+
+class _OpenStage:
+    """A stage being measured; `rows_out` can be set by the code inside the stage."""
+
+    def __init__(self, rows_in: Optional[int]) -> None:
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.start_bytes = 0
+        self.peak_bytes = 0
+
+
+class _NoopStage:
+    """Stand-in yielded when no recorder is active, so callers never need to check."""
+
+    rows_out: Optional[int] = None
+
+
+_NOOP_STAGE = _NoopStage()
+
+_recorder: ContextVar[Optional[Recorder]] = ContextVar("recorder", default=None)
+_open_stages: ContextVar[Tuple[_OpenStage, ...]] = ContextVar("open_stages", default=())
+
+
+def instrumentation_enabled() -> bool:
+    """Returns whether stage recording is turned on through the environment."""
+    return os.environ.get(INSTRUMENTATION_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Writes the stage log lines to stderr as bare JSON, once per process.
+
+    Args:
+        level (int): The level of the stage logger.
+    """
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+
+@contextmanager
+def recording(
+    track_memory: bool = False,
+    labels: Optional[Dict[str, str]] = None,
+    records: Optional[List[StageRecord]] = None,
+) -> Iterator[Recorder]:
+    """
+    Records every stage run inside the block, including stages run in threads started with `copy_context`.
+
+    Args:
+        track_memory (bool): Whether to measure peak memory with tracemalloc, which slows Python allocations down.
+        labels (Optional[Dict[str, str]]): Extra fields added to every log line (e.g. the server).
+        records (Optional[List[StageRecord]]): List the records are appended to, e.g. one kept across reruns.
+
+    Yields:
+        Recorder: The recorder collecting the stages.
+    """
+    recorder = Recorder(track_memory, labels, records)
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+@contextmanager
+def stage(name: str, rows_in: Optional[int] = None) -> Iterator[Union[_OpenStage, _NoopStage]]:
+    """
+    Measures a block as a stage of the active recorder; does nothing when no recorder is active.
+
+    Peak memory is the highest traced allocation above the level at the start of the stage.
+    Stages running concurrently in threads share tracemalloc's peak, so their figures overlap.
+
+    Args:
+        name (str): The stage name.
+        rows_in (Optional[int]): Number of rows the stage receives.
+
+    Yields:
+        Union[_OpenStage, _NoopStage]: The open stage, whose `rows_out` may be set inside the block.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        yield _NOOP_STAGE
+        return
+
+    current = _OpenStage(rows_in)
+    parents = _open_stages.get()
+    tracking = recorder.track_memory and tracemalloc.is_tracing()
+    if tracking:
+        # Hand the peak so far to the enclosing stages before resetting it for this one
+        current.start_bytes, peak = tracemalloc.get_traced_memory()
+        for parent in parents:
+            parent.peak_bytes = max(parent.peak_bytes, peak)
+        tracemalloc.reset_peak()
+
+    token = _open_stages.set(parents + (current,))
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        seconds = time.perf_counter() - start
+        _open_stages.reset(token)
+
+        peak_bytes = None
+        if tracking:
+            current.peak_bytes = max(current.peak_bytes, tracemalloc.get_traced_memory()[1])
+            for parent in parents:
+                parent.peak_bytes = max(parent.peak_bytes, current.peak_bytes)
+            peak_bytes = current.peak_bytes - current.start_bytes
+
+        recorder.add(StageRecord(name, seconds, current.rows_in, current.rows_out, peak_bytes))
+
+
+def instrumented(name: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """
+    Decorates a function as a stage; the rows in and out are taken from DataFrame arguments and results.
+
+    Args:
+        name (str): The stage name.
+
+    Returns:
+        Callable[[Callable[P, T]], Callable[P, T]]: The decorator.
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if _recorder.get() is None:
+                return func(*args, **kwargs)
+
+            rows_in = len(args[0]) if args and isinstance(args[0], pd.DataFrame) else None
+            with stage(name, rows_in) as current:
+                result = func(*args, **kwargs)
+                if isinstance(result, pd.DataFrame):
+                    current.rows_out = len(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def records_to_frame(records: List[StageRecord]) -> pd.DataFrame:
+    """
+    Converts stage records to a DataFrame, one row per stage run.
+
+    Args:
+        records (List[StageRecord]): The records.
+
+    Returns:
+        pd.DataFrame: The records, with the peak memory in MiB.
+    """
+    df: pd.DataFrame = pd.DataFrame(records, columns=list(StageRecord._fields))
+    df = df.astype({"rows_in": "Int64", "rows_out": "Int64", "peak_bytes": "Float64"})
+    df["peak_mib"] = df.pop("peak_bytes") / (1024 * 1024)
+    return df
@@ -0,0 +1,209 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+# Number of jobs run at the same time, shared by every session of the app
+DEFAULT_MAX_WORKERS = 2
+
+# Number of queued and running jobs above which new submissions are refused
+DEFAULT_MAX_PENDING = 8
+
+# Number of finished jobs kept so that sessions can collect their results
+DEFAULT_HISTORY = 32
+
+T = TypeVar("T")
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job at its next checkpoint once cancellation is requested.
+
+    Like asyncio.CancelledError, it derives from BaseException so that the readers' generic
+    error handling does not turn it into an ordinary failure.
+    """
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when a job is submitted while too many jobs are queued or running."""
+
+
+class JobProgress:
+    """Fraction done of each stage of a job, and its cancellation flag, shared by the job thread and the UI."""
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, float] = {}
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def report(self, stage: str, fraction: float) -> None:
+        """
+        Records the fraction done of a stage.
+
+        Args:
+            stage (str): The stage label shown to the user (e.g. "Reading export.csv").
+            fraction (float): The fraction done, clipped to [0, 1].
+        """
+        with self._lock:
+            self._stages[stage] = min(max(fraction, 0.0), 1.0)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Returns the fraction done of every stage reported so far, in the order they started."""
+        with self._lock:
+            return dict(self._stages)
+
+    def cancel(self) -> None:
+        """Asks the job to stop at its next checkpoint."""
+        self._cancelled.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Whether the job was asked to stop."""
+        return self._cancelled.is_set()
+
+
+_current_progress: ContextVar[Optional[JobProgress]] = ContextVar("job_progress", default=None)
+
+
+def checkpoint(stage: str, fraction: float) -> None:
+    """
+    Reports the progress of the running job and stops it if it was cancelled; does nothing outside a job.
+
+    Args:
+        stage (str): The stage label shown to the user.
+        fraction (float): The fraction done of the stage.
+
+    Raises:
+        JobCancelled: If the job was asked to stop.
+    """
+    progress = _current_progress.get()
+    if progress is None:
+        return
+    if progress.cancel_requested:
+        raise JobCancelled(stage)
+    progress.report(stage, fraction)
+
+
+class Job(Generic[T]):
+    """A submitted job, identified by the cache key of its result."""
+
+    def __init__(self, key: str, progress: JobProgress, future: "Future[T]") -> None:
+        self.key = key
+        self.progress = progress
+        self.future = future
+        self.submitted_at = time.time()
+
+    @property
+    def state(self) -> str:
+        """One of "queued", "running", "done", "failed" or "cancelled"."""
+        if self.future.cancelled():
+            return "cancelled"
+        if not self.future.done():
+            return "running" if self.future.running() else "queued"
+        error = self.future.exception()
+        if isinstance(error, JobCancelled):
+            return "cancelled"
+        return "failed" if error is not None else "done"
+
+    @property
+    def done(self) -> bool:
+        """Whether the job finished, failed or was cancelled."""
+        return self.future.done()
+
+    def cancel(self) -> None:
+        """Drops the job if it is still queued, or stops it at its next checkpoint."""
+        self.progress.cancel()
+        self.future.cancel()
+
+    def result(self) -> T:
+        """
+        Returns the result of a finished job.
+
+        Returns:
+            T: The result.
+
+        Raises:
+            BaseException: The error the job failed with.
+        """
+        return self.future.result()
+
+
+class JobManager(Generic[T]):
+    """
+    Runs jobs in a bounded thread pool shared by every session.
+
+    Submitting a key that is already queued or running returns the existing job instead of
+    starting the work again.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        history: int = DEFAULT_HISTORY,
+    ) -> None:
+        self.max_pending = max_pending
+        self.history = history
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gs-job")
+        self._jobs: "OrderedDict[str, Job[T]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Job[T]]:
+        """
+        Returns the job of a key, if it is still known.
+
+        Args:
+            key (str): The job key.
+
+        Returns:
+            Optional[Job[T]]: The job, or None if it was never submitted or was pruned.
+        """
+        with self._lock:
+            return self._jobs.get(key)
+
+    def submit(self, key: str, func: Callable[[], T]) -> Job[T]:
+        """
+        Queues a job, or attaches to the queued or running job of the same key.
+
+        The job runs in a copy of the caller's context, so stage recording carries over.
+
+        Args:
+            key (str): The job key, e.g. the cache key of its result.
+            func (Callable[[], T]): The work to run.
+
+        Returns:
+            Job[T]: The new or existing job.
+
+        Raises:
+            JobQueueFull: If `max_pending` jobs are already queued or running.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not job.done:
+                return job
+
+            pending = sum(1 for queued in self._jobs.values() if not queued.done)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} jobs are already queued or running; please try again later.")
+
+            progress = JobProgress()
+            future = self._executor.submit(copy_context().run, self._run, progress, func)
+            job = Job(key, progress, future)
+            self._jobs.pop(key, None)
+            self._jobs[key] = job
+            self._prune()
+            return job
+
+    @staticmethod
+    def _run(progress: JobProgress, func: Callable[[], T]) -> T:
+        """Runs a job with its progress made current for `checkpoint`."""
+        _current_progress.set(progress)
+        return func()
+
+    def _prune(self) -> None:
+        """Forgets the oldest finished jobs beyond `history`; the caller holds the lock."""
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[: max(0, len(finished) - self.history)]:
+            del self._jobs[key]
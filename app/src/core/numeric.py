@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import NamedTuple, TypeAlias, Union, cast
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+# Characters stripped from text cells before parsing: thousands separators, percent signs and whitespace
+NOISE_PATTERN = r"[,%\s]"
+
+# Text cells treated as 0, matching the "-" placeholder the portal exports for empty metrics
+PLACEHOLDERS = ("-",)
+
+# Column of cells as read from an export: text, numbers or timestamps
+CellSeries: TypeAlias = "pd.Series[Union[str, float, datetime]]"
+
+# Text of a cell `pd.read_csv` reads as an integer
+INTEGER_PATTERN = r"\s*[+-]?\d+\s*"
+
+# Cells `pd.read_csv` reads as missing by default
+NULL_STRINGS = (
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+)  # fmt: skip
+
+
+class NumericResult(NamedTuple):
+    """
+    Result of coercing a column to numbers.
+
+    Attributes:
+        values (pd.Series): The numeric column; cells that could not be parsed are NaN.
+        invalid (pd.Series): Boolean mask of the non-empty cells that could not be parsed.
+    """
+
+    values: "pd.Series[float]"
+    invalid: "pd.Series[bool]"
+
+
+def coerce_numeric(series: CellSeries) -> NumericResult:
+    """
+    Converts a raw export column to float64 in a single vectorized pass.
+
+    Already-numeric columns are returned unchanged. For other columns, every cell that is
+    already a number or a plain numeric string is converted at once; only the remaining
+    text cells have thousands separators, percent signs and whitespace stripped, and "-"
+    placeholders become 0. Cells that still cannot be parsed are flagged instead of raising.
+
+    Args:
+        series (pd.Series): The raw column.
+
+    Returns:
+        NumericResult: The float64 column and the mask of cells that could not be parsed.
+
+    Example:
+        coerce_numeric(pd.Series(["1,234.50", "-", "85%", 12.0])).values  # 1234.5, 0.0, 85.0, 12.0
+    """
+    if is_numeric_dtype(series) and not is_bool_dtype(series):
+        return NumericResult(cast("pd.Series[float]", series), pd.Series(False, index=series.index))
+
+    values = pd.to_numeric(series, errors="coerce")
+    pending = values.isna() & series.notna()
+
+    if pending.any():
+        text = series[pending].astype(str).str.replace(NOISE_PATTERN, "", regex=True)
+        parsed = pd.to_numeric(text, errors="coerce")
+        parsed[text.isin(PLACEHOLDERS)] = 0.0
+        values[pending] = parsed
+
+    values = values.astype("float64")
+    return NumericResult(values, values.isna() & series.notna())
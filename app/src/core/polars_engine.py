@@ -0,0 +1,241 @@
+import importlib.util
+import io
+import os
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+import pandas as pd
+
+from .datetimes import CANDIDATE_FORMATS, DEFAULT_DATETIME_FORMAT, SAMPLE_SIZE, detect_format, format_cache
+from .engine import SORT_COLUMN, ColumnStep, TransformPlan, assemble_frame, keeps_integers
+from .instrumentation import instrumented
+from .jobs import checkpoint
+from .numeric import INTEGER_PATTERN, NOISE_PATTERN, NULL_STRINGS, PLACEHOLDERS
+
+if TYPE_CHECKING:
+    import polars as pl
+
+# CSV uploads at least this large are transformed by Polars when the engine is "auto", it is installed and DuckDB is not
+POLARS_MIN_BYTES = 64 * 1024 * 1024
+
+# Name of the parsed report time column the rows are filtered and sorted on
+_REPORT = "__report"
+
+
+def polars_available() -> bool:
+    """Returns whether the optional polars package, and the pyarrow package it hands frames to pandas with, are installed."""
+    return all(importlib.util.find_spec(name) is not None for name in ("polars", "pyarrow"))
+
+
+def _csv_source(file: io.BytesIO) -> Union[str, io.BytesIO]:
+    """
+    Returns what Polars scans: the path of a file opened from disk, so only the needed columns are
+    read from it, otherwise the uploaded file itself.
+
+    Args:
+        file (io.BytesIO): The uploaded file, or a file opened from disk.
+
+    Returns:
+        Union[str, io.BytesIO]: The path or the rewound file.
+    """
+    name = getattr(file, "name", None)
+    if not isinstance(file, io.BytesIO) and isinstance(name, str) and os.path.isfile(name):
+        return name
+    file.seek(0)
+    return file
+
+
+def _polars_format(datetime_format: str) -> str:
+    """Converts a strptime format to Polars' chrono syntax, which writes fractional seconds as "%.f"."""
+    return datetime_format.replace(".%f", "%.f")
+
+
+def _datetime_expression(column: "pl.Expr", datetime_format: str) -> "pl.Expr":
+    """
+    Parses a text column with its detected format, falling back to the other candidate formats.
+
+    Args:
+        column (pl.Expr): The column.
+        datetime_format (str): The detected format.
+
+    Returns:
+        pl.Expr: The datetime column; null where no format matches.
+    """
+    import polars as pl
+
+    formats = dict.fromkeys((datetime_format, *CANDIDATE_FORMATS))
+    return pl.coalesce([column.str.strptime(pl.Datetime("us"), _polars_format(candidate), strict=False) for candidate in formats])
+
+
+def _numeric_expression(column: "pl.Expr") -> "pl.Expr":
+    """
+    Converts a text column to Float64 the way `coerce_numeric` does: plain numbers first, then the
+    text with thousands separators, percent signs and whitespace stripped, with "-" placeholders as 0.
+
+    Args:
+        column (pl.Expr): The column.
+
+    Returns:
+        pl.Expr: The numeric column; null where the cell cannot be parsed.
+    """
+    import polars as pl
+
+    stripped = column.str.replace_all(NOISE_PATTERN, "")
+    cleaned = pl.when(stripped.is_in(PLACEHOLDERS)).then(pl.lit(0.0)).otherwise(stripped.cast(pl.Float64, strict=False))
+    return pl.coalesce([column.cast(pl.Float64, strict=False), cleaned])
+
+
+def _detect_column_format(frame: Union["pl.LazyFrame", "pl.DataFrame"], server: str, column: str) -> str:
+    """
+    Returns the cached format of a timestamp column, detecting it from a sample of the frame on first use.
+
+    Args:
+        frame (Union[pl.LazyFrame, pl.DataFrame]): The frame the column is read from.
+        server (str): The server the format is cached for.
+        column (str): The column name.
+
+    Returns:
+        str: The format.
+    """
+    import polars as pl
+
+    key = (server, column)
+    datetime_format = format_cache.get(key)
+    if datetime_format is None:
+        sample = frame.lazy().select(pl.col(column).drop_nulls().head(SAMPLE_SIZE)).collect()
+        datetime_format = detect_format(pd.Series(sample[column].to_list(), dtype=object)) or DEFAULT_DATETIME_FORMAT
+        format_cache.set(key, datetime_format)
+    return datetime_format
+
+
+@instrumented("polars")
+def process_csv_polars(
+    file: io.BytesIO,
+    plan: TransformPlan,
+    selected_datetime: datetime,
+    adjusted_datetime: Union[datetime, str],
+    exclude_values: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Runs a compiled plan over a CSV export with Polars lazy frames, multi-threaded.
+
+    The scan only parses the plan's columns and applies the cutoff and S/N exclusion while reading,
+    so the filtered rows are materialized once, as text. One aggregate pass over them reproduces
+    the dtypes pandas would infer and counts the invalid cells, and one pass computes the output
+    columns, which are handed to pandas through Arrow. Reports received in the same second keep
+    their file order, whereas the pandas path leaves their order unspecified.
+
+    Args:
+        file (io.BytesIO): The CSV file.
+        plan (TransformPlan): The compiled plan.
+        selected_datetime (datetime): Rows with a report time at or before this are dropped.
+        adjusted_datetime (Union[datetime, str]): Value written to the "datetime" columns.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+
+    Returns:
+        pd.DataFrame: The same frame `apply_plan` builds from the pandas readers.
+
+    Raises:
+        ImportError: If polars is not installed.
+    """
+    try:
+        import polars as pl
+    except ImportError:
+        raise ImportError("The Polars engine needs the polars package: pip install 'gs-excel-transformation-webapp[polars]'")
+
+    scan = pl.scan_csv(_csv_source(file), infer_schema=False, null_values=list(NULL_STRINGS))
+    report_format = _detect_column_format(scan, plan.server, SORT_COLUMN)
+
+    # Keep the needed columns of the rows newer than the cutoff, newest report first and in file order on ties
+    excluded = pl.Series(exclude_values or [], dtype=pl.String)
+    filtered = (
+        scan.select(*plan.usecols, _datetime_expression(pl.col(SORT_COLUMN), report_format).alias(_REPORT))
+        .filter((pl.col(_REPORT) > selected_datetime) & ~pl.col("S/N").is_in(excluded.implode()).fill_null(False))
+        .sort(_REPORT, descending=True, maintain_order=True)
+        .collect()
+    )
+    checkpoint(f"Reading {file.name}", 1.0)
+
+    source_steps = [step for step in plan.steps if step.kind in ("copy", "numeric", "timestamp")]
+    formats = {
+        step.target: _detect_column_format(filtered, plan.server, str(step.source))
+        for step in source_steps
+        if step.kind == "timestamp"
+    }
+
+    # Invalid cell counts over the filtered rows, and column flags over every row of the file,
+    # which decide the dtypes like a single `pd.read_csv` call
+    counts = []
+    flags = []
+    for number, step in enumerate(source_steps):
+        column = pl.col(str(step.source))
+        if step.kind == "timestamp":
+            parsed = _datetime_expression(column, formats[step.target])
+            counts.append((column.count() - parsed.count()).alias(f"invalid_{number}"))
+            continue
+        if step.kind == "numeric":
+            counts.append((column.count() - _numeric_expression(column).count()).alias(f"invalid_{number}"))
+        else:
+            numbers = column.cast(pl.Float64, strict=False).is_not_null() | column.is_null()
+            flags.append(numbers.all().alias(f"numeric_{number}"))
+        if step.kind == "copy" or keeps_integers(step):
+            integers = column.str.contains(f"^(?:{INTEGER_PATTERN})$")
+            flags.append((column.is_not_null().all() & integers.all()).alias(f"integer_{number}"))
+    summary = filtered.select(counts).row(0, named=True) if counts else {}
+    if flags:
+        summary.update(scan.select(flags).collect().row(0, named=True))
+
+    invalid_cells: Dict[str, int] = {}
+    expressions = []
+    for number, step in enumerate(source_steps):
+        invalid = int(summary.get(f"invalid_{number}") or 0)
+        if invalid:
+            invalid_cells[step.target] = invalid
+        all_numeric = bool(summary.get(f"numeric_{number}", False))
+        all_integer = bool(summary.get(f"integer_{number}", False))
+        expression = _step_expression(step, pl.col(str(step.source)), formats.get(step.target), all_numeric, all_integer)
+        expressions.append(expression.alias(step.target))
+
+    result = filtered.select(expressions).to_pandas()
+    checkpoint("Transforming", 1.0)
+    return assemble_frame(result, plan, adjusted_datetime, len(filtered), invalid_cells)
+
+
+def _step_expression(
+    step: ColumnStep, column: "pl.Expr", datetime_format: Optional[str], all_numeric: bool, all_integer: bool
+) -> "pl.Expr":
+    """
+    Returns the expression of an output column read from the file.
+
+    Copy columns whose every cell is a number are cast like `pd.read_csv` infers them: Int64 when
+    every cell is an integer, Float64 otherwise. Numeric columns follow `coerce_numeric`, except that
+    integer columns without a unit conversion stay Int64 as pandas leaves them.
+
+    Args:
+        step (ColumnStep): The step.
+        column (pl.Expr): The source column.
+        datetime_format (Optional[str]): The detected format of "timestamp" steps.
+        all_numeric (bool): Whether every non-empty cell of a "copy" column is a number.
+        all_integer (bool): Whether every cell is an integer and none is empty.
+
+    Returns:
+        pl.Expr: The expression.
+    """
+    import polars as pl
+
+    if step.kind == "timestamp":
+        return _datetime_expression(column, datetime_format or DEFAULT_DATETIME_FORMAT)
+    if step.kind == "numeric":
+        if all_integer and keeps_integers(step):
+            return column.str.strip_chars().cast(pl.Int64, strict=False)
+        expression = _numeric_expression(column)
+        if step.factor != 1.0:
+            expression = expression * step.factor
+        if step.decimals is not None:
+            expression = expression.round(step.decimals, mode="half_to_even")
+        return expression
+    if all_integer:
+        return column.str.strip_chars().cast(pl.Int64, strict=False)
+    if all_numeric:
+        return column.cast(pl.Float64)
+    return column
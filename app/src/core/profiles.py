@@ -0,0 +1,237 @@
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Tuple
+
+# Constant unit
+gallon = 3.785411784
+feet_squared = 0.09290304
+
+# Rename columns
+cols_to_rename = {
+    "Id": "id",
+    "Robot name": "robot_name",
+    "S/N": "serial_number",
+    "Map name": "map_name",
+    "Cleaning plan": "task_name",
+    "User": "user",
+    "Task start time": "start_time",
+    "End time": "end_time",
+    "Task completion (%)": "task_completion",
+    "Actual cleaning area(㎡)": "cleaning_area",
+    "Actual cleaning area(ft²)": "cleaning_area",
+    "Total time (h)": "total_time",
+    "Water usage (L)": "water_usage",
+    "Water usage (gal)": "water_usage",
+    "Brush (%)": "brush",
+    "Filter (%)": "filter_element",
+    "Squeegee(%)": "squeegee",
+    "Planned crystallization area (㎡)": "created_at",
+    "Planned crystallization area (ft²)": "created_at",
+    "Actual crystallization area (㎡)": "updated_at",
+    "Actual crystallization area (ft²)": "updated_at",
+    "Cleaning plan area (㎡)": "area_planned",
+    "Cleaning plan area (ft²)": "area_planned",
+    "Start battery level (%)": "start_battery_level",
+    "End battery level (%)": "end_battery_level",
+    "Receive task report time": "task_report_received",
+    "Task type": "cleaning_mode",
+    "Download link": "report_link",
+    "Work efficiency (㎡/h)": "performance",
+    "Work efficiency (ft²/h)": "performance",
+}
+
+# Columns read from the metric (㎡, L) and imperial (ft², gal) exports, in output order
+metric_columns = (
+    "Robot name",
+    "S/N",
+    "Map name",
+    "Cleaning plan",
+    "User",
+    "Task start time",
+    "End time",
+    "Task completion (%)",
+    "Actual cleaning area(㎡)",
+    "Total time (h)",
+    "Water usage (L)",
+    "Brush (%)",
+    "Filter (%)",
+    "Squeegee(%)",
+    "Planned crystallization area (㎡)",
+    "Actual crystallization area (㎡)",
+    "Cleaning plan area (㎡)",
+    "Start battery level (%)",
+    "End battery level (%)",
+    "Receive task report time",
+    "Task type",
+    "Download link",
+    "Work efficiency (㎡/h)",
+)
+
+imperial_columns = (
+    "Robot name",
+    "S/N",
+    "Map name",
+    "Cleaning plan",
+    "User",
+    "Task start time",
+    "End time",
+    "Task completion (%)",
+    "Actual cleaning area(ft²)",
+    "Total time (h)",
+    "Water usage (gal)",
+    "Brush (%)",
+    "Filter (%)",
+    "Squeegee(%)",
+    "Planned crystallization area (ft²)",
+    "Actual crystallization area (ft²)",
+    "Cleaning plan area (ft²)",
+    "Start battery level (%)",
+    "End battery level (%)",
+    "Receive task report time",
+    "Task type",
+    "Download link",
+    "Work efficiency (ft²/h)",
+)
+
+
+@dataclass(frozen=True)
+class NumericColumn:
+    """
+    A column cleaned to float, optionally converted to another unit.
+
+    Attributes:
+        column (str): The source column name.
+        factor (float): Multiplier applied after cleaning (e.g. `gallon` to convert gal to L).
+        decimals (Optional[int]): Number of decimals to round to after conversion, if any.
+    """
+
+    column: str
+    factor: float = 1.0
+    decimals: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class NullColumn:
+    """
+    An output column filled with NULL values.
+
+    Attributes:
+        name (str): The output column name.
+        after (Optional[str]): The output column it is placed after; None places it first.
+    """
+
+    name: str
+    after: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ServerProfile:
+    """
+    Declarative description of how an export is transformed for a server.
+
+    Attributes:
+        name (str): The server name shown in the sidebar.
+        columns (Tuple[str, ...]): Source columns to select, in output order.
+        numeric_columns (Tuple[NumericColumn, ...]): Columns cleaned to float and their unit conversions.
+        datetime_columns (Tuple[str, ...]): Columns overwritten with the adjusted datetime.
+        timestamp_columns (Tuple[str, ...]): Columns parsed to datetimes with their detected format.
+        categorical_columns (Tuple[str, ...]): Low-cardinality text columns kept as categoricals.
+        null_columns (Tuple[NullColumn, ...]): NULL columns to add and their positions.
+        renames (Tuple[Tuple[str, str], ...]): Source to output column name pairs.
+    """
+
+    name: str
+    columns: Tuple[str, ...]
+    numeric_columns: Tuple[NumericColumn, ...] = ()
+    datetime_columns: Tuple[str, ...] = ()
+    timestamp_columns: Tuple[str, ...] = ()
+    categorical_columns: Tuple[str, ...] = ()
+    null_columns: Tuple[NullColumn, ...] = ()
+    renames: Tuple[Tuple[str, str], ...] = ()
+
+
+# Timestamp columns, shared by both export schemas; the start and end times are written as read
+# and only parsed where their times are needed, e.g. by the database loader
+timestamp_columns = ("Receive task report time",)
+
+# Text columns with few distinct values, shared by both export schemas
+categorical_columns = ("Robot name", "S/N", "Map name", "Cleaning plan", "Task type")
+
+# Base profiles matching the raw metric and imperial exports, without renames
+metric_profile = ServerProfile(
+    name="metric",
+    columns=metric_columns,
+    numeric_columns=(
+        NumericColumn("Work efficiency (㎡/h)"),
+        NumericColumn("Actual cleaning area(㎡)"),
+        NumericColumn("Cleaning plan area (㎡)"),
+        NumericColumn("Brush (%)"),
+        NumericColumn("Filter (%)"),
+        NumericColumn("Squeegee(%)"),
+    ),
+    datetime_columns=("Planned crystallization area (㎡)", "Actual crystallization area (㎡)"),
+    timestamp_columns=timestamp_columns,
+    categorical_columns=categorical_columns,
+    null_columns=(NullColumn("Id"),),
+)
+
+imperial_profile = ServerProfile(
+    name="imperial",
+    columns=imperial_columns,
+    numeric_columns=(
+        NumericColumn("Work efficiency (ft²/h)", feet_squared, 3),
+        NumericColumn("Actual cleaning area(ft²)", feet_squared, 3),
+        NumericColumn("Cleaning plan area (ft²)", feet_squared, 3),
+        NumericColumn("Water usage (gal)", gallon, 4),
+        NumericColumn("Brush (%)"),
+        NumericColumn("Filter (%)"),
+        NumericColumn("Squeegee(%)"),
+    ),
+    datetime_columns=("Planned crystallization area (ft²)", "Actual crystallization area (ft²)"),
+    timestamp_columns=timestamp_columns,
+    categorical_columns=categorical_columns,
+    null_columns=(NullColumn("Id"),),
+)
+
+# Output columns added on top of the renamed export
+id_column = (NullColumn("id"),)
+pause_time_column = (NullColumn("pause_time", "total_time"),)
+job_vendor_columns = (NullColumn("job_id", "performance"), NullColumn("vendor", "job_id"))
+renamed = tuple(cols_to_rename.items())
+
+# Server profiles, in the order shown in the sidebar
+SERVER_PROFILES: Dict[str, ServerProfile] = {
+    "GS SGV1": replace(metric_profile, name="GS SGV1", null_columns=id_column, renames=renamed),
+    "GS SGV2": replace(
+        metric_profile,
+        name="GS SGV2",
+        null_columns=id_column + pause_time_column + job_vendor_columns,
+        renames=renamed,
+    ),
+    "GS AUS": replace(
+        metric_profile,
+        name="GS AUS",
+        null_columns=id_column + pause_time_column + job_vendor_columns,
+        renames=renamed,
+    ),
+    "GS QA": replace(metric_profile, name="GS QA", null_columns=id_column + job_vendor_columns, renames=renamed),
+    "GS CA": replace(imperial_profile, name="GS CA", null_columns=id_column + job_vendor_columns, renames=renamed),
+}
+
+
+def get_profile(server: str) -> ServerProfile:
+    """
+    Returns the profile of the given server.
+
+    Args:
+        server (str): The name of the server (e.g., "GS SGV1").
+
+    Returns:
+        ServerProfile: The server's profile.
+
+    Raises:
+        ValueError: If the server has no profile.
+    """
+    try:
+        return SERVER_PROFILES[server]
+    except KeyError:
+        raise ValueError(f"Unknown server: {server}")
@@ -0,0 +1,98 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .datetimes import to_timestamps
+from .instrumentation import instrumented
+from .numeric import CellSeries, coerce_numeric
+
+# Keys of a rollup row: one row per day, server, robot and map
+ROLLUP_KEYS = ("day", "server", "serial_number", "map_name")
+
+# Output columns summed per key, already in metric units (㎡, L, h) for every server
+ROLLUP_SUMS = ("cleaning_area", "water_usage", "total_time")
+
+# Output column averaged per key, kept as a sum and a count so rollups of different uploads add up
+MEAN_COLUMN = "performance"
+
+# Additive columns of a rollup row, in the order they are stored
+ROLLUP_VALUES = ("task_count", *ROLLUP_SUMS, f"{MEAN_COLUMN}_sum", f"{MEAN_COLUMN}_count")
+
+# Output column the day of a task is taken from
+DAY_SOURCE = "start_time"
+
+# Format of the day key
+DAY_FORMAT = "%Y-%m-%d"
+
+# Decimals the totals and means of the exported report are rounded to
+REPORT_DECIMALS = 4
+
+
+def _numbers(column: CellSeries) -> "pd.Series[float]":
+    """Reads a column as float64; cells that are not numbers become NaN."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype(object)
+    return coerce_numeric(column).values.astype("float64")
+
+
+@instrumented("rollup")
+def daily_rollups(df_processed: pd.DataFrame, server: str) -> pd.DataFrame:
+    """
+    Computes the daily totals of each robot and map of a processed frame.
+
+    Tasks are grouped by the day they started on, with the categorical serial number and map
+    columns grouped on their codes. Rows without a start time, serial number or map are left out.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        server (str): The server the frame was processed for.
+
+    Returns:
+        pd.DataFrame: One row per `ROLLUP_KEYS`, with the additive `ROLLUP_VALUES` columns.
+    """
+    start_times = to_timestamps(df_processed[DAY_SOURCE])
+    performance = _numbers(df_processed[MEAN_COLUMN])
+    frame = pd.DataFrame(
+        {
+            "day": start_times.dt.normalize(),
+            "serial_number": df_processed["serial_number"],
+            "map_name": df_processed["map_name"],
+            "task_count": np.ones(len(df_processed), dtype=np.int64),
+            **{column: _numbers(df_processed[column]) for column in ROLLUP_SUMS},
+            f"{MEAN_COLUMN}_sum": performance,
+            f"{MEAN_COLUMN}_count": performance.notna().astype(np.int64),
+        }
+    )
+
+    aggregations: Dict[str, str] = {column: "sum" for column in ROLLUP_VALUES}
+    rollups = frame.groupby(["day", "serial_number", "map_name"], observed=True, sort=True).agg(aggregations).reset_index()
+
+    rollups["day"] = rollups["day"].dt.strftime(DAY_FORMAT)
+    rollups.insert(1, "server", server)
+    for column in ("serial_number", "map_name"):
+        rollups[column] = rollups[column].astype(object)
+    daily: pd.DataFrame = rollups[list(ROLLUP_KEYS + ROLLUP_VALUES)]
+    return daily
+
+
+def rollup_report(rollups: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turns stored rollups into the exported report, replacing the sum and count of work efficiency by their mean.
+
+    Args:
+        rollups (pd.DataFrame): Rollups returned by `daily_rollups` or read from the rollup store.
+
+    Returns:
+        pd.DataFrame: One row per `ROLLUP_KEYS` with the task count, the totals and the mean work efficiency.
+    """
+    report: pd.DataFrame = rollups[list(ROLLUP_KEYS + ("task_count",) + ROLLUP_SUMS)].copy()
+    counts = rollups[f"{MEAN_COLUMN}_count"].to_numpy(dtype="float64")
+    sums = rollups[f"{MEAN_COLUMN}_sum"].to_numpy(dtype="float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        report[f"mean_{MEAN_COLUMN}"] = np.where(counts > 0, sums / counts, np.nan)
+
+    # Sums of many rows pick up float noise in the last digits
+    rounded = list(ROLLUP_SUMS) + [f"mean_{MEAN_COLUMN}"]
+    report[rounded] = report[rounded].round(REPORT_DECIMALS)
+    return report
@@ -0,0 +1,315 @@
+import csv
+import io
+import os
+import posixpath
+import zipfile
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from xml.etree import ElementTree
+
+from .instrumentation import instrumented
+from .profiles import SERVER_PROFILES, ServerProfile, get_profile, imperial_columns, metric_columns
+
+# Units of the area and water usage columns of each export schema
+UNIT_LABELS = {"metric": "㎡, L", "imperial": "ft², gal"}
+
+# Columns found only in the exports of one schema
+UNIT_COLUMNS = {
+    "metric": frozenset(metric_columns) - frozenset(imperial_columns),
+    "imperial": frozenset(imperial_columns) - frozenset(metric_columns),
+}
+
+_SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_DOC_RELS_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_DEFAULT_SHEET = "xl/worksheets/sheet1.xml"
+
+
+class SchemaReport(NamedTuple):
+    """The header of an uploaded export checked against the columns of a server profile."""
+
+    file_name: str
+    server: str
+    unit: Optional[str]
+    missing: Tuple[str, ...]
+    servers: Tuple[str, ...]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file has every column the server reads."""
+        return not self.missing
+
+    def describe(self) -> str:
+        """
+        Describes the mismatch between the file and the server.
+
+        Returns:
+            str: A one-paragraph report naming the detected schema, the missing columns and the matching servers.
+        """
+        unit = f"{self.unit} export ({UNIT_LABELS[self.unit]})" if self.unit else "unrecognized export"
+        message = f"{self.file_name}: {unit} that does not match {self.server}. Missing columns: {', '.join(self.missing)}."
+        if self.servers:
+            message += f" Matching servers: {', '.join(self.servers)}."
+        return message
+
+
+class SchemaMismatchError(ValueError):
+    """Raised when an uploaded export lacks the columns of the selected server."""
+
+    def __init__(self, report: SchemaReport) -> None:
+        super().__init__(report.describe())
+        self.report = report
+
+
+def _column_index(reference: str) -> int:
+    """
+    Converts a cell reference (e.g. "AB1") to a zero-based column index.
+
+    Args:
+        reference (str): The cell reference.
+
+    Returns:
+        int: The column index.
+    """
+    index = 0
+    for letter in reference.rstrip("0123456789"):
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def _cell_text(element: ElementTree.Element) -> str:
+    """Returns the text of an inline or shared string element, joining rich-text runs."""
+    return "".join(node.text or "" for node in element.iter(f"{_SHEET_NS}t"))
+
+
+def _first_sheet_path(archive: zipfile.ZipFile) -> str:
+    """
+    Resolves the path of the first worksheet of a workbook.
+
+    Args:
+        archive (zipfile.ZipFile): The .xlsx archive.
+
+    Returns:
+        str: The archive path of the first sheet in workbook order.
+    """
+    try:
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        relationships = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    except KeyError:
+        return _DEFAULT_SHEET
+
+    sheet = workbook.find(f"{_SHEET_NS}sheets/{_SHEET_NS}sheet")
+    if sheet is None:
+        return _DEFAULT_SHEET
+    relationship_id = sheet.get(f"{_DOC_RELS_NS}id")
+    for relationship in relationships.iter(f"{_RELS_NS}Relationship"):
+        if relationship.get("Id") == relationship_id:
+            target = relationship.get("Target", "")
+            return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+    return _DEFAULT_SHEET
+
+
+def _shared_strings(archive: zipfile.ZipFile, indexes: Iterable[int]) -> Dict[int, str]:
+    """
+    Reads the shared strings with the given indexes, stopping after the last one.
+
+    Args:
+        archive (zipfile.ZipFile): The .xlsx archive.
+        indexes (Iterable[int]): The indexes referenced by the header cells.
+
+    Returns:
+        Dict[int, str]: The text of each requested index.
+    """
+    wanted = set(indexes)
+    strings: Dict[int, str] = {}
+    if not wanted or "xl/sharedStrings.xml" not in archive.namelist():
+        return strings
+
+    last = max(wanted)
+    with archive.open("xl/sharedStrings.xml") as stream:
+        index = 0
+        for _, element in ElementTree.iterparse(stream):
+            if element.tag != f"{_SHEET_NS}si":
+                continue
+            if index in wanted:
+                strings[index] = _cell_text(element)
+            if index == last:
+                break
+            index += 1
+            element.clear()
+    return strings
+
+
+def read_excel_header(file: io.BytesIO) -> List[str]:
+    """
+    Reads the first row of the first sheet of an .xlsx file without parsing the rest of the workbook.
+
+    Only the first row of the sheet and the shared strings it references are parsed, whereas
+    opening the workbook with openpyxl loads every shared string of the file.
+
+    Args:
+        file (io.BytesIO): The uploaded .xlsx file.
+
+    Returns:
+        List[str]: The column names; empty header cells are returned as empty strings.
+    """
+    with zipfile.ZipFile(file) as archive:
+        cells: Dict[int, Tuple[Optional[str], str]] = {}
+        with archive.open(_first_sheet_path(archive)) as stream:
+            for _, element in ElementTree.iterparse(stream):
+                if element.tag == f"{_SHEET_NS}c":
+                    cell_type = element.get("t")
+                    if cell_type == "inlineStr":
+                        text = _cell_text(element)
+                    else:
+                        value = element.find(f"{_SHEET_NS}v")
+                        text = value.text or "" if value is not None else ""
+                    # Empty cells may be left out, so cells are placed by their reference
+                    reference = element.get("r")
+                    cells[_column_index(reference) if reference else len(cells)] = (cell_type, text)
+                elif element.tag == f"{_SHEET_NS}row":
+                    break
+
+        shared = _shared_strings(archive, (int(text) for cell_type, text in cells.values() if cell_type == "s"))
+
+    header = [""] * (max(cells) + 1 if cells else 0)
+    for position, (cell_type, text) in cells.items():
+        header[position] = shared.get(int(text), "") if cell_type == "s" else text
+    return header
+
+
+def read_csv_header(file: io.BytesIO) -> List[str]:
+    """
+    Reads the header line of a CSV file.
+
+    Args:
+        file (io.BytesIO): The uploaded CSV file.
+
+    Returns:
+        List[str]: The column names.
+    """
+    line = file.readline().decode("utf-8-sig")
+    return next(csv.reader([line]), [])
+
+
+def file_extension(name: str) -> str:
+    """
+    Returns the extension of a file name in lower case, so "REPORT.CSV" is read like "report.csv".
+
+    Args:
+        name (str): The file name or path.
+
+    Returns:
+        str: The extension with its dot, e.g. ".csv"; empty if the name has none.
+    """
+    return os.path.splitext(name)[1].lower()
+
+
+def read_header(file: io.BytesIO) -> Optional[List[str]]:
+    """
+    Reads the column names of an uploaded file and rewinds it for the readers.
+
+    Args:
+        file (io.BytesIO): The uploaded file.
+
+    Returns:
+        Optional[List[str]]: The column names, or None if the file type has no header probe.
+    """
+    file.seek(0)
+    extension = file_extension(file.name)
+    try:
+        if extension == ".csv":
+            return read_csv_header(file)
+        elif extension == ".xlsx":
+            return read_excel_header(file)
+        return None
+    finally:
+        file.seek(0)
+
+
+def detect_unit(columns: Sequence[str]) -> Optional[str]:
+    """
+    Detects the export schema from the unit-specific column names.
+
+    Args:
+        columns (Sequence[str]): The column names of the file.
+
+    Returns:
+        Optional[str]: "metric" or "imperial", or None if neither schema's unit columns are found.
+    """
+    present = set(columns)
+    counts = {unit: len(unit_columns & present) for unit, unit_columns in UNIT_COLUMNS.items()}
+    unit = max(counts, key=lambda name: counts[name])
+    return unit if counts[unit] and list(counts.values()).count(counts[unit]) == 1 else None
+
+
+def matching_servers(columns: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Returns the servers whose profile columns are all present in a file.
+
+    Args:
+        columns (Sequence[str]): The column names of the file.
+
+    Returns:
+        Tuple[str, ...]: The matching servers, in sidebar order.
+    """
+    present = set(columns)
+    return tuple(name for name, profile in SERVER_PROFILES.items() if present.issuperset(profile.columns))
+
+
+@instrumented("probe")
+def probe_schema(file: io.BytesIO, profile: ServerProfile) -> Optional[SchemaReport]:
+    """
+    Checks the header of a file against the columns of a server profile, without reading the file's rows.
+
+    Args:
+        file (io.BytesIO): The uploaded file.
+        profile (ServerProfile): The profile of the selected server.
+
+    Returns:
+        Optional[SchemaReport]: The report, or None if the file type has no header probe.
+    """
+    columns = read_header(file)
+    if columns is None:
+        return None
+    present = set(columns)
+    missing = tuple(column for column in profile.columns if column not in present)
+    return SchemaReport(file.name, profile.name, detect_unit(columns), missing, matching_servers(columns))
+
+
+def check_schema(file: io.BytesIO, profile: ServerProfile) -> None:
+    """
+    Rejects a file that lacks the columns of a server profile before any of its rows are parsed.
+
+    Args:
+        file (io.BytesIO): The uploaded file.
+        profile (ServerProfile): The profile of the selected server.
+
+    Raises:
+        SchemaMismatchError: If the header lacks a column of the profile.
+    """
+    report = probe_schema(file, profile)
+    if report is not None and not report.ok:
+        raise SchemaMismatchError(report)
+
+
+def suggest_server(files: Sequence[io.BytesIO], selected_server: str) -> Tuple[Optional[str], List[SchemaReport]]:
+    """
+    Probes the uploaded files for the selected server and suggests the only server matching all of them.
+
+    Args:
+        files (Sequence[io.BytesIO]): The uploaded files.
+        selected_server (str): The server selected in the sidebar.
+
+    Returns:
+        Tuple[Optional[str], List[SchemaReport]]: The server to switch to, None if the selected server
+            matches or no single server matches every file, and the reports of the mismatching files.
+    """
+    profile = get_profile(selected_server)
+    reports = [report for report in (probe_schema(file, profile) for file in files) if report is not None]
+    mismatches = [report for report in reports if not report.ok]
+    if not mismatches:
+        return None, []
+
+    candidates = set.intersection(*(set(report.servers) for report in reports))
+    suggestion = candidates.pop() if len(candidates) == 1 else None
+    return suggestion, mismatches
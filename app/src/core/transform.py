@@ -0,0 +1,608 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Dict, Optional, List
+from datetime import datetime, timedelta
+import pandas as pd
+from pandas.api.types import is_integer_dtype
+
+from .datetimes import DatetimeParser, parse_cutoff, parse_datetimes, to_timestamps
+from .duckdb_engine import DUCKDB_MIN_BYTES, duckdb_available, process_csv_duckdb
+from .engine import SORT_COLUMN, apply_plan, compile_profile
+from .instrumentation import instrumented, stage
+from .jobs import checkpoint
+from .polars_engine import POLARS_MIN_BYTES, polars_available, process_csv_polars
+from .profiles import ServerProfile, get_profile, imperial_profile, metric_profile
+from .schema import check_schema, file_extension
+from .validation import ValidationReport, validate_frame
+
+# Number of rows read per chunk when streaming CSV files
+CSV_CHUNK_SIZE = 50_000
+
+# Number of rows between progress checkpoints when streaming Excel files
+EXCEL_PROGRESS_ROWS = 10_000
+
+# Columns identifying a task report across overlapping exports
+DEDUP_COLUMNS = ["S/N", "Task start time", "Receive task report time"]
+
+# Engines a single file can be transformed with; "auto" picks DuckDB, then Polars, for large CSV files when installed
+ENGINES = ("auto", "pandas", "duckdb", "polars")
+
+# Engines that only read CSV files
+CSV_ENGINES = ("duckdb", "polars")
+
+
+# Function to read files dynamically based on file type
+def read_file(file: io.BytesIO) -> pd.DataFrame:
+    """
+    Reads a file and returns a pandas DataFrame.
+    Supports CSV and Excel (.xlsx) files.
+
+    Args:
+        file (io.BytesIO): The uploaded file.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the file's data.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+    """
+    try:
+        # Check the file extension
+        extension = file_extension(file.name)
+        if extension == ".csv":
+            return pd.read_csv(file)
+        elif extension in (".xls", ".xlsx"):
+            return pd.read_excel(file)
+        else:
+            raise ValueError(f"Unsupported file type: {file.name}")
+    except Exception as e:
+        raise RuntimeError(f"An error occurred while reading the file: {e}")
+
+
+def _update_numeric_columns(df: pd.DataFrame, numeric: Dict[str, bool]) -> None:
+    """
+    Narrows down the columns that hold only numbers, from a chunk of every row read.
+
+    Args:
+        df (pd.DataFrame): A chunk of the file, before any row is filtered out.
+        numeric (Dict[str, bool]): Columns that held only numbers so far, mapped to whether they need floats;
+            columns with a cell of the chunk that is not a number are removed.
+    """
+    if df.empty:
+        return
+    for column in list(numeric):
+        try:
+            values = pd.to_numeric(df[column])
+        except (ValueError, TypeError):
+            del numeric[column]
+            continue
+        if not is_integer_dtype(values):
+            numeric[column] = True
+
+
+def _infer_column_dtypes(df: pd.DataFrame, numeric: Dict[str, bool]) -> pd.DataFrame:
+    """
+    Converts string columns that hold only numbers back to numeric dtypes.
+
+    Chunks are read as strings so that every chunk shares the same dtypes; this restores
+    the int/float columns that a single `pd.read_csv` call would have produced. The columns
+    are found over every row read, so the rows filtered out still decide a column's dtype.
+
+    Args:
+        df (pd.DataFrame): The surviving rows, read with `dtype=str`.
+        numeric (Dict[str, bool]): Columns that held only numbers in the whole file, mapped to whether they need floats.
+
+    Returns:
+        pd.DataFrame: The same DataFrame with numeric columns converted.
+    """
+    for column, needs_floats in numeric.items():
+        df[column] = pd.to_numeric(df[column]).astype("float64" if needs_floats else "int64")
+    return df
+
+
+def filter_report_rows(df: pd.DataFrame, selected_datetime: datetime, exclude_values: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Keeps the rows whose "Receive task report time" is after the cutoff, excluding the given serial numbers.
+
+    Input already sorted by report time, in either direction, is cut with a binary search
+    instead of comparing every row against the cutoff.
+
+    Args:
+        df (pd.DataFrame): DataFrame with a parsed "Receive task report time" column.
+        selected_datetime (datetime): Rows with a report time at or before this are dropped.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+
+    Returns:
+        pd.DataFrame: A new DataFrame containing only the surviving rows.
+    """
+    report_times = df["Receive task report time"]
+    if report_times.is_monotonic_increasing:
+        start = int(report_times.searchsorted(selected_datetime, side="right"))
+        df = df.iloc[start:].copy()
+    elif report_times.is_monotonic_decreasing:
+        end = len(df) - int(report_times.iloc[::-1].searchsorted(selected_datetime, side="right"))
+        df = df.iloc[:end].copy()
+    else:
+        df = df[report_times > selected_datetime]
+
+    if exclude_values:
+        df = df[~df["S/N"].isin(exclude_values)]
+    return df
+
+
+def read_csv_filtered(
+    file: io.BytesIO,
+    selected_datetime: datetime,
+    exclude_values: Optional[List[str]] = None,
+    usecols: Optional[List[str]] = None,
+    chunksize: int = CSV_CHUNK_SIZE,
+    server: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Streams a CSV file in bounded chunks and keeps only the rows newer than the cutoff.
+
+    The "Receive task report time" cutoff and the S/N exclusion are applied to each chunk
+    as soon as it is read, so peak memory grows with the filtered output instead of the upload.
+    Progress is reported after each chunk from the share of the file read so far.
+
+    Args:
+        file (io.BytesIO): The uploaded CSV file.
+        selected_datetime (datetime): Rows with a report time at or before this are dropped.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+        usecols (Optional[List[str]]): Columns to read; all columns are read if None.
+        chunksize (int): Number of rows read per chunk.
+        server (Optional[str]): The server whose cached report time format is used.
+
+    Returns:
+        pd.DataFrame: DataFrame containing only the surviving rows.
+    """
+    survivors = []
+    numeric: Optional[Dict[str, bool]] = None
+    key = (server, SORT_COLUMN) if server else None
+    label = f"Reading {file.name}"
+    start = file.tell()
+    size = max(1, file.seek(0, io.SEEK_END) - start)
+    file.seek(start)
+    for chunk in pd.read_csv(file, usecols=usecols, chunksize=chunksize, dtype=str):
+        if numeric is None:
+            numeric = dict.fromkeys((column for column in chunk.columns if column != SORT_COLUMN), False)
+        _update_numeric_columns(chunk, numeric)
+        chunk[SORT_COLUMN] = parse_datetimes(chunk[SORT_COLUMN], key).values
+        survivors.append(filter_report_rows(chunk, selected_datetime, exclude_values))
+        checkpoint(label, (file.tell() - start) / size)
+
+    df = pd.concat(survivors, ignore_index=True)
+    return _infer_column_dtypes(df, numeric or {})
+
+
+def _cell_value(row: tuple, pos: int) -> object:
+    """Returns a cell of a sheet row, None past its last cell, with whole-number floats as ints like `pd.read_excel`."""
+    value = row[pos] if pos < len(row) else None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _dropped_frame(rows: List[tuple], positions: Dict[str, int]) -> pd.DataFrame:
+    """Builds the given columns of the sheet rows that were filtered out."""
+    data = {column: [_cell_value(row, pos) for row in rows] for column, pos in positions.items()}
+    dropped: pd.DataFrame = pd.DataFrame(data, columns=list(positions), dtype=object)
+    return dropped
+
+
+def read_excel_filtered(
+    file: io.BytesIO,
+    selected_datetime: datetime,
+    exclude_values: Optional[List[str]] = None,
+    usecols: Optional[List[str]] = None,
+    server: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Streams the first sheet of an Excel file in openpyxl read-only mode, keeping only the rows
+    newer than the cutoff and only the requested columns.
+
+    Rows are dropped while the sheet is parsed, so no DataFrame is built for rows or columns
+    that the processing functions would discard anyway. Progress is reported every
+    `EXCEL_PROGRESS_ROWS` rows against the row count of the sheet's dimension.
+
+    Args:
+        file (io.BytesIO): The uploaded Excel file.
+        selected_datetime (datetime): Rows with a report time at or before this are dropped.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+        usecols (Optional[List[str]]): Columns to read; all columns are read if None.
+        server (Optional[str]): The server whose cached report time format is used.
+
+    Returns:
+        pd.DataFrame: DataFrame containing only the surviving rows.
+
+    Raises:
+        KeyError: If a requested column is missing from the header row.
+    """
+    # Imported on first use, so CSV-only workers do not pay for it
+    import openpyxl
+
+    parse_report_time = DatetimeParser((server, SORT_COLUMN) if server else None)
+    label = f"Reading {file.name}"
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total_rows = sheet.max_row or 0
+        rows = sheet.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        columns = usecols if usecols is not None else [str(name) for name in header if name is not None]
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise KeyError(f"Columns not found in the file: {missing}")
+
+        positions = [header.index(column) for column in columns]
+        report_pos = header.index("Receive task report time")
+        sn_pos = header.index("S/N")
+        excluded = set(exclude_values or [])
+        data: List[List[object]] = [[] for _ in columns]
+        # Rows filtered out still decide which columns are numeric, so they are checked in batches
+        numeric = dict.fromkeys((column for column in columns if column != SORT_COLUMN), False)
+        numeric_positions = {column: header.index(column) for column in numeric}
+        dropped: List[tuple] = []
+
+        for row_number, row in enumerate(rows, start=2):
+            if row_number % EXCEL_PROGRESS_ROWS == 0:
+                checkpoint(label, row_number / total_rows if total_rows else 0.0)
+                _update_numeric_columns(_dropped_frame(dropped, numeric_positions), numeric)
+                numeric_positions = {column: numeric_positions[column] for column in numeric}
+                dropped.clear()
+            if report_pos >= len(row):
+                continue
+            report_time = parse_report_time(row[report_pos])
+            if report_time is None or report_time <= selected_datetime or (excluded and row[sn_pos] in excluded):
+                if numeric:
+                    dropped.append(row)
+                continue
+            for values, pos in zip(data, positions):
+                values.append(_cell_value(row, pos))
+    finally:
+        workbook.close()
+    checkpoint(label, 1.0)
+
+    _update_numeric_columns(_dropped_frame(dropped, numeric_positions), numeric)
+    # Built as object columns, so only the columns numeric over the whole sheet are converted
+    df = pd.DataFrame(dict(zip(columns, data)), columns=columns, dtype=object)
+    _update_numeric_columns(df, numeric)
+    df[SORT_COLUMN] = pd.to_datetime(df[SORT_COLUMN].map(parse_report_time))
+    return _infer_column_dtypes(df, numeric)
+
+
+@instrumented("read")
+def read_filtered_file(
+    file: io.BytesIO,
+    selected_datetime: datetime,
+    exclude_values: Optional[List[str]] = None,
+    usecols: Optional[List[str]] = None,
+    server: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Reads a file and keeps only the rows newer than the cutoff, excluding the given serial numbers.
+    CSV files are streamed in chunks and .xlsx files are streamed row by row.
+
+    Args:
+        file (io.BytesIO): The uploaded file.
+        selected_datetime (datetime): Rows with a report time at or before this are dropped.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+        usecols (Optional[List[str]]): Columns to read; all columns are read if None.
+        server (Optional[str]): The server whose cached report time format is used.
+
+    Returns:
+        pd.DataFrame: DataFrame containing only the surviving rows.
+    """
+    extension = file_extension(file.name)
+    try:
+        if extension == ".csv":
+            return read_csv_filtered(file, selected_datetime, exclude_values, usecols, server=server)
+        elif extension == ".xlsx":
+            return read_excel_filtered(file, selected_datetime, exclude_values, usecols, server)
+    except Exception as e:
+        raise RuntimeError(f"An error occurred while reading the file: {e}")
+
+    df = read_file(file)
+    df[SORT_COLUMN] = parse_datetimes(df[SORT_COLUMN], (server, SORT_COLUMN) if server else None).values
+    df_filtered: pd.DataFrame = filter_report_rows(df, selected_datetime, exclude_values).reset_index(drop=True)
+    return df_filtered
+
+
+def resolve_engine(engine: str, file: io.BytesIO) -> str:
+    """
+    Resolves the engine a file is transformed with.
+
+    Args:
+        engine (str): One of `ENGINES`.
+        file (io.BytesIO): The uploaded file.
+
+    Returns:
+        str: "pandas", "duckdb" or "polars"; "auto" picks DuckDB for CSV files of at least
+            `DUCKDB_MIN_BYTES` when it is installed, otherwise Polars for CSV files of at least
+            `POLARS_MIN_BYTES` when it is installed, otherwise pandas.
+
+    Raises:
+        ValueError: If the engine is unknown, or a CSV-only engine is requested for another file type.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {', '.join(ENGINES)}")
+    is_csv = file_extension(file.name) == ".csv"
+    if engine in CSV_ENGINES and not is_csv:
+        raise ValueError(f"The {engine} engine only reads CSV files: {file.name}")
+    if engine != "auto":
+        return engine
+    if not is_csv:
+        return "pandas"
+
+    position = file.tell()
+    size = file.seek(0, io.SEEK_END)
+    file.seek(position)
+    if size >= DUCKDB_MIN_BYTES and duckdb_available():
+        return "duckdb"
+    if size >= POLARS_MIN_BYTES and polars_available():
+        return "polars"
+    return "pandas"
+
+
+def process_profile(
+    file: io.BytesIO,
+    profile: ServerProfile,
+    selected_datetime_str: str,
+    adjusted_datetime: datetime,
+    exclude_values: Optional[List[str]] = None,
+    engine: str = "auto",
+) -> pd.DataFrame:
+    """
+    Process data from a file according to a server profile for the selected datetime.
+
+    Parameters:
+        file (io.BytesIO): The uploaded file containing the data.
+        profile (ServerProfile): The profile describing the columns, conversions and renames.
+        selected_datetime_str (str): The selected datetime in the format "YYYY-MM-DD HH:MM:SS".
+        adjusted_datetime (datetime.datetime): The adjusted datetime to be used for updates.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+        engine (str): The engine to transform the file with; see `resolve_engine`.
+
+    Returns:
+        pandas.DataFrame: Processed DataFrame with cleaned and transformed data.
+
+    Raises:
+        SchemaMismatchError: If the file's header lacks a column of the profile.
+    """
+    selected_datetime = parse_cutoff(selected_datetime_str)
+    plan = compile_profile(profile)
+
+    # Reject a file of the wrong export schema from its header, before any row is parsed
+    check_schema(file, profile)
+
+    # Run the whole plan as one query over large CSV files
+    resolved = resolve_engine(engine, file)
+    if resolved == "duckdb":
+        return process_csv_duckdb(file, plan, selected_datetime, adjusted_datetime, exclude_values)
+    if resolved == "polars":
+        return process_csv_polars(file, plan, selected_datetime, adjusted_datetime, exclude_values)
+
+    # Read only the needed columns of the rows newer than the selected datetime
+    df = read_filtered_file(file, selected_datetime, exclude_values, list(plan.usecols), profile.name)
+    return apply_plan(df, plan, adjusted_datetime)
+
+
+# Function to process data
+def process_data(
+    file: io.BytesIO, selected_datetime_str: str, adjusted_datetime: datetime, exclude_values: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Process data from an Excel file for the selected datetime.
+
+    Parameters:
+        file (io.BytesIO): The uploaded Excel file containing the data.
+        selected_datetime_str (str): The selected datetime in the format "YYYY-MM-DD HH:MM:SS".
+        adjusted_datetime (datetime.datetime): The adjusted datetime to be used for updates.
+
+    Returns:
+        pandas.DataFrame: Processed DataFrame with cleaned and transformed data.
+
+    Notes:
+        The columns, numeric cleaning and column order are described by `metric_profile`;
+        see `process_profile` for the steps performed.
+
+    Example:
+        df_processed = process_data(uploaded_file, "2023-08-25 14:00:00", datetime.now())
+    """
+    return process_profile(file, metric_profile, selected_datetime_str, adjusted_datetime, exclude_values)
+
+
+def process_ca_data(
+    file: io.BytesIO, selected_datetime_str: str, adjusted_datetime: datetime, exclude_values: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Process data from an Excel file (Canada data) for the selected datetime.
+
+    Parameters:
+        file (io.BytesIO): The uploaded Excel file containing the data.
+        selected_datetime_str (str): The selected datetime in the format "YYYY-MM-DD HH:MM:SS".
+        adjusted_datetime (datetime.datetime): The adjusted datetime to be used for updates.
+
+    Returns:
+        pandas.DataFrame: Processed DataFrame with cleaned and transformed data.
+
+    Notes:
+        The columns, numeric cleaning and column order are described by `imperial_profile`;
+        see `process_profile` for the steps performed.
+
+    Example:
+        df_processed = process_ca_data(uploaded_file, "2023-08-25 14:00:00", datetime.now())
+    """
+    return process_profile(file, imperial_profile, selected_datetime_str, adjusted_datetime, exclude_values)
+
+
+def processed_filename(
+    selected_server: str, uploaded_file_name: str, extension: str = "xlsx", suffix: str = "transformed"
+) -> str:
+    """
+    Builds the file name of a transformed export.
+
+    Args:
+        selected_server (str): The selected server.
+        uploaded_file_name (str): The name or path of the uploaded file.
+        extension (str): The output file extension, without the dot.
+        suffix (str): What the file holds, e.g. "rejected" for the rows left out by validation.
+
+    Returns:
+        str: File name formatted as "<server>_<uploaded name>_<suffix>.<extension>".
+    """
+    stem = os.path.splitext(os.path.basename(uploaded_file_name))[0]
+    return f"{selected_server}_{stem}_{suffix}.{extension}"
+
+
+def calculate_adjusted_datetime(server: str) -> str:
+    """
+    Calculates adjusted datetime based on the server name.
+
+    Args:
+        server (str): The name of the server (e.g., "GS SGV1").
+
+    Returns:
+        str: Adjusted datetime formatted as "YYYY-MM-DD HH:MM:SS".
+    """
+    # Production logic
+    time_diff = timedelta(hours=9) if server == "GS SGV1" else timedelta(hours=8)
+
+    # For local testing, use this instead:
+    # time_diff = timedelta(hours=1) if server == "GS SGV1" else timedelta(hours=0)
+
+    adjusted_datetime = (datetime.now() + time_diff).strftime("%Y-%m-%d %H:%M:%S")
+    return adjusted_datetime
+
+
+@instrumented("process")
+def process_uploaded_file(
+    uploaded_file: io.BytesIO,
+    selected_datetime: str,
+    adjusted_datetime: datetime,
+    selected_server: str,
+    exclude_values: Optional[List[str]] = None,
+    engine: str = "auto",
+    validate: bool = True,
+    report: Optional[ValidationReport] = None,
+) -> pd.DataFrame:
+    """
+    Processes the uploaded file based on the task type, datetime, and server.
+
+    Args:
+        uploaded_file (io.BytesIO): The file uploaded by the user.
+        selected_datetime (str): The user-selected datetime (e.g., "2024-01-01 12:00:00").
+        adjusted_datetime (datetime): The adjusted datetime based on the server.
+        selected_server (str): The selected server identifier.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+        engine (str): The engine to transform the file with; see `resolve_engine`.
+        validate (bool): Whether rows breaking the `VALIDATION_RULES` are left out of the result.
+        report (Optional[ValidationReport]): Filled in with the rejected rows and per-rule counts, if given.
+
+    Returns:
+        A processed DataFrame of the rows passing validation.
+    """
+    profile = get_profile(selected_server)
+    df_processed = process_profile(uploaded_file, profile, selected_datetime, adjusted_datetime, exclude_values, engine)
+    return validate_frame(df_processed, report=report) if validate else df_processed
+
+
+def dedup_keys(df: pd.DataFrame, server: Optional[str] = None) -> pd.DataFrame:
+    """
+    Normalizes the `DEDUP_COLUMNS` of merged files, so a report read from a CSV export and from
+    an Excel export of the same data gets the same key.
+
+    Serial numbers are compared as stripped text and timestamps by their parsed time, whatever
+    layout or cell type each file holds them in.
+
+    Args:
+        df (pd.DataFrame): The merged rows, with a parsed "Receive task report time".
+        server (Optional[str]): The server whose cached start time format is used.
+
+    Returns:
+        pd.DataFrame: One normalized column per `DEDUP_COLUMNS`, on the index of `df`.
+    """
+    serial_numbers = df["S/N"].astype(str).str.strip().where(df["S/N"].notna())
+    start_times = to_timestamps(df["Task start time"], (server, "Task start time") if server else None)
+    keys: pd.DataFrame = pd.DataFrame(
+        dict(zip(DEDUP_COLUMNS, (serial_numbers, start_times, pd.to_datetime(df[SORT_COLUMN])))),
+        index=df.index,
+    )
+    return keys
+
+
+def process_uploaded_files(
+    uploaded_files: List[io.BytesIO],
+    selected_datetime: str,
+    adjusted_datetime: datetime,
+    selected_server: str,
+    exclude_values: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    validate: bool = True,
+    report: Optional[ValidationReport] = None,
+) -> pd.DataFrame:
+    """
+    Processes several, possibly overlapping, uploaded files into a single output.
+
+    The files are parsed concurrently in a thread pool, merged, and task reports present in
+    more than one file are dropped on their normalized (S/N, Task start time, Receive task report time)
+    keys before the merged rows are sorted and transformed once.
+
+    Args:
+        uploaded_files (List[io.BytesIO]): The files uploaded by the user.
+        selected_datetime (str): The user-selected datetime (e.g., "2024-01-01 12:00:00").
+        adjusted_datetime (datetime): The adjusted datetime based on the server.
+        selected_server (str): The selected server identifier.
+        exclude_values (Optional[List[str]]): List of serial numbers to exclude.
+        max_workers (Optional[int]): Maximum number of files parsed at the same time.
+        validate (bool): Whether rows breaking the `VALIDATION_RULES` are left out of the result.
+        report (Optional[ValidationReport]): Filled in with the rejected rows and per-rule counts, if given.
+
+    Returns:
+        A processed DataFrame of the rows passing validation.
+
+    Raises:
+        ValueError: If no file is given.
+        SchemaMismatchError: If a file's header lacks a column of the server's profile.
+    """
+    if not uploaded_files:
+        raise ValueError("No file uploaded.")
+    if len(uploaded_files) == 1:
+        return process_uploaded_file(
+            uploaded_files[0],
+            selected_datetime,
+            adjusted_datetime,
+            selected_server,
+            exclude_values,
+            validate=validate,
+            report=report,
+        )
+
+    with stage("process") as current:
+        cutoff = parse_cutoff(selected_datetime)
+        profile = get_profile(selected_server)
+        plan = compile_profile(profile)
+        usecols = list(plan.usecols)
+        for file in uploaded_files:
+            check_schema(file, profile)
+
+        # Each file is read in a copy of the caller's context so its stage is recorded too
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(copy_context().run, read_filtered_file, file, cutoff, exclude_values, usecols, selected_server)
+                for file in uploaded_files
+            ]
+            frames = [future.result() for future in futures]
+
+        df = pd.concat(frames, ignore_index=True)
+        with stage("dedup", len(df)) as dedup:
+            df = df[~dedup_keys(df, selected_server).duplicated()].reset_index(drop=True)
+            dedup.rows_out = len(df)
+
+        df_processed = apply_plan(df, plan, adjusted_datetime)
+        if validate:
+            df_processed = validate_frame(df_processed, report=report)
+        current.rows_out = len(df_processed)
+    return df_processed
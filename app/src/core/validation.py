@@ -0,0 +1,240 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from .datetimes import to_timestamps
+from .instrumentation import instrumented
+from .numeric import CellSeries, coerce_numeric
+
+# Column of the rejected rows listing the codes of the rules they break
+REASON_COLUMN = "rejection_reasons"
+
+# Separator between the reason codes of a rejected row
+REASON_SEPARATOR = ","
+
+
+@dataclass(frozen=True)
+class ValidationRule:
+    """
+    A data-quality rule checked on an output column; rows breaking it are rejected.
+
+    A rule either bounds the values of a column, or requires a column not to precede another.
+    Missing values and cells that cannot be read as numbers never break a rule.
+
+    Attributes:
+        code (str): The reason code written to the rejected rows.
+        description (str): What the rule checks, shown to the user.
+        column (str): The output column checked.
+        minimum (Optional[float]): The smallest value allowed, if any.
+        maximum (Optional[float]): The largest value allowed, if any.
+        after (Optional[str]): The output column whose value `column` must not precede, if any.
+    """
+
+    code: str
+    description: str
+    column: str
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    after: Optional[str] = None
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """The output columns the rule reads."""
+        return (self.column, self.after) if self.after is not None else (self.column,)
+
+
+# Rules checked by default, in the order of their reason bits
+VALIDATION_RULES = (
+    ValidationRule("negative_cleaning_area", "Cleaning area is negative", "cleaning_area", minimum=0.0),
+    ValidationRule("task_completion_out_of_range", "Task completion is outside 0-100%", "task_completion", 0.0, 100.0),
+    ValidationRule("end_before_start", "End time is before start time", "end_time", after="start_time"),
+    ValidationRule("start_battery_out_of_range", "Start battery level is outside 0-100%", "start_battery_level", 0.0, 100.0),
+    ValidationRule("end_battery_out_of_range", "End battery level is outside 0-100%", "end_battery_level", 0.0, 100.0),
+)
+
+
+@dataclass
+class ValidationReport:
+    """
+    The outcome of validating a processed frame, filled in by the processing functions.
+
+    Attributes:
+        total_rows (int): Number of rows validated.
+        counts (Dict[str, int]): Number of rows breaking each rule, by reason code; a row may break several.
+        rejected (pd.DataFrame): The rejected rows with their reason codes in `REASON_COLUMN`.
+    """
+
+    total_rows: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+    rejected: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def rejected_rows(self) -> int:
+        """Number of rejected rows."""
+        return len(self.rejected)
+
+    def describe(self, rules: Sequence[ValidationRule] = VALIDATION_RULES) -> str:
+        """
+        Summarizes the rejected rows.
+
+        Args:
+            rules (Sequence[ValidationRule]): The rules the frame was validated with, for their descriptions.
+
+        Returns:
+            str: One sentence with the number of rejected rows and the count of each broken rule.
+        """
+        return describe_rejections(self.counts, self.rejected_rows, rules)
+
+
+def describe_rejections(counts: Dict[str, int], rejected_rows: int, rules: Sequence[ValidationRule] = VALIDATION_RULES) -> str:
+    """
+    Summarizes the rows rejected by validation.
+
+    Args:
+        counts (Dict[str, int]): Number of rows breaking each rule, by reason code.
+        rejected_rows (int): Number of rejected rows.
+        rules (Sequence[ValidationRule]): The rules, for their descriptions.
+
+    Returns:
+        str: One sentence with the number of rejected rows and the count of each broken rule.
+    """
+    descriptions = {rule.code: rule.description for rule in rules}
+    details = ", ".join(f"{descriptions.get(code, code)} ({count})" for code, count in counts.items() if count)
+    return f"{rejected_rows} rows failed validation and were left out: {details}."
+
+
+def _numbers(column: CellSeries) -> npt.NDArray[np.float64]:
+    """
+    Reads a column as float64, parsing each distinct text value once.
+
+    Args:
+        column (pd.Series): A numeric, categorical or text column.
+
+    Returns:
+        np.ndarray: The values; NaN where the cell is missing or not a number.
+    """
+    if column.dtype.kind in "iuf":
+        return column.to_numpy(dtype="float64", na_value=np.nan)
+
+    # Text columns such as "Task completion (%)" repeat few values, so only the distinct ones are parsed
+    codes, uniques = pd.factorize(column)
+    values = coerce_numeric(pd.Series(np.asarray(uniques, dtype=object))).values.to_numpy(dtype="float64")
+    # Missing cells have code -1, which picks the trailing NaN
+    return np.append(values, np.nan)[codes]
+
+
+def rule_mask(df: pd.DataFrame, rule: ValidationRule) -> npt.NDArray[np.bool_]:
+    """
+    Evaluates a rule over every row at once.
+
+    Args:
+        df (pd.DataFrame): The processed frame.
+        rule (ValidationRule): The rule.
+
+    Returns:
+        np.ndarray: Boolean mask of the rows breaking the rule.
+    """
+    if rule.after is not None:
+        # Start and end times are kept as read, so they are parsed for the comparison
+        return (to_timestamps(df[rule.column]) < to_timestamps(df[rule.after])).to_numpy(dtype=bool)
+
+    values = _numbers(df[rule.column])
+    broken = np.zeros(len(values), dtype=bool)
+    # Comparisons with NaN are False, so missing values never break a rule
+    if rule.minimum is not None:
+        broken |= values < rule.minimum
+    if rule.maximum is not None:
+        broken |= values > rule.maximum
+    return broken
+
+
+def reason_bits(
+    df: pd.DataFrame, rules: Sequence[ValidationRule] = VALIDATION_RULES
+) -> Tuple[npt.NDArray[np.uint32], Dict[str, int]]:
+    """
+    Evaluates every rule as a column mask and packs the results into one bit per rule.
+
+    Rules reading a column the frame does not have are skipped.
+
+    Args:
+        df (pd.DataFrame): The processed frame.
+        rules (Sequence[ValidationRule]): The rules; at most 32.
+
+    Returns:
+        Tuple[np.ndarray, Dict[str, int]]: The uint32 reason bits of each row, bit `i` set when the row
+            breaks `rules[i]`, and the number of rows breaking each rule.
+
+    Raises:
+        ValueError: If more than 32 rules are given.
+    """
+    if len(rules) > 32:
+        raise ValueError(f"At most 32 validation rules are supported, got {len(rules)}")
+
+    bits = np.zeros(len(df), dtype=np.uint32)
+    counts: Dict[str, int] = {}
+    for position, rule in enumerate(rules):
+        if not all(column in df.columns for column in rule.columns):
+            continue
+        broken = rule_mask(df, rule)
+        counts[rule.code] = int(broken.sum())
+        bits |= broken.astype(np.uint32) << np.uint32(position)
+    return bits, counts
+
+
+def reason_codes(bits: npt.NDArray[np.uint32], rules: Sequence[ValidationRule] = VALIDATION_RULES) -> pd.Categorical:
+    """
+    Converts reason bits to the comma-separated codes of the broken rules.
+
+    Each distinct combination of bits is converted once, however many rows share it.
+
+    Args:
+        bits (np.ndarray): The reason bits returned by `reason_bits`.
+        rules (Sequence[ValidationRule]): The rules the bits were computed with.
+
+    Returns:
+        pd.Categorical: The reason codes of each row.
+    """
+    combinations, inverse = np.unique(bits, return_inverse=True)
+    labels: List[str] = [
+        REASON_SEPARATOR.join(rule.code for position, rule in enumerate(rules) if int(combination) >> position & 1)
+        for combination in combinations
+    ]
+    dtype: "pd.CategoricalDtype[object]" = pd.CategoricalDtype(labels)
+    return pd.Categorical.from_codes(inverse.reshape(-1), dtype=dtype)
+
+
+@instrumented("validate")
+def validate_frame(
+    df: pd.DataFrame, rules: Sequence[ValidationRule] = VALIDATION_RULES, report: Optional[ValidationReport] = None
+) -> pd.DataFrame:
+    """
+    Splits a processed frame into the rows passing every rule and the rejected rows.
+
+    Every rule is evaluated as a vectorized mask over the whole frame. The number of rows breaking
+    each rule is kept in `attrs["rejected_rows"]` of the accepted frame.
+
+    Args:
+        df (pd.DataFrame): The processed frame.
+        rules (Sequence[ValidationRule]): The rules to check.
+        report (Optional[ValidationReport]): Filled in with the rejected rows and the per-rule counts, if given.
+
+    Returns:
+        pd.DataFrame: The accepted rows, in their original order.
+    """
+    bits, counts = reason_bits(df, rules)
+    rejected = bits != 0
+
+    accepted = df
+    if rejected.any():
+        accepted = df[~rejected].reset_index(drop=True)
+    accepted.attrs["rejected_rows"] = {code: count for code, count in counts.items() if count}
+
+    if report is not None:
+        report.total_rows = len(df)
+        report.counts = counts
+        report.rejected = df[rejected].reset_index(drop=True)
+        report.rejected[REASON_COLUMN] = reason_codes(bits[rejected], rules)
+    return accepted
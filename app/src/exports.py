@@ -0,0 +1,334 @@
+import io
+import tempfile
+import zlib
+from datetime import datetime
+from typing import IO, Callable, Iterator, List, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import xlsxwriter
+from pandas.api.types import is_bool_dtype, is_datetime64_any_dtype, is_float_dtype, is_numeric_dtype
+
+from .core.datetimes import DEFAULT_DATETIME_FORMAT
+from .core.instrumentation import instrumented
+from .core.numeric import CellSeries
+
+# Text the writers render missing values as
+NULL_TEXT = "NULL"
+
+# Number of rows converted to CSV text at a time when building the clipboard payload
+CLIPBOARD_BATCH_ROWS = 50_000
+
+# Number of rows converted to Python values at a time when writing Excel files
+EXCEL_BATCH_ROWS = 10_000
+
+# Number format of datetime cells, matching `DataFrame.to_excel`
+EXCEL_DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+
+# Number of rows per multi-row INSERT statement of the SQL script
+SQL_BATCH_ROWS = 1_000
+
+# Number of rows converted to SQL literals at a time when writing the SQL script
+SQL_CHUNK_ROWS = 20_000
+
+# Bytes of a SQL script spooled in memory before the rest is written to a temporary file
+SQL_SPOOL_BYTES = 16 * 1024 * 1024
+
+XLSX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+SQL_MIME_TYPE = "application/sql"
+CSV_MIME_TYPE = "text/csv"
+
+
+def frame_to_csv(df_processed: pd.DataFrame, target: Optional[Union[str, IO[str]]] = None, header: bool = True) -> Optional[str]:
+    """
+    Writes the processed DataFrame as CSV, rendering missing values as NULL and timestamps as
+    `DEFAULT_DATETIME_FORMAT`.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        target (Optional[Union[str, IO[str]]]): The output path or text file object; None returns the text.
+        header (bool): Whether to write the column names.
+
+    Returns:
+        Optional[str]: The CSV text if no target is given, otherwise None.
+    """
+    return df_processed.to_csv(target, index=False, header=header, na_rep=NULL_TEXT, date_format=DEFAULT_DATETIME_FORMAT)
+
+
+def to_clipboard_text(df_processed: pd.DataFrame) -> str:
+    """
+    Converts the processed DataFrame to CSV text without headers, as copied to the clipboard.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+
+    Returns:
+        str: The CSV text.
+    """
+    return frame_to_csv(df_processed, header=False) or ""
+
+
+def iter_clipboard_text(df_processed: pd.DataFrame, batch_rows: int = CLIPBOARD_BATCH_ROWS) -> Iterator[str]:
+    """
+    Yields the clipboard CSV text in chunks of `batch_rows` rows.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        batch_rows (int): Number of rows per chunk.
+
+    Yields:
+        str: CSV text without headers; the chunks joined equal `to_clipboard_text`.
+    """
+    for start in range(0, len(df_processed), batch_rows):
+        yield to_clipboard_text(df_processed.iloc[start : start + batch_rows])
+
+
+@instrumented("serialize_clipboard")
+def compress_clipboard_text(df_processed: pd.DataFrame) -> bytes:
+    """
+    Builds the gzip-compressed clipboard payload, converting and compressing the CSV text chunk by chunk
+    so the full uncompressed text is never held in memory.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+
+    Returns:
+        bytes: The gzip-compressed CSV text without headers.
+    """
+    compressor = zlib.compressobj(level=6, wbits=31)  # wbits=31 writes a gzip container
+    chunks = [compressor.compress(text.encode("utf-8")) for text in iter_clipboard_text(df_processed)]
+    chunks.append(compressor.flush())
+    return b"".join(chunks)
+
+
+def gzip_uncompressed_size(payload: bytes) -> int:
+    """
+    Returns the uncompressed size of a gzip payload from its trailer (exact below 4 GiB).
+
+    Args:
+        payload (bytes): The gzip-compressed data.
+
+    Returns:
+        int: The uncompressed size in bytes.
+    """
+    return int.from_bytes(payload[-4:], "little")
+
+
+def _column_values(column: CellSeries) -> List[object]:
+    """
+    Converts a column slice to Python values, with missing values as None.
+
+    Args:
+        column (pd.Series): The column slice.
+
+    Returns:
+        List[object]: The cell values.
+    """
+    cells: List[object] = column.astype(object).where(column.notna(), None).tolist()
+    return cells
+
+
+@instrumented("serialize_xlsx")
+def write_excel(df_processed: pd.DataFrame, target: Union[str, IO[bytes]], sheet_name: str = "Sheet1") -> None:
+    """
+    Writes the processed DataFrame to an Excel file row by row using xlsxwriter's constant-memory mode.
+
+    Rows are flushed to disk as they are written and converted to Python values in batches
+    of `EXCEL_BATCH_ROWS`, so memory stays flat regardless of the number of rows. Missing
+    values are written as NULL.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        target (Union[str, IO[bytes]]): The output path or binary file object.
+        sheet_name (str): The worksheet name.
+    """
+    workbook = xlsxwriter.Workbook(target, {"constant_memory": True})
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        header_format = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        datetime_format = workbook.add_format({"num_format": EXCEL_DATETIME_FORMAT})
+
+        worksheet.write_row(0, 0, [str(column) for column in df_processed.columns], header_format)
+
+        def write_cell(row: int, col: int, value: object) -> object:
+            # Start and end times read from Excel files keep their datetime cells
+            if isinstance(value, datetime):
+                return worksheet.write_datetime(row, col, value, datetime_format)
+            return worksheet.write(row, col, value)
+
+        # Pick the cell writer of each column once instead of per cell
+        writers: List[Callable[[int, int, object], object]] = []
+        for _, column in df_processed.items():
+            if is_datetime64_any_dtype(column):
+                writers.append(lambda row, col, value: worksheet.write_datetime(row, col, value, datetime_format))
+            elif is_numeric_dtype(column) and not is_bool_dtype(column):
+                writers.append(worksheet.write_number)
+            else:
+                writers.append(write_cell)
+
+        for start in range(0, len(df_processed), EXCEL_BATCH_ROWS):
+            batch = df_processed.iloc[start : start + EXCEL_BATCH_ROWS]
+            columns = [_column_values(column) for _, column in batch.items()]
+            for offset, row in enumerate(zip(*columns)):
+                for col, (writer, value) in enumerate(zip(writers, row)):
+                    if value is None:
+                        worksheet.write_string(start + offset + 1, col, NULL_TEXT)
+                    else:
+                        writer(start + offset + 1, col, value)
+    finally:
+        workbook.close()
+
+
+def to_excel_bytes(df_processed: pd.DataFrame) -> bytes:
+    """
+    Converts the processed DataFrame to the bytes of an Excel file.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+
+    Returns:
+        bytes: The content of the .xlsx file.
+    """
+    output = io.BytesIO()
+    write_excel(df_processed, output)
+    return output.getvalue()
+
+
+def _quote_identifier(name: str) -> str:
+    """Quotes a table or column name for MySQL."""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _sql_literals(column: CellSeries) -> npt.NDArray[np.object_]:
+    """
+    Converts a column slice to SQL literals, escaping the whole column at once.
+
+    Numbers are written as-is, datetimes and text are quoted, and missing values
+    and the "NULL" placeholder are written as NULL.
+
+    Args:
+        column (pd.Series): The column slice.
+
+    Returns:
+        np.ndarray: An object array of the literals.
+    """
+    missing = column.isna()
+    if is_bool_dtype(column):
+        literals = column.map({True: "TRUE", False: "FALSE"})
+    elif is_numeric_dtype(column):
+        literals = column.astype(str)
+        if is_float_dtype(column):
+            missing |= ~np.isfinite(column)
+    elif is_datetime64_any_dtype(column):
+        literals = "'" + column.dt.strftime(DEFAULT_DATETIME_FORMAT) + "'"
+    else:
+        text = column.astype(str)
+        missing |= text == NULL_TEXT
+        # Escape only columns that contain a quote or a backslash, found with a single scan
+        joined = "".join(text.to_numpy(dtype=object))
+        if "'" in joined or "\\" in joined:
+            text = text.str.replace("\\", "\\\\", regex=False).str.replace("'", "''", regex=False)
+        literals = "'" + text + "'"
+    return literals.mask(missing, NULL_TEXT).to_numpy(dtype=object)
+
+
+def iter_sql_script(df_processed: pd.DataFrame, table_name: str, batch_rows: int = SQL_BATCH_ROWS) -> Iterator[str]:
+    """
+    Yields multi-row INSERT statements of the processed DataFrame, one per `batch_rows` rows.
+
+    Rows are converted to text `SQL_CHUNK_ROWS` at a time, so the script can be streamed to a file
+    without holding it in memory.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        table_name (str): The target table.
+        batch_rows (int): Number of rows per statement.
+
+    Yields:
+        str: An INSERT statement terminated by a semicolon and a newline.
+    """
+    columns = ", ".join(_quote_identifier(str(column)) for column in df_processed.columns)
+    prefix = f"INSERT INTO {_quote_identifier(table_name)} ({columns}) VALUES\n"
+
+    # Convert whole chunks of statements at once to amortize the per-column overhead
+    batch_rows = max(1, batch_rows)
+    chunk_rows = max(1, SQL_CHUNK_ROWS // batch_rows) * batch_rows
+    for chunk_start in range(0, len(df_processed), chunk_rows):
+        chunk = df_processed.iloc[chunk_start : chunk_start + chunk_rows]
+        literals = [_sql_literals(column) for _, column in chunk.items()]
+
+        # Concatenate the rows column by column rather than cell by cell
+        rows = "(" + literals[0]
+        for column_literals in literals[1:]:
+            rows = rows + ", " + column_literals
+        rows = rows + ")"
+
+        for start in range(0, len(rows), batch_rows):
+            yield prefix + ",\n".join(rows[start : start + batch_rows]) + ";\n"
+
+
+@instrumented("serialize_sql")
+def write_sql_script(
+    df_processed: pd.DataFrame,
+    target: Union[str, IO[str]],
+    table_name: str,
+    batch_rows: int = SQL_BATCH_ROWS,
+) -> None:
+    """
+    Writes the processed DataFrame as a SQL script of multi-row INSERT statements, statement by statement.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        target (Union[str, IO[str]]): The output path or text file object.
+        table_name (str): The target table.
+        batch_rows (int): Number of rows per statement.
+    """
+    if isinstance(target, str):
+        with open(target, "w", encoding="utf-8", newline="") as output:
+            output.writelines(iter_sql_script(df_processed, table_name, batch_rows))
+    else:
+        target.writelines(iter_sql_script(df_processed, table_name, batch_rows))
+
+
+@instrumented("serialize_sql")
+def to_sql_bytes(df_processed: pd.DataFrame, table_name: str, batch_rows: int = SQL_BATCH_ROWS) -> bytes:
+    """
+    Converts the processed DataFrame to the bytes of a SQL script in memory, for small frames and tests;
+    downloads use `spool_sql_bytes`.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        table_name (str): The target table.
+        batch_rows (int): Number of rows per statement.
+
+    Returns:
+        bytes: The UTF-8 encoded script.
+    """
+    output = io.BytesIO()
+    for statement in iter_sql_script(df_processed, table_name, batch_rows):
+        output.write(statement.encode("utf-8"))
+    return output.getvalue()
+
+
+@instrumented("serialize_sql")
+def spool_sql_bytes(df_processed: pd.DataFrame, table_name: str, batch_rows: int = SQL_BATCH_ROWS) -> bytes:
+    """
+    Builds the bytes of a SQL script for a download, spooling the statements as they are converted.
+
+    Statements are written to a temporary file that moves from memory to disk past `SQL_SPOOL_BYTES`,
+    so the script is held in memory only once, as the bytes handed to the download.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        table_name (str): The target table.
+        batch_rows (int): Number of rows per statement.
+
+    Returns:
+        bytes: The UTF-8 encoded script.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SQL_SPOOL_BYTES) as spool:
+        for statement in iter_sql_script(df_processed, table_name, batch_rows):
+            spool.write(statement.encode("utf-8"))
+        spool.seek(0)
+        return spool.read()
@@ -0,0 +1,300 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from .core.datetimes import to_timestamps
+from .storage import connect
+from .watermark import WATERMARK_FORMAT
+
+# Output columns identifying a task report across exports
+FINGERPRINT_COLUMNS = ("serial_number", "start_time", "task_name", "map_name")
+
+# Fingerprint columns hashed by their parsed time rather than their text
+TIMESTAMP_COLUMNS = ("start_time",)
+
+# Fingerprints the pre-filter is sized for before the first one is stored
+DEFAULT_CAPACITY = 1_000_000
+
+# Share of unseen fingerprints the pre-filter lets through to SQLite
+DEFAULT_ERROR_RATE = 0.01
+
+# Fingerprints looked up per SQLite query, below the host parameter limit
+LOOKUP_BATCH_ROWS = 900
+
+# Fingerprints added to the Bloom filter since its last snapshot before a new snapshot is saved
+SNAPSHOT_ROWS = 100_000
+
+
+def row_fingerprints(df_processed: pd.DataFrame) -> npt.NDArray[np.int64]:
+    """
+    Hashes the identifying columns of each task report into a 64-bit fingerprint.
+
+    Start times are parsed and hashed as nanoseconds, so the fingerprint does not depend on the
+    layout of the export or the resolution a reader parsed them in; categorical and text columns hash the same.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+
+    Returns:
+        np.ndarray: The int64 fingerprint of each row, signed so SQLite can store it as an integer.
+
+    Raises:
+        KeyError: If a column of `FINGERPRINT_COLUMNS` is missing.
+    """
+    columns = {}
+    for column in FINGERPRINT_COLUMNS:
+        values = df_processed[column]
+        if column in TIMESTAMP_COLUMNS:
+            values = to_timestamps(values)
+            values = pd.Series(values.to_numpy(dtype="datetime64[ns]").view("int64"))
+        columns[column] = values.reset_index(drop=True)
+    hashed = pd.util.hash_pandas_object(pd.DataFrame(columns), index=False)
+    return hashed.to_numpy(dtype=np.uint64).view(np.int64)
+
+
+class BloomFilter:
+    """
+    Bit-array pre-filter answering whether fingerprints may have been added, with no false negatives.
+
+    The bit positions of a fingerprint are derived from its two 32-bit halves by double hashing,
+    so adding and probing a batch are a few numpy operations whatever the number of rows.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE) -> None:
+        self.capacity = max(1, capacity)
+        # Optimal number of bits and hash functions for the capacity and error rate
+        self.bits = int(np.ceil(-self.capacity * np.log(error_rate) / np.log(2) ** 2))
+        self.hashes = max(1, int(round(self.bits / self.capacity * np.log(2))))
+        self._words = np.zeros((self.bits + 63) // 64, dtype=np.uint64)
+
+    def to_bytes(self) -> bytes:
+        """Returns the bit array, to be restored with `from_bytes`."""
+        return self._words.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int, error_rate: float) -> "BloomFilter":
+        """
+        Restores a Bloom filter saved with `to_bytes`.
+
+        Args:
+            data (bytes): The bit array.
+            capacity (int): The capacity the filter was created with.
+            error_rate (float): The error rate the filter was created with.
+
+        Returns:
+            BloomFilter: The restored filter.
+
+        Raises:
+            ValueError: If the bit array does not match the capacity and error rate.
+        """
+        bloom = cls(capacity, error_rate)
+        words = np.frombuffer(data, dtype=np.uint64)
+        if len(words) != len(bloom._words):
+            raise ValueError(f"Expected {len(bloom._words)} words for a capacity of {capacity}, got {len(words)}")
+        bloom._words = words.copy()
+        return bloom
+
+    def _positions(self, fingerprints: npt.NDArray[np.int64]) -> npt.NDArray[np.uint64]:
+        """Returns the bit positions of each fingerprint, one row per fingerprint."""
+        values = np.asarray(fingerprints, dtype=np.int64).view(np.uint64)
+        low = values & np.uint64(0xFFFFFFFF)
+        high = (values >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        positions: npt.NDArray[np.uint64] = (low[:, None] + steps[None, :] * high[:, None]) % np.uint64(self.bits)
+        return positions
+
+    def add(self, fingerprints: npt.NDArray[np.int64]) -> None:
+        """
+        Sets the bits of a batch of fingerprints.
+
+        Args:
+            fingerprints (np.ndarray): The int64 fingerprints.
+        """
+        positions = self._positions(fingerprints).ravel()
+        np.bitwise_or.at(self._words, positions >> np.uint64(6), np.uint64(1) << (positions & np.uint64(63)))
+
+    def might_contain(self, fingerprints: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+        """
+        Probes a batch of fingerprints.
+
+        Args:
+            fingerprints (np.ndarray): The int64 fingerprints.
+
+        Returns:
+            np.ndarray: Boolean mask, False where the fingerprint was certainly never added.
+        """
+        positions = self._positions(fingerprints)
+        words = self._words[positions >> np.uint64(6)]
+        maybe_added: npt.NDArray[np.bool_] = ((words >> (positions & np.uint64(63))) & np.uint64(1)).astype(bool).all(axis=1)
+        return maybe_added
+
+
+class FingerprintIndex:
+    """
+    Persists the fingerprints of the task reports loaded into a database, so reports re-included
+    in later exports or overlapping uploads can be dropped before they are exported again.
+
+    Fingerprints are kept in a uniquely indexed SQLite table, so each lookup costs a B-tree search.
+    A Bloom filter in memory answers for most new reports without touching SQLite. Its bits are saved
+    next to the fingerprints, so it is restored without rereading the history, and it catches up with
+    fingerprints stored by other processes before each check.
+    """
+
+    def __init__(self, path: Optional[str] = None, error_rate: float = DEFAULT_ERROR_RATE) -> None:
+        self.path = path
+        self.error_rate = error_rate
+        self._bloom: Optional[BloomFilter] = None
+        self._count = 0
+        self._last_id = 0
+        self._saved_id = 0
+        self._lock = threading.Lock()
+        with connect(self.path) as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    id INTEGER PRIMARY KEY,
+                    fingerprint INTEGER NOT NULL UNIQUE,
+                    server TEXT NOT NULL,
+                    loaded_at TEXT NOT NULL
+                )
+                """
+            )
+            # Snapshot of the Bloom filter covering the fingerprints up to last_id
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fingerprint_filter (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    capacity INTEGER NOT NULL,
+                    error_rate REAL NOT NULL,
+                    count INTEGER NOT NULL,
+                    last_id INTEGER NOT NULL,
+                    bits BLOB NOT NULL
+                )
+                """
+            )
+
+    def __len__(self) -> int:
+        with connect(self.path) as connection:
+            return int(connection.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0])
+
+    def _restore(self, connection: sqlite3.Connection) -> None:
+        """Restores the Bloom filter from its snapshot, or starts an empty one sized for the stored fingerprints."""
+        row = connection.execute("SELECT capacity, error_rate, count, last_id, bits FROM fingerprint_filter").fetchone()
+        if row is not None and row[1] == self.error_rate:
+            self._bloom = BloomFilter.from_bytes(row[4], row[0], row[1])
+            self._count, self._last_id = row[2], row[3]
+        else:
+            total = int(connection.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0])
+            self._bloom = BloomFilter(max(DEFAULT_CAPACITY, 2 * total), self.error_rate)
+            self._count, self._last_id = 0, 0
+        self._saved_id = self._last_id
+
+    def _refresh(self) -> BloomFilter:
+        """Adds the fingerprints stored since the last refresh to the Bloom filter, rebuilding it once it is full."""
+        with connect(self.path) as connection:
+            if self._bloom is None:
+                self._restore(connection)
+            if self._bloom is None or self._count > self._bloom.capacity:
+                # Past its capacity the error rate grows, so a filter twice as large is built from the whole history
+                self._bloom = BloomFilter(2 * self._count, self.error_rate)
+                self._count, self._last_id = 0, 0
+
+            last_id = int(connection.execute("SELECT COALESCE(MAX(id), 0) FROM fingerprints").fetchone()[0])
+            if last_id > self._last_id:
+                cursor = connection.execute(
+                    "SELECT fingerprint FROM fingerprints WHERE id > ? AND id <= ?", (self._last_id, last_id)
+                )
+                added = np.fromiter((row[0] for row in cursor), dtype=np.int64)
+                self._bloom.add(added)
+                self._count += len(added)
+                self._last_id = last_id
+
+            if self._last_id - self._saved_id >= SNAPSHOT_ROWS:
+                connection.execute(
+                    "INSERT OR REPLACE INTO fingerprint_filter VALUES (1, ?, ?, ?, ?, ?)",
+                    (self._bloom.capacity, self.error_rate, self._count, self._last_id, self._bloom.to_bytes()),
+                )
+                self._saved_id = self._last_id
+        return self._bloom
+
+    def contains(self, fingerprints: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+        """
+        Checks a batch of fingerprints against the index.
+
+        Args:
+            fingerprints (np.ndarray): The int64 fingerprints.
+
+        Returns:
+            np.ndarray: Boolean mask, True where the fingerprint was already loaded.
+        """
+        with self._lock:
+            candidates = self._refresh().might_contain(fingerprints)
+
+        # Only the fingerprints the Bloom filter cannot rule out are looked up
+        unique = np.unique(np.asarray(fingerprints)[candidates])
+        found: List[int] = []
+        with connect(self.path) as connection:
+            for start in range(0, len(unique), LOOKUP_BATCH_ROWS):
+                batch = unique[start : start + LOOKUP_BATCH_ROWS].tolist()
+                placeholders = ",".join("?" * len(batch))
+                query = f"SELECT fingerprint FROM fingerprints WHERE fingerprint IN ({placeholders})"
+                found.extend(row[0] for row in connection.execute(query, batch))
+        return np.isin(fingerprints, np.array(found, dtype=np.int64))
+
+    def add(self, fingerprints: npt.NDArray[np.int64], server: str) -> int:
+        """
+        Stores a batch of fingerprints; those already stored are kept as they are.
+
+        Args:
+            fingerprints (np.ndarray): The int64 fingerprints.
+            server (str): The server the task reports were processed for.
+
+        Returns:
+            int: Number of fingerprints that were not stored yet.
+        """
+        loaded_at = datetime.now().strftime(WATERMARK_FORMAT)
+        with connect(self.path) as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO fingerprints (fingerprint, server, loaded_at) VALUES (?, ?, ?)",
+                ((fingerprint, server, loaded_at) for fingerprint in np.unique(fingerprints).tolist()),
+            )
+            return connection.total_changes - before
+
+    def drop_loaded(self, df_processed: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drops the task reports already loaded, keeping their number in `attrs["already_loaded_rows"]`.
+
+        Args:
+            df_processed (pd.DataFrame): The processed DataFrame.
+
+        Returns:
+            pd.DataFrame: The task reports not loaded yet, in their original order.
+        """
+        loaded = self.contains(row_fingerprints(df_processed))
+        if not loaded.any():
+            return df_processed
+        df_new: pd.DataFrame = df_processed[~loaded].reset_index(drop=True)
+        df_new.attrs["already_loaded_rows"] = df_processed.attrs.get("already_loaded_rows", 0) + int(loaded.sum())
+        return df_new
+
+    def record_loaded(self, df_processed: pd.DataFrame, server: str) -> npt.NDArray[np.bool_]:
+        """
+        Stores the fingerprints of a processed DataFrame once it was loaded into a database.
+
+        Args:
+            df_processed (pd.DataFrame): The loaded DataFrame.
+            server (str): The server the task reports were processed for.
+
+        Returns:
+            np.ndarray: Boolean mask of the task reports that were not in the index yet.
+        """
+        fingerprints = row_fingerprints(df_processed)
+        new = ~self.contains(fingerprints)
+        self.add(fingerprints[new], server)
+        return new
@@ -0,0 +1,273 @@
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, TypeAlias
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_datetime64_any_dtype, is_float_dtype, is_integer_dtype
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Engine, Float, MetaData, String, Table, Text, UniqueConstraint
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import URL
+from sqlalchemy.sql.base import ReadOnlyColumnCollection
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.types import TypeEngine
+
+from .core.datetimes import to_timestamps
+from .core.numeric import CellSeries
+
+# Number of rows sent to the database per executemany call
+DEFAULT_BATCH_ROWS = 5_000
+
+# Columns identifying a task report, used as the conflict target of upserts
+DEFAULT_KEY_COLUMNS = ("serial_number", "start_time")
+
+# Length of the text key columns, such as the start time kept as read
+KEY_TEXT_LENGTH = 255
+
+# Placeholder the processed frames use for missing values
+NULL_SENTINEL = "NULL"
+
+LOAD_MODES = ("append", "upsert")
+
+# Reflected or created target table, with columns of any Python type
+TargetTable: TypeAlias = "Table[ReadOnlyColumnCollection[str, Column[object]]]"
+
+
+class LoadResult(NamedTuple):
+    """The outcome of loading a frame into a table."""
+
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Load throughput."""
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+def build_url(
+    dialect: str,
+    database: str,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+) -> URL:
+    """
+    Builds a database URL, escaping the credentials.
+
+    Args:
+        dialect (str): The SQLAlchemy driver name (e.g. "mysql+pymysql" or "sqlite").
+        database (str): The database name, or the file path for SQLite.
+        host (Optional[str]): The database host.
+        port (Optional[int]): The database port.
+        username (Optional[str]): The user name.
+        password (Optional[str]): The password.
+
+    Returns:
+        URL: The database URL.
+    """
+    return URL.create(dialect, username=username, password=password, host=host, port=port, database=database)
+
+
+def create_pooled_engine(url: str) -> Engine:
+    """
+    Creates an engine whose connection pool is meant to be reused across loads.
+
+    Args:
+        url (str): The database URL.
+
+    Returns:
+        Engine: The engine; connections are checked before use and recycled hourly.
+    """
+    return create_engine(url, pool_pre_ping=True, pool_recycle=3600)
+
+
+def _column_type(series: CellSeries, key: bool = False) -> TypeEngine:
+    """
+    Returns the SQL type of a column when the target table is created.
+
+    Args:
+        series (pd.Series): The column.
+        key (bool): Whether the column is part of the unique key; MySQL only indexes bounded text.
+
+    Returns:
+        TypeEngine: The column type.
+    """
+    if is_bool_dtype(series):
+        return Boolean()
+    if is_integer_dtype(series):
+        return BigInteger()
+    if is_float_dtype(series):
+        return Float()
+    if is_datetime64_any_dtype(series):
+        return DateTime()
+    return String(KEY_TEXT_LENGTH) if key else Text()
+
+
+def get_table(engine: Engine, table_name: str, df: pd.DataFrame, key_columns: Sequence[str] = ()) -> TargetTable:
+    """
+    Reflects the target table, creating it from the frame's columns if it does not exist.
+
+    Args:
+        engine (Engine): The database engine.
+        table_name (str): The target table name.
+        df (pd.DataFrame): The frame to load.
+        key_columns (Sequence[str]): Columns made unique when the table is created.
+
+    Returns:
+        Table: The target table.
+    """
+    metadata = MetaData()
+    if inspect(engine).has_table(table_name):
+        return Table(table_name, metadata, autoload_with=engine)
+
+    columns = [Column(str(name), _column_type(series, str(name) in key_columns)) for name, series in df.items()]
+    constraints = [UniqueConstraint(*key_columns)] if key_columns else []
+    table = Table(table_name, metadata, *columns, *constraints)
+    metadata.create_all(engine)
+    return table
+
+
+def _upsert_statement(engine: Engine, table: TargetTable, columns: List[str], key_columns: Sequence[str]) -> Insert:
+    """
+    Builds the dialect-specific insert statement updating rows that already exist.
+
+    Args:
+        engine (Engine): The database engine.
+        table (Table): The target table.
+        columns (List[str]): The loaded columns.
+        key_columns (Sequence[str]): The conflict target (unused by MySQL, which relies on the table's unique keys).
+
+    Returns:
+        Insert: The upsert statement.
+
+    Raises:
+        ValueError: If the dialect does not support upserts or no key columns are given.
+    """
+    update_columns = [column for column in columns if column not in key_columns]
+    if engine.dialect.name == "mysql":
+        statement = mysql.insert(table)
+        return statement.on_duplicate_key_update({column: statement.inserted[column] for column in update_columns})
+
+    if engine.dialect.name not in ("sqlite", "postgresql"):
+        raise ValueError(f"Upsert is not supported for {engine.dialect.name}")
+    if not key_columns:
+        raise ValueError("Upsert needs the key columns of the conflict target")
+
+    if engine.dialect.name == "sqlite":
+        sqlite_statement = sqlite.insert(table)
+        return sqlite_statement.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={column: sqlite_statement.excluded[column] for column in update_columns},
+        )
+    postgresql_statement = postgresql.insert(table)
+    return postgresql_statement.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={column: postgresql_statement.excluded[column] for column in update_columns},
+    )
+
+
+def _column_values(column: CellSeries) -> npt.NDArray[np.object_]:
+    """
+    Converts a column slice to Python values, with the "NULL" sentinel and missing values as None.
+
+    Args:
+        column (pd.Series): The column slice.
+
+    Returns:
+        np.ndarray: An object array of the cell values.
+    """
+    values = column.to_numpy(dtype=object)
+    missing = column.isna().to_numpy()
+    if column.dtype == "object":
+        missing |= values == NULL_SENTINEL
+    if missing.any():
+        values[missing] = None
+    return values
+
+
+def _batch_records(batch: pd.DataFrame, columns: List[str]) -> List[Dict[str, object]]:
+    """
+    Converts a batch of rows to executemany parameters, column by column.
+
+    Args:
+        batch (pd.DataFrame): The rows to send.
+        columns (List[str]): The column names.
+
+    Returns:
+        List[Dict[str, object]]: One parameter dict per row.
+    """
+    arrays = [_column_values(batch[column]) for column in columns]
+    return [dict(zip(columns, row)) for row in zip(*arrays)]
+
+
+def _match_datetime_columns(df: pd.DataFrame, table: TargetTable) -> pd.DataFrame:
+    """
+    Parses the columns kept as read, such as the start and end times, that the table stores as datetimes.
+
+    Args:
+        df (pd.DataFrame): The frame to load.
+        table (Table): The target table.
+
+    Returns:
+        pd.DataFrame: The frame with those columns parsed; cells that cannot be parsed are loaded as NULL.
+    """
+    parsed = {
+        column.name: to_timestamps(df[column.name])
+        for column in table.columns
+        if isinstance(column.type, DateTime) and column.name in df and not is_datetime64_any_dtype(df[column.name])
+    }
+    return df.assign(**parsed) if parsed else df
+
+
+def load_frame(
+    df: pd.DataFrame,
+    engine: Engine,
+    table_name: str,
+    mode: str = "append",
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    key_columns: Sequence[str] = DEFAULT_KEY_COLUMNS,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> LoadResult:
+    """
+    Loads a processed frame into a table in batches, inside a single transaction.
+
+    Each batch is sent as one executemany call, which the MySQL driver rewrites into a multi-row INSERT.
+    "NULL" sentinel strings are sent as real NULLs.
+
+    Args:
+        df (pd.DataFrame): The processed DataFrame.
+        engine (Engine): The database engine.
+        table_name (str): The target table; created from the frame's columns if missing.
+        mode (str): "append" inserts every row, "upsert" updates rows that conflict on the key columns.
+        batch_rows (int): Number of rows per batch.
+        key_columns (Sequence[str]): Columns identifying a row for upserts.
+        progress (Optional[Callable[[int, int], None]]): Called with the loaded and total rows after each batch.
+
+    Returns:
+        LoadResult: The number of rows loaded and the elapsed time.
+
+    Raises:
+        ValueError: If the mode is unknown or upserts are not supported by the database.
+    """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode '{mode}', expected one of {', '.join(LOAD_MODES)}")
+
+    start = time.perf_counter()
+    columns = [str(column) for column in df.columns]
+    table = get_table(engine, table_name, df, key_columns if mode == "upsert" else ())
+    df = _match_datetime_columns(df, table)
+    statement = _upsert_statement(engine, table, columns, key_columns) if mode == "upsert" else table.insert()
+
+    total = len(df)
+    batch_rows = max(1, batch_rows)
+    with engine.begin() as connection:
+        for offset in range(0, total, batch_rows):
+            batch = df.iloc[offset : offset + batch_rows]
+            connection.execute(statement, _batch_records(batch, columns))
+            if progress is not None:
+                progress(offset + len(batch), total)
+
+    return LoadResult(total, time.perf_counter() - start)
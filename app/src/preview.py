@@ -0,0 +1,104 @@
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from .core.numeric import CellSeries
+from .core.profiles import cols_to_rename
+
+# Number of rows per preview page
+PREVIEW_PAGE_ROWS = 100
+
+# Output columns the preview can be searched on
+PREVIEW_FILTER_COLUMNS = (cols_to_rename["S/N"], cols_to_rename["Robot name"])
+
+
+def matching_positions(column: CellSeries, query: str) -> npt.NDArray[np.intp]:
+    """
+    Returns the positions of the rows whose value contains a search text, ignoring case.
+
+    Categorical columns are searched through their categories, so the text is compared once
+    per distinct value instead of once per row.
+
+    Args:
+        column (pd.Series): The searched column.
+        query (str): The text to look for.
+
+    Returns:
+        np.ndarray: The matching row positions, in row order.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = pd.Series(column.cat.categories.astype(str))
+        matched = np.flatnonzero(categories.str.contains(query, case=False, regex=False).to_numpy())
+        return np.flatnonzero(np.isin(column.cat.codes.to_numpy(), matched))
+    matches = column.astype("string").str.contains(query, case=False, regex=False)
+    return np.flatnonzero(matches.fillna(False).to_numpy(dtype=bool))
+
+
+def select_rows(
+    df: pd.DataFrame,
+    filter_column: Optional[str] = None,
+    query: str = "",
+    sort_column: Optional[str] = None,
+    ascending: bool = True,
+) -> npt.NDArray[np.intp]:
+    """
+    Returns the positions of the rows to preview, filtered and sorted without copying the frame.
+
+    Args:
+        df (pd.DataFrame): The processed DataFrame.
+        filter_column (Optional[str]): The column searched for `query`.
+        query (str): The search text; every row is kept if it is empty.
+        sort_column (Optional[str]): The column to sort by; the processed order is kept if None.
+        ascending (bool): Whether to sort in ascending order.
+
+    Returns:
+        np.ndarray: The row positions, in preview order.
+    """
+    query = query.strip()
+    if filter_column is not None and query:
+        positions = matching_positions(df[filter_column], query)
+    else:
+        positions = np.arange(len(df))
+
+    if sort_column is not None:
+        values = df[sort_column].take(positions).reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+        positions = positions[order]
+    return positions
+
+
+def page_count(num_rows: int, page_rows: int = PREVIEW_PAGE_ROWS) -> int:
+    """
+    Returns the number of preview pages, at least one.
+
+    Args:
+        num_rows (int): Number of rows to page through.
+        page_rows (int): Number of rows per page.
+
+    Returns:
+        int: The number of pages.
+    """
+    return max(1, -(-num_rows // page_rows))
+
+
+def preview_page(
+    df: pd.DataFrame, positions: npt.NDArray[np.intp], page: int, page_rows: int = PREVIEW_PAGE_ROWS
+) -> pd.DataFrame:
+    """
+    Materializes one page of rows.
+
+    Args:
+        df (pd.DataFrame): The processed DataFrame.
+        positions (np.ndarray): The row positions returned by `select_rows`.
+        page (int): The 1-based page number, clamped to the available pages.
+        page_rows (int): Number of rows per page.
+
+    Returns:
+        pd.DataFrame: The rows of the page, indexed by their row number in the processed DataFrame.
+    """
+    page = min(max(page, 1), page_count(len(positions), page_rows))
+    start = (page - 1) * page_rows
+    page_frame: pd.DataFrame = df.take(positions[start : start + page_rows])
+    return page_frame
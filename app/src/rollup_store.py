@@ -0,0 +1,77 @@
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from .core.rollups import ROLLUP_KEYS, ROLLUP_VALUES
+from .storage import connect
+
+# SQL column type of each rollup value
+_VALUE_TYPES = {"task_count": "INTEGER", "performance_count": "INTEGER"}
+
+
+class RollupStore:
+    """
+    Persists the daily rollups of loaded task reports, so the totals of each day are merged
+    upload by upload instead of being recomputed from the whole history.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        values = ",\n".join(f"{column} {_VALUE_TYPES.get(column, 'REAL')} NOT NULL" for column in ROLLUP_VALUES)
+        with connect(self.path) as connection:
+            connection.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS daily_rollups (
+                    day TEXT NOT NULL,
+                    server TEXT NOT NULL,
+                    serial_number TEXT NOT NULL,
+                    map_name TEXT NOT NULL,
+                    {values},
+                    PRIMARY KEY ({", ".join(ROLLUP_KEYS)})
+                )
+                """
+            )
+
+    def merge(self, rollups: pd.DataFrame) -> int:
+        """
+        Adds rollups to the stored totals of their days; only the keys of the given rows are touched.
+
+        Args:
+            rollups (pd.DataFrame): Rollups returned by `daily_rollups`.
+
+        Returns:
+            int: Number of rollup rows merged.
+        """
+        columns = ROLLUP_KEYS + ROLLUP_VALUES
+        updates = ", ".join(f"{column} = daily_rollups.{column} + excluded.{column}" for column in ROLLUP_VALUES)
+        statement = (
+            f"INSERT INTO daily_rollups ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({', '.join(ROLLUP_KEYS)}) DO UPDATE SET {updates}"
+        )
+        rows = rollups[list(columns)].astype(object).where(rollups[list(columns)].notna(), None).itertuples(index=False)
+        with connect(self.path) as connection:
+            connection.executemany(statement, rows)
+        return len(rollups)
+
+    def read(self, server: Optional[str] = None, days: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Reads stored rollups, ordered by day, server, serial number and map.
+
+        Args:
+            server (Optional[str]): Only read the rollups of this server, if given.
+            days (Optional[Sequence[str]]): Only read these days ("YYYY-MM-DD"), if given.
+
+        Returns:
+            pd.DataFrame: The stored rollups, with the columns of `daily_rollups`.
+        """
+        conditions, parameters = [], []
+        if server is not None:
+            conditions.append("server = ?")
+            parameters.append(server)
+        if days is not None:
+            conditions.append(f"day IN ({', '.join('?' * len(days))})")
+            parameters.extend(days)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT {', '.join(ROLLUP_KEYS + ROLLUP_VALUES)} FROM daily_rollups {where} ORDER BY {', '.join(ROLLUP_KEYS)}"
+        with connect(self.path) as connection:
+            return pd.read_sql_query(query, connection, params=parameters)
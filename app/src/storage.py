@@ -0,0 +1,43 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Local SQLite database holding the app's persistent state, overridable with GS_STATE_DB
+DEFAULT_STATE_DB = os.path.join(os.path.expanduser("~"), ".gs_transformation", "state.db")
+
+
+def state_db_path() -> str:
+    """
+    Returns the path of the local state database.
+
+    Returns:
+        str: The value of the GS_STATE_DB environment variable, or `DEFAULT_STATE_DB`.
+    """
+    return os.environ.get("GS_STATE_DB", DEFAULT_STATE_DB)
+
+
+@contextmanager
+def connect(path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Opens a connection to the state database, committing on success and rolling back on error.
+
+    Each call opens its own connection, so the stores can be used from any Streamlit session thread.
+
+    Args:
+        path (Optional[str]): Path of the database; defaults to `state_db_path()`.
+
+    Yields:
+        sqlite3.Connection: The open connection.
+    """
+    path = path or state_db_path()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(path, timeout=30)
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()
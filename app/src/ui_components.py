@@ -1,23 +1,46 @@
-import os
-import io
 import base64
 import pandas as pd
 import json
+from typing import Callable, Optional
+import streamlit as st
 import streamlit.components.v1 as components
 
+from .core.transform import processed_filename
+from .exports import (
+    CSV_MIME_TYPE,
+    SQL_BATCH_ROWS,
+    SQL_MIME_TYPE,
+    XLSX_MIME_TYPE,
+    compress_clipboard_text,
+    frame_to_csv,
+    gzip_uncompressed_size,
+    to_clipboard_text,
+    to_excel_bytes,
+    spool_sql_bytes,
+)
+from .preview import PREVIEW_FILTER_COLUMNS, PREVIEW_PAGE_ROWS, page_count, preview_page, select_rows
 
-def copy_content_to_clipboard(df_processed: pd.DataFrame) -> None:
+# Number of rows shown in the copied content preview
+PREVIEW_ROWS = 50
+
+
+def copy_content_to_clipboard(df_processed: pd.DataFrame, payload: Optional[bytes] = None) -> None:
     """
     Generates a custom copy button for the processed DataFrame content.
 
+    The CSV text is sent to the browser gzip-compressed and is only decompressed when the
+    button is clicked.
+
     Args:
         df_processed (pd.DataFrame): The processed DataFrame.
+        payload (Optional[bytes]): The already compressed clipboard payload, if cached.
     """
-    # Convert DataFrame to CSV format without headers
-    copy_text = df_processed.to_csv(index=False, header=False)
+    # Compress the CSV content without headers
+    if payload is None:
+        payload = compress_clipboard_text(df_processed)
 
-    # Escape the text for JavaScript
-    copy_text_json = json.dumps(copy_text)  # Properly escape the content for JavaScript
+    # Encode the compressed content for JavaScript
+    payload_b64 = json.dumps(base64.b64encode(payload).decode("ascii"))
 
     # Create a custom HTML button for copying
     copy_button_html = f"""
@@ -32,10 +55,23 @@ def copy_content_to_clipboard(df_processed: pd.DataFrame) -> None:
             </p>
         </div>
         <script>
+            const payload = {payload_b64};
             const copyButton = document.getElementById('copyButton');
             const feedback = document.getElementById('copyFeedback');
+
+            // Decompress the gzip payload only when the content is needed
+            const decompress = () => {{
+                const bytes = Uint8Array.from(atob(payload), c => c.charCodeAt(0));
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                return new Response(stream).blob().then(blob => new Blob([blob], {{ type: 'text/plain' }}));
+            }};
+
             copyButton.addEventListener('click', () => {{
-                navigator.clipboard.writeText({copy_text_json}).then(() => {{
+                // ClipboardItem accepts a promise, which keeps the click's user activation while decompressing
+                const copied = window.ClipboardItem
+                    ? navigator.clipboard.write([new ClipboardItem({{ 'text/plain': decompress() }})])
+                    : decompress().then(blob => blob.text()).then(text => navigator.clipboard.writeText(text));
+                copied.then(() => {{
                     feedback.style.display = 'block';
                     setTimeout(() => {{
                         feedback.style.display = 'none';
@@ -51,39 +87,160 @@ def copy_content_to_clipboard(df_processed: pd.DataFrame) -> None:
     components.html(copy_button_html, height=100)
 
 
-def download_processed_data(df_processed: pd.DataFrame, uploaded_file_name: str, selected_server: str) -> None:
+@st.fragment
+def preview_processed_data(df_processed: pd.DataFrame, page_rows: int = PREVIEW_PAGE_ROWS) -> None:
     """
-    Generates a custom download button for the processed DataFrame.
+    Shows one page of the processed DataFrame, searched by S/N or robot name and sorted on the server.
+
+    Only the rows of the current page are sent to the browser, and changing the page, search
+    or sort reruns this fragment alone.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        page_rows (int): Number of rows per page.
+    """
+    filter_columns = [column for column in PREVIEW_FILTER_COLUMNS if column in df_processed.columns]
+    col1, col2, col3, col4 = st.columns([2, 3, 2, 1])
+    filter_column = col1.selectbox("Search Column", filter_columns, key="preview_filter_column") if filter_columns else None
+    query = col2.text_input("Contains", key="preview_query", disabled=filter_column is None)
+    sort_column = col3.selectbox(
+        "Sort By", [None, *df_processed.columns], format_func=lambda column: column or "Processed order", key="preview_sort"
+    )
+    descending = col4.toggle("Descending", key="preview_descending", disabled=sort_column is None)
+
+    positions = select_rows(df_processed, filter_column, query, sort_column, not descending)
+    pages = page_count(len(positions), page_rows)
+    # The page is clamped rather than bounded by the input, since a narrower search leaves fewer pages
+    page = min(int(st.number_input("Page", min_value=1, value=1, step=1, key="preview_page")), pages)
+
+    rows = preview_page(df_processed, positions, page, page_rows)
+    st.dataframe(rows)
+    if len(rows):
+        first = (page - 1) * page_rows + 1
+        st.caption(
+            f"Showing rows {first:,}–{first + len(rows) - 1:,} of {len(positions):,} matching rows (page {page:,} of {pages:,})"
+        )
+    else:
+        st.caption("No matching rows")
+
+
+def preview_copied_content(df_processed: pd.DataFrame, payload: bytes, max_rows: int = PREVIEW_ROWS) -> None:
+    """
+    Shows the first rows of the copied content with the total row count and payload sizes,
+    instead of rendering the whole text.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        payload (bytes): The compressed clipboard payload.
+        max_rows (int): Maximum number of rows shown.
+    """
+    num_rows = len(df_processed)
+    st.caption(
+        f"Showing {min(max_rows, num_rows):,} of {num_rows:,} rows · "
+        f"{gzip_uncompressed_size(payload):,} bytes ({len(payload):,} bytes compressed)"
+    )
+    st.text_area("Content Preview (excluding headers):", to_clipboard_text(df_processed.head(max_rows)), height=200)
+
+
+def download_processed_data(
+    df_processed: pd.DataFrame,
+    uploaded_file_name: str,
+    selected_server: str,
+    build_excel: Optional[Callable[[], bytes]] = None,
+) -> None:
+    """
+    Generates a download button for the processed DataFrame.
+
+    The Excel file is only built when the button is clicked and is served as raw bytes,
+    so nothing is generated or sent to the browser on reruns where nobody downloads.
 
     Args:
         df_processed (pd.DataFrame): The processed DataFrame.
         uploaded_file_name (str): The name of the uploaded file.
         selected_server (str): The selected server.
+        build_excel (Optional[Callable[[], bytes]]): Builds the Excel file, e.g. through the result cache.
     """
-    # Create a BytesIO object for the Excel file
-    output = io.BytesIO()
-    df_processed.to_excel(output, index=False, sheet_name="Sheet1")
-    output.seek(0)
-
-    # Generate the file name
-    processed_filename = f"{selected_server}_{os.path.splitext(uploaded_file_name)[0]}_transformed.xlsx"
-
-    # Encode the Excel file to base64
-    b64 = base64.b64encode(output.read()).decode()
-
-    # Create a custom HTML button for downloading with right alignment
-    download_button_html = f"""
-        <div style="text-align: right;">
-            <a href="data:application/octet-stream;base64,{b64}" download="{processed_filename}">
-                <button style="
-                    padding: 10px 20px; font-size: 16px; color: white;
-                    background-color: #007BFF; border: none;
-                    border-radius: 5px; cursor: pointer;">
-                    Download Processed Data
-                </button>
-            </a>
-        </div>
+    st.download_button(
+        "Download Processed Data",
+        data=build_excel or (lambda: to_excel_bytes(df_processed)),
+        file_name=processed_filename(selected_server, uploaded_file_name),
+        mime=XLSX_MIME_TYPE,
+        on_click="ignore",
+        type="primary",
+    )
+
+
+def download_sql_script(
+    df_processed: pd.DataFrame,
+    uploaded_file_name: str,
+    selected_server: str,
+    table_name: str,
+    batch_rows: int = SQL_BATCH_ROWS,
+    build_sql: Optional[Callable[[], bytes]] = None,
+) -> None:
     """
+    Generates a download button for the processed DataFrame as a SQL script of multi-row INSERT statements.
 
-    # Use components.html to render the button
-    components.html(download_button_html, height=70)
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+        uploaded_file_name (str): The name of the uploaded file.
+        selected_server (str): The selected server.
+        table_name (str): The table the statements insert into.
+        batch_rows (int): Number of rows per INSERT statement.
+        build_sql (Optional[Callable[[], bytes]]): Builds the script; by default it is spooled with `spool_sql_bytes`.
+    """
+    st.download_button(
+        "Download SQL Script",
+        data=build_sql or (lambda: spool_sql_bytes(df_processed, table_name, batch_rows)),
+        file_name=processed_filename(selected_server, uploaded_file_name, "sql"),
+        mime=SQL_MIME_TYPE,
+        on_click="ignore",
+    )
+
+
+def download_rollups(
+    build_csv: Callable[[], str],
+    uploaded_file_name: str,
+    selected_server: str,
+    label: str = "Download Daily Rollups",
+) -> None:
+    """
+    Generates a download button for daily rollups, as CSV built only when the button is clicked.
+
+    Args:
+        build_csv (Callable[[], str]): Builds the CSV text of the rollup report.
+        uploaded_file_name (str): The name of the uploaded file.
+        selected_server (str): The selected server.
+        label (str): The button label.
+    """
+    st.download_button(
+        label,
+        data=build_csv,
+        file_name=processed_filename(selected_server, uploaded_file_name, "csv", "rollups"),
+        mime=CSV_MIME_TYPE,
+        on_click="ignore",
+    )
+
+
+def download_rejected_rows(
+    df_rejected: pd.DataFrame,
+    uploaded_file_name: str,
+    selected_server: str,
+    build_csv: Optional[Callable[[], str]] = None,
+) -> None:
+    """
+    Generates a download button for the rows rejected by validation, as CSV with their reason codes.
+
+    Args:
+        df_rejected (pd.DataFrame): The rejected rows.
+        uploaded_file_name (str): The name of the uploaded file.
+        selected_server (str): The selected server.
+        build_csv (Optional[Callable[[], str]]): Builds the CSV text, e.g. through the result cache.
+    """
+    st.download_button(
+        "Download Rejected Rows",
+        data=build_csv or (lambda: str(frame_to_csv(df_rejected))),
+        file_name=processed_filename(selected_server, uploaded_file_name, "csv", "rejected"),
+        mime=CSV_MIME_TYPE,
+        on_click="ignore",
+    )
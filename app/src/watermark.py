@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+from .core.engine import SORT_COLUMN
+from .core.profiles import cols_to_rename
+from .storage import connect
+
+# Output column holding the "Receive task report time"
+REPORT_TIME_COLUMN = cols_to_rename[SORT_COLUMN]
+
+# Format the watermark is stored and shown in, matching the report time input
+WATERMARK_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def format_watermark(report_time: datetime) -> str:
+    """
+    Formats a report time as a watermark, keeping its fractional seconds if it has any.
+
+    Truncating them would make the next run's `>` cutoff include the last report again.
+    Both layouts compare in time order as text, so stored watermarks of either layout are compared in SQL.
+
+    Args:
+        report_time (datetime): The report time.
+
+    Returns:
+        str: The time as "YYYY-MM-DD HH:MM:SS", with ".ffffff" appended if its microseconds are not zero.
+    """
+    value = report_time.strftime(WATERMARK_FORMAT)
+    return f"{value}.{report_time.microsecond:06d}" if report_time.microsecond else value
+
+
+class WatermarkStore:
+    """
+    Persists, per server, the latest "Receive task report time" of the last result that was loaded
+    into a database or exported, so the next upload can be filtered from it without typing the cutoff by hand.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        with connect(self.path) as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    server TEXT PRIMARY KEY,
+                    report_time TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+
+    def get(self, server: str) -> Optional[str]:
+        """
+        Returns the watermark of a server.
+
+        Args:
+            server (str): The server name.
+
+        Returns:
+            Optional[str]: The report time formatted by `format_watermark`, or None if the server has none.
+        """
+        with connect(self.path) as connection:
+            row = connection.execute("SELECT report_time FROM watermarks WHERE server = ?", (server,)).fetchone()
+        return str(row[0]) if row else None
+
+    def advance(self, server: str, report_time: datetime) -> None:
+        """
+        Moves the watermark of a server forward; an older report time leaves it unchanged.
+
+        Args:
+            server (str): The server name.
+            report_time (datetime): The latest report time of the loaded or exported result.
+        """
+        value = format_watermark(report_time)
+        with connect(self.path) as connection:
+            connection.execute(
+                """
+                INSERT INTO watermarks (server, report_time, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (server) DO UPDATE SET report_time = excluded.report_time, updated_at = excluded.updated_at
+                WHERE excluded.report_time > watermarks.report_time
+                """,
+                (server, value, datetime.now().strftime(WATERMARK_FORMAT)),
+            )
+
+
+def latest_report_time(df_processed: pd.DataFrame) -> Optional[datetime]:
+    """
+    Returns the latest report time of a processed DataFrame.
+
+    Args:
+        df_processed (pd.DataFrame): The processed DataFrame.
+
+    Returns:
+        Optional[datetime]: The latest report time, or None if there are no rows.
+    """
+    if REPORT_TIME_COLUMN not in df_processed.columns:
+        return None
+    latest = pd.to_datetime(df_processed[REPORT_TIME_COLUMN], errors="coerce").max()
+    return None if pd.isna(latest) else latest.to_pydatetime(warn=False)
@@ -0,0 +1,105 @@
+"""
+Checks the import-time budget of the transform core.
+
+Each module is imported in a fresh interpreter, and the best of --repeat runs is kept. The core
+fails the check if it loads a UI or optional backend module, or if it adds more than --budget
+seconds on top of importing pandas, which it cannot avoid.
+
+Example:
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --budget 0.1 --repeat 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import List, Optional, Tuple
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+
+# Module every import is measured against
+BASELINE_MODULE = "pandas"
+
+# Module whose import cost is budgeted
+CORE_MODULE = "src.core.transform"
+
+# Module importing the core through the Streamlit app, measured for comparison
+APP_MODULE = "src.utils"
+
+# Modules the core must only import when they are used
+DEFERRED_MODULES = ("streamlit", "openpyxl", "xlsxwriter", "sqlalchemy", "duckdb", "polars")
+
+# Seconds the core may add on top of pandas
+DEFAULT_BUDGET = 0.15
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+__import__({module!r})
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [name for name in {deferred!r} if name in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> Tuple[float, List[str]]:
+    """
+    Imports a module in fresh interpreters.
+
+    Args:
+        module (str): The module to import.
+        repeat (int): Number of interpreters started; the fastest import is kept.
+
+    Returns:
+        Tuple[float, List[str]]: The seconds of the fastest import and the deferred modules it loaded.
+    """
+    best = float("inf")
+    loaded: List[str] = []
+    for _ in range(max(1, repeat)):
+        probe = _PROBE.format(module=module, deferred=DEFERRED_MODULES)
+        output = subprocess.run([sys.executable, "-c", probe], cwd=APP_DIR, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        best = min(best, result["seconds"])
+        loaded = result["loaded"]
+    return best, loaded
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the import-time check from the command-line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; defaults to sys.argv.
+
+    Returns:
+        int: 1 if the core is over budget or loads a deferred module, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Check the import-time budget of the transform core.")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Seconds the core may add on top of pandas")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module; the fastest import is kept")
+    args = parser.parse_args(argv)
+
+    baseline, _ = measure_import(BASELINE_MODULE, args.repeat)
+    core, loaded = measure_import(CORE_MODULE, args.repeat)
+    app, _ = measure_import(APP_MODULE, args.repeat)
+    for module, seconds in ((BASELINE_MODULE, baseline), (CORE_MODULE, core), (APP_MODULE, app)):
+        print(f"{module:<20} {seconds:8.3f}s")
+
+    overhead = core - baseline
+    failures = []
+    if overhead > args.budget:
+        failures.append(f"{CORE_MODULE} adds {overhead:.3f}s on top of {BASELINE_MODULE}, over the {args.budget:.3f}s budget")
+    if loaded:
+        failures.append(f"{CORE_MODULE} imports {', '.join(loaded)} at import time")
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if not failures:
+        summary = f"{CORE_MODULE} adds {overhead:.3f}s on top of {BASELINE_MODULE}, within the {args.budget:.3f}s budget"
+        print(summary, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Checks that the optional execution engines produce the same frame as the pandas path, row for row.
+
+Every server whose columns match an export schema is run on a generated export of that schema,
+and each engine's output is compared with the pandas output: columns, dtypes, attrs, the
+sequence of report times and the rows themselves. Reports received in the same second may be
+ordered differently by each engine, so rows are compared as rendered by the CSV writer after
+sorting them.
+
+Example:
+    python benchmarks/check_parity.py --rows 100000
+    python benchmarks/check_parity.py --engines duckdb --units imperial
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+import pandas as pd
+
+from generate import START_DATETIME, UNITS, export_columns
+from run_benchmarks import NamedBytesIO, export_path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from src.core.engine import SORT_COLUMN, compile_profile  # noqa: E402
+from src.core.profiles import get_profile  # noqa: E402
+from src.core.schema import matching_servers  # noqa: E402
+from src.core.transform import ENGINES, calculate_adjusted_datetime, process_uploaded_file  # noqa: E402
+from src.exports import frame_to_csv  # noqa: E402
+
+# Engines compared against the pandas path
+CHECKED_ENGINES = tuple(engine for engine in ENGINES if engine not in ("auto", "pandas"))
+
+# Serial numbers excluded in every run, so the exclusion filter is covered
+EXCLUDED = ["GS000003", "GS000017"]
+
+
+def compare_frames(expected: pd.DataFrame, actual: pd.DataFrame, report_column: str) -> List[str]:
+    """
+    Lists the differences between the pandas output and the output of another engine.
+
+    Args:
+        expected (pd.DataFrame): The pandas output.
+        actual (pd.DataFrame): The output of the checked engine.
+        report_column (str): The output column holding the report times the rows are sorted by.
+
+    Returns:
+        List[str]: One line per difference; empty if the frames match.
+    """
+    if list(expected.columns) != list(actual.columns):
+        return [f"columns differ: {list(expected.columns)} != {list(actual.columns)}"]
+
+    differences = []
+    for column in expected.columns:
+        if expected[column].dtype != actual[column].dtype:
+            differences.append(f"{column}: dtype {expected[column].dtype} != {actual[column].dtype}")
+    if expected.attrs != actual.attrs:
+        differences.append(f"attrs differ: {expected.attrs} != {actual.attrs}")
+    if len(expected) != len(actual):
+        return differences + [f"row counts differ: {len(expected)} != {len(actual)}"]
+    if not expected[report_column].reset_index(drop=True).equals(actual[report_column].reset_index(drop=True)):
+        differences.append("report times are not in the same order")
+
+    expected_rows = sorted(str(frame_to_csv(expected, header=False)).splitlines())
+    actual_rows = sorted(str(frame_to_csv(actual, header=False)).splitlines())
+    mismatched = sum(left != right for left, right in zip(expected_rows, actual_rows))
+    if mismatched:
+        first = next(index for index, (left, right) in enumerate(zip(expected_rows, actual_rows)) if left != right)
+        differences.append(f"{mismatched} rows differ, e.g. {expected_rows[first]!r} != {actual_rows[first]!r}")
+    return differences
+
+
+def check_export(path: str, unit: str, engines: List[str]) -> int:
+    """
+    Runs every engine on an export for each server of its schema and prints the differences.
+
+    Args:
+        path (str): The generated CSV export.
+        unit (str): The schema of the export.
+        engines (List[str]): The engines compared against pandas.
+
+    Returns:
+        int: The number of mismatching runs.
+    """
+    with open(path, "rb") as file:
+        content = file.read()
+    # Cut the export in half, so the cutoff filter drops rows
+    cutoff = (pd.Timestamp(START_DATETIME) + pd.Timedelta(days=15)).strftime("%Y-%m-%d %H:%M:%S")
+
+    failures = 0
+    for server in matching_servers(export_columns(unit)):
+        report_column = next(step.target for step in compile_profile(get_profile(server)).steps if step.source == SORT_COLUMN)
+        adjusted_datetime = calculate_adjusted_datetime(server)
+        outputs = {}
+        for engine in ["pandas", *engines]:
+            start = time.perf_counter()
+            outputs[engine] = process_uploaded_file(
+                NamedBytesIO(content, os.path.basename(path)), cutoff, adjusted_datetime, server, EXCLUDED, engine=engine
+            )
+            print(f"{unit:<8} {server:<8} {engine:<7} {len(outputs[engine]):>9} rows {time.perf_counter() - start:8.3f}s")
+
+        for engine in engines:
+            differences = compare_frames(outputs["pandas"], outputs[engine], report_column)
+            failures += bool(differences)
+            for difference in differences:
+                print(f"  {engine} differs from pandas on {server}: {difference}")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the parity check from the command-line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; defaults to sys.argv.
+
+    Returns:
+        int: 1 if an engine's output differs from the pandas output, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Check the optional engines against the pandas path.")
+    parser.add_argument("--rows", type=int, default=10_000, help="Number of task reports per export")
+    parser.add_argument("--units", nargs="+", choices=list(UNITS), default=list(UNITS), help="Export schemas")
+    parser.add_argument("--engines", nargs="+", choices=list(CHECKED_ENGINES), default=list(CHECKED_ENGINES), help="Engines")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated exports")
+    parser.add_argument("--data-dir", default=os.path.join("benchmarks", "data"), help="Where generated exports are kept")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for unit in args.units:
+        failures += check_export(export_path(args.data_dir, unit, args.rows, "csv", args.seed), unit, args.engines)
+
+    summary = f"{failures} runs differ from the pandas path" if failures else "All engines match the pandas path"
+    print(summary, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Synthetic robot portal exports for benchmarking the transform pipeline.
+
+Example:
+    python benchmarks/generate.py --rows 100000 --unit metric --format csv -o exports/metric_100k.csv
+    python benchmarks/generate.py --rows 10000 --unit imperial --format xlsx -o exports/imperial_10k.xlsx
+    python benchmarks/generate.py --rows 300 --unit imperial --baseline-compatible -o tests/golden/imperial_export.csv
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+# Units of the area and water usage columns of each export schema
+UNITS = {"metric": ("㎡", "L"), "imperial": ("ft²", "gal")}
+
+# Start of the generated task start times; reports span the 30 days after it
+START_DATETIME = datetime(2024, 5, 1)
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def export_columns(unit: str) -> List[str]:
+    """
+    Returns the columns of a raw export in the order the portal writes them.
+
+    Args:
+        unit (str): "metric" (㎡, L) or "imperial" (ft², gal).
+
+    Returns:
+        List[str]: The column names.
+    """
+    area, water = UNITS[unit]
+    return [
+        "Robot name",
+        "S/N",
+        "Map name",
+        "Cleaning plan",
+        "User",
+        "Task start time",
+        "End time",
+        "Total time",
+        "Task status",
+        "Task completion (%)",
+        f"Actual cleaning area({area})",
+        "Total time (h)",
+        f"Water usage ({water})",
+        "Brush (%)",
+        "Filter (%)",
+        "Squeegee(%)",
+        f"Planned crystallization area ({area})",
+        f"Actual crystallization area ({area})",
+        f"Cleaning plan area ({area})",
+        "Plan running time (s)",
+        f"Uncleaned area ({area})",
+        "Start battery level (%)",
+        "End battery level (%)",
+        "Receive task report time",
+        "Task type",
+        "Task start mode",
+        "Download link",
+        f"Work efficiency ({area}/h)",
+        "Remarks",
+    ]
+
+
+def _numbers(rng: np.random.Generator, values: np.ndarray, placeholder_rate: float = 0.05) -> np.ndarray:
+    """
+    Formats numbers the way the portal does: thousands separators and "-" for missing readings.
+
+    Args:
+        rng (np.random.Generator): The random generator.
+        values (np.ndarray): The numbers.
+        placeholder_rate (float): Share of cells replaced by "-".
+
+    Returns:
+        np.ndarray: The formatted cells.
+    """
+    cells = pd.Series(values).map("{:,.2f}".format).to_numpy(dtype=object)
+    cells[rng.random(len(values)) < placeholder_rate] = "-"
+    return cells
+
+
+def _percentages(rng: np.random.Generator, num_rows: int, with_suffixes: bool = True) -> np.ndarray:
+    """
+    Returns percent cells, mostly plain numbers with some "%" suffixes and "-" placeholders.
+
+    Args:
+        rng (np.random.Generator): The random generator.
+        num_rows (int): Number of cells.
+        with_suffixes (bool): Whether some cells carry a "%" suffix.
+
+    Returns:
+        np.ndarray: The formatted cells.
+    """
+    choices = ["100.00", "85.50", "55.00", "0.00"] + (["100%", "42.5%"] if with_suffixes else []) + ["-"]
+    return rng.choice(np.array(choices, dtype=object), num_rows)
+
+
+def generate_export(num_rows: int, unit: str = "metric", seed: int = 0, baseline_compatible: bool = False) -> pd.DataFrame:
+    """
+    Generates a raw robot portal export with every cell as text, as read from the portal's files.
+
+    Args:
+        num_rows (int): Number of task reports.
+        unit (str): "metric" (㎡, L) or "imperial" (ft², gal).
+        seed (int): Seed of the random generator.
+        baseline_compatible (bool): Whether to leave out the cells the pre-series transform fails on: "%" suffixes
+            and "-" placeholders in the water usage it converts to gallons.
+
+    Returns:
+        pd.DataFrame: The export, with reports in random order.
+    """
+    rng = np.random.default_rng(seed)
+    area, water = UNITS[unit]
+    index = np.arange(num_rows)
+
+    start = pd.Timestamp(START_DATETIME) + pd.to_timedelta(rng.integers(0, 30 * 24 * 60, num_rows), unit="min")
+    end = start + pd.to_timedelta(rng.integers(5, 200, num_rows), unit="min")
+    report = end + pd.to_timedelta(rng.integers(1, 600, num_rows), unit="s")
+    cleaning_area = rng.uniform(0, 5000, num_rows)
+
+    battery = rng.integers(20, 101, num_rows).astype(str).astype(object)
+    battery[index % 11 == 0] = ""
+
+    data = {
+        "Robot name": pd.Series(index % 17).map("Robot {}".format).to_numpy(),
+        "S/N": pd.Series(index % 23).map("GS{:06d}".format).to_numpy(),
+        "Map name": pd.Series(index % 5).map("Map {}".format).to_numpy(),
+        "Cleaning plan": pd.Series(index % 9).map("Plan {}".format).to_numpy(),
+        "User": np.where(index % 7 == 0, "", "ops"),
+        "Task start time": start.strftime(DATETIME_FORMAT),
+        "End time": end.strftime(DATETIME_FORMAT),
+        "Total time": "1h",
+        "Task status": "Done",
+        "Task completion (%)": _percentages(rng, num_rows, not baseline_compatible),
+        f"Actual cleaning area({area})": _numbers(rng, cleaning_area),
+        "Total time (h)": _numbers(rng, rng.uniform(0, 5, num_rows), 0.0),
+        f"Water usage ({water})": _numbers(rng, rng.uniform(0, 50, num_rows), 0.0 if baseline_compatible else 0.02),
+        "Brush (%)": _percentages(rng, num_rows, not baseline_compatible),
+        "Filter (%)": _percentages(rng, num_rows, not baseline_compatible),
+        "Squeegee(%)": _percentages(rng, num_rows, not baseline_compatible),
+        f"Planned crystallization area ({area})": "-",
+        f"Actual crystallization area ({area})": "-",
+        f"Cleaning plan area ({area})": _numbers(rng, cleaning_area * 1.2),
+        "Plan running time (s)": rng.integers(60, 20_000, num_rows).astype(str),
+        f"Uncleaned area ({area})": _numbers(rng, rng.uniform(0, 100, num_rows)),
+        "Start battery level (%)": battery,
+        "End battery level (%)": rng.integers(0, 91, num_rows).astype(str),
+        "Receive task report time": report.strftime(DATETIME_FORMAT),
+        "Task type": rng.choice(np.array(["Scrub", "Sweep", "Dust"], dtype=object), num_rows),
+        "Task start mode": "Manual",
+        "Download link": pd.Series(index).map("https://portal.example.com/report/{}".format).to_numpy(),
+        f"Work efficiency ({area}/h)": _numbers(rng, rng.uniform(0, 2000, num_rows)),
+        "Remarks": "",
+    }
+    return pd.DataFrame(data, columns=export_columns(unit))
+
+
+def write_export(df: pd.DataFrame, path: str) -> None:
+    """
+    Writes a generated export as CSV or XLSX, depending on the file extension.
+
+    Args:
+        df (pd.DataFrame): The generated export.
+        path (str): The output path ending in .csv or .xlsx.
+
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    if path.endswith(".csv"):
+        df.to_csv(path, index=False)
+    elif path.endswith(".xlsx"):
+        # Written row by row as text cells, like the portal's own exports
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        try:
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(0, 0, list(df.columns))
+            for row_number, row in enumerate(df.itertuples(index=False, name=None), start=1):
+                worksheet.write_row(row_number, 0, row)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Generates an export from the command-line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; defaults to sys.argv.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = argparse.ArgumentParser(description="Generate a synthetic robot portal export.")
+    parser.add_argument("--rows", type=int, default=10_000, help="Number of task reports")
+    parser.add_argument("--unit", choices=list(UNITS), default="metric", help="Export schema")
+    parser.add_argument("--format", dest="file_format", choices=["csv", "xlsx"], default="csv", help="Output file format")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator")
+    parser.add_argument(
+        "--baseline-compatible",
+        action="store_true",
+        help="Leave out the cells the pre-series transform fails on, for comparing against its output",
+    )
+    parser.add_argument("-o", "--output", help="Output path; defaults to <unit>_<rows>.<format>")
+    args = parser.parse_args(argv)
+
+    output = args.output or f"{args.unit}_{args.rows}.{args.file_format}"
+    write_export(generate_export(args.rows, args.unit, args.seed, args.baseline_compatible), output)
+    print(f"Wrote {args.rows} rows to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Benchmarks each stage of the transform pipeline on synthetic exports and stores the results as JSON.
+
+Example:
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --formats csv --output results.json
+    python benchmarks/run_benchmarks.py --output new.json --compare results.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from generate import START_DATETIME, generate_export, write_export
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from src.core.engine import TransformPlan, apply_plan, compile_profile  # noqa: E402
+from src.core.profiles import get_profile  # noqa: E402
+from src.core.transform import (  # noqa: E402
+    calculate_adjusted_datetime,
+    filter_report_rows,
+    process_uploaded_file,
+    read_file,
+    read_filtered_file,
+)
+from src.exports import compress_clipboard_text, to_clipboard_text, to_excel_bytes, to_sql_bytes  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# Server benchmarked for each export schema
+UNIT_SERVERS = {"metric": "GS SGV2", "imperial": "GS CA"}
+
+# Relative slowdown reported as a regression by --compare
+REGRESSION_THRESHOLD = 0.10
+
+
+@dataclass
+class StageResult:
+    """Timing and memory of one pipeline stage on one input."""
+
+    unit: str
+    file_format: str
+    rows: int
+    stage: str
+    seconds: float
+    peak_bytes: Optional[int]
+    rows_in: int
+    rows_out: Optional[int]
+    output_bytes: Optional[int]
+
+
+class NamedBytesIO(io.BytesIO):
+    """In-memory upload with the file name the readers dispatch on."""
+
+    def __init__(self, content: bytes, name: str) -> None:
+        super().__init__(content)
+        self.name = name
+
+
+def export_path(data_dir: str, unit: str, rows: int, file_format: str, seed: int) -> str:
+    """
+    Returns the path of a generated export, generating it on first use.
+
+    Args:
+        data_dir (str): Directory the exports are kept in between runs.
+        unit (str): "metric" or "imperial".
+        rows (int): Number of task reports.
+        file_format (str): "csv" or "xlsx".
+        seed (int): Seed of the generator.
+
+    Returns:
+        str: The path of the export.
+    """
+    path = os.path.join(data_dir, f"{unit}_{rows}_{seed}.{file_format}")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        print(f"Generating {path}...", file=sys.stderr)
+        write_export(generate_export(rows, unit, seed), path)
+    return path
+
+
+def measure(stage: Callable[[], object], repeat: int, track_memory: bool) -> Tuple[float, Optional[int], object]:
+    """
+    Times a stage and measures its peak allocated memory.
+
+    The time is the best of `repeat` runs; the peak memory comes from one extra run under
+    tracemalloc, so tracing does not inflate the timings.
+
+    Args:
+        stage (Callable[[], object]): The stage to run.
+        repeat (int): Number of timed runs.
+        track_memory (bool): Whether to measure the peak memory.
+
+    Returns:
+        Tuple[float, Optional[int], object]: The seconds, the peak bytes and the stage's output.
+    """
+    best = float("inf")
+    output: object = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        output = stage()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            stage()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak, output
+
+
+def _partial_plan(plan: TransformPlan, kinds: Tuple[str, ...]) -> TransformPlan:
+    """Returns the plan restricted to the steps of the given kinds."""
+    return replace(plan, steps=tuple(step for step in plan.steps if step.kind in kinds))
+
+
+def benchmark_file(path: str, unit: str, file_format: str, rows: int, repeat: int, track_memory: bool) -> List[StageResult]:
+    """
+    Runs every stage on one export.
+
+    Args:
+        path (str): The export.
+        unit (str): "metric" or "imperial".
+        file_format (str): "csv" or "xlsx".
+        rows (int): Number of task reports in the export.
+        repeat (int): Number of timed runs per stage.
+        track_memory (bool): Whether to measure the peak memory.
+
+    Returns:
+        List[StageResult]: One result per stage.
+    """
+    with open(path, "rb") as file:
+        content = file.read()
+    name = os.path.basename(path)
+    server = UNIT_SERVERS[unit]
+    cutoff = START_DATETIME
+    cutoff_str = cutoff.strftime("%Y-%m-%d %H:%M:%S")
+    adjusted_datetime = calculate_adjusted_datetime(server)
+    plan = compile_profile(get_profile(server))
+
+    # Inputs of the later stages, computed once outside the measurements
+    df_raw = read_file(NamedBytesIO(content, name))
+    df_raw["Receive task report time"] = pd.to_datetime(df_raw["Receive task report time"])
+    df_filtered = read_filtered_file(NamedBytesIO(content, name), cutoff, usecols=list(plan.usecols))
+    df_processed = apply_plan(df_filtered, plan, adjusted_datetime)
+
+    stages: Dict[str, Tuple[Callable[[], object], int]] = {
+        "read": (lambda: read_file(NamedBytesIO(content, name)), rows),
+        "filter": (lambda: filter_report_rows(df_raw, cutoff), len(df_raw)),
+        "read_filtered": (lambda: read_filtered_file(NamedBytesIO(content, name), cutoff, usecols=list(plan.usecols)), rows),
+        "clean": (lambda: apply_plan(df_filtered, _partial_plan(plan, ("numeric",)), adjusted_datetime), len(df_filtered)),
+        "rename": (lambda: apply_plan(df_filtered, _partial_plan(plan, ("copy",)), adjusted_datetime), len(df_filtered)),
+        "null_columns": (
+            lambda: apply_plan(df_filtered, _partial_plan(plan, ("null", "datetime")), adjusted_datetime),
+            len(df_filtered),
+        ),
+        "transform": (lambda: apply_plan(df_filtered, plan, adjusted_datetime), len(df_filtered)),
+        "serialize_csv": (lambda: to_clipboard_text(df_processed), len(df_processed)),
+        "serialize_clipboard": (lambda: compress_clipboard_text(df_processed), len(df_processed)),
+        "serialize_xlsx": (lambda: to_excel_bytes(df_processed), len(df_processed)),
+        "serialize_sql": (lambda: to_sql_bytes(df_processed, "task_reports"), len(df_processed)),
+        "end_to_end": (lambda: process_uploaded_file(NamedBytesIO(content, name), cutoff_str, adjusted_datetime, server), rows),
+    }
+
+    results = []
+    for stage_name, (stage, rows_in) in stages.items():
+        seconds, peak, output = measure(stage, repeat, track_memory)
+        rows_out = len(output) if isinstance(output, pd.DataFrame) else None
+        output_bytes = len(output) if isinstance(output, (bytes, str)) else None
+        results.append(StageResult(unit, file_format, rows, stage_name, seconds, peak, rows_in, rows_out, output_bytes))
+        print(f"{unit:8} {file_format:4} {rows:>9} {stage_name:20} {seconds:9.4f}s {_format_bytes(peak):>10}", file=sys.stderr)
+    return results
+
+
+def _format_bytes(size: Optional[int]) -> str:
+    """Formats a byte count in MiB, or "-" if unknown."""
+    return "-" if size is None else f"{size / 1024 / 1024:.1f} MiB"
+
+
+def git_revision() -> Optional[str]:
+    """Returns the current git commit, if the benchmarks run inside the repository."""
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def compare(previous_path: str, results: List[StageResult]) -> int:
+    """
+    Prints the change of every stage against a previous results file.
+
+    Args:
+        previous_path (str): The previous JSON results.
+        results (List[StageResult]): The current results.
+
+    Returns:
+        int: Number of stages slower than the previous run by more than `REGRESSION_THRESHOLD`.
+    """
+    with open(previous_path, encoding="utf-8") as file:
+        previous = {
+            (entry["unit"], entry["file_format"], entry["rows"], entry["stage"]): entry for entry in json.load(file)["results"]
+        }
+
+    regressions = 0
+    for result in results:
+        entry = previous.get((result.unit, result.file_format, result.rows, result.stage))
+        if entry is None or not entry["seconds"]:
+            continue
+        change = result.seconds / entry["seconds"] - 1
+        flag = ""
+        if change > REGRESSION_THRESHOLD:
+            regressions += 1
+            flag = "  REGRESSION"
+        memory = ""
+        if result.peak_bytes is not None and entry.get("peak_bytes"):
+            memory = f" memory {result.peak_bytes / entry['peak_bytes'] - 1:+.0%}"
+        print(
+            f"{result.unit:8} {result.file_format:4} {result.rows:>9} {result.stage:20} "
+            f"{entry['seconds']:9.4f}s -> {result.seconds:9.4f}s ({change:+.0%}){memory}{flag}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the benchmark suite from the command-line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; defaults to sys.argv.
+
+    Returns:
+        int: 1 if --compare found a regression, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the transform pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Numbers of rows")
+    parser.add_argument("--formats", nargs="+", choices=["csv", "xlsx"], default=["csv", "xlsx"], help="Export formats")
+    parser.add_argument("--units", nargs="+", choices=list(UNIT_SERVERS), default=list(UNIT_SERVERS), help="Export schemas")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best is kept")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory runs")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated exports")
+    parser.add_argument("--data-dir", default=os.path.join("benchmarks", "data"), help="Where generated exports are kept")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file the results are written to")
+    parser.add_argument("--compare", help="Previous JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    results: List[StageResult] = []
+    for unit in args.units:
+        for file_format in args.formats:
+            for rows in args.sizes:
+                path = export_path(args.data_dir, unit, rows, file_format, args.seed)
+                results.extend(benchmark_file(path, unit, file_format, rows, args.repeat, not args.no_memory))
+
+    report = {
+        "revision": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        return 1 if compare(args.compare, results) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
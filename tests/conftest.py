@@ -0,0 +1,34 @@
+import os
+from typing import Callable, Dict, Iterator, Tuple
+
+import pytest
+
+from generate import generate_export, write_export
+from src.core.datetimes import format_cache
+
+# Task reports per generated export, enough for the cutoff to drop rows and every robot to appear
+EXPORT_ROWS = 2_000
+
+
+@pytest.fixture(autouse=True)
+def clear_format_cache() -> Iterator[None]:
+    """Keeps the timestamp formats detected by one test from being reused by the next."""
+    format_cache.clear()
+    yield
+    format_cache.clear()
+
+
+@pytest.fixture(scope="session")
+def export_bytes(tmp_path_factory: pytest.TempPathFactory) -> Callable[[str, str], bytes]:
+    """Returns a builder of generated exports of a unit and file format, each generated once per session."""
+    exports: Dict[Tuple[str, str], bytes] = {}
+
+    def build(unit: str, file_format: str = "csv") -> bytes:
+        if (unit, file_format) not in exports:
+            path = os.path.join(tmp_path_factory.mktemp("exports"), f"{unit}.{file_format}")
+            write_export(generate_export(EXPORT_ROWS, unit), path)
+            with open(path, "rb") as file:
+                exports[unit, file_format] = file.read()
+        return exports[unit, file_format]
+
+    return build
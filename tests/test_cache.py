@@ -0,0 +1,89 @@
+import pandas as pd
+
+from src.cache import ResultCache, make_cache_key
+
+
+def frame(rows: int) -> pd.DataFrame:
+    """Builds a processed frame of float rows."""
+    return pd.DataFrame({"cleaning_area": [float(row) for row in range(rows)]})
+
+
+def test_put_and_get_frame() -> None:
+    cache = ResultCache()
+    df = frame(3)
+
+    cache.put_frame("a", df)
+
+    assert cache.get_frame("a") is df
+    assert cache.get_frame("b") is None
+    assert "a" in cache
+    assert cache.size > 0
+
+
+def test_get_or_build_builds_each_artifact_once() -> None:
+    cache = ResultCache()
+    cache.put_frame("a", frame(3))
+    builds = []
+
+    def build() -> str:
+        builds.append(1)
+        return "csv text"
+
+    assert cache.get_or_build("a", "csv", build) == "csv text"
+    assert cache.get_or_build("a", "csv", build) == "csv text"
+    assert len(builds) == 1
+    assert cache.get_frame("a") is not None
+
+
+def test_put_frame_drops_the_artifacts_of_the_previous_frame() -> None:
+    cache = ResultCache()
+    cache.put_frame("a", frame(3))
+    cache.get_or_build("a", "csv", lambda: "old")
+
+    cache.put_frame("a", frame(4))
+
+    assert cache.get_or_build("a", "csv", lambda: "new") == "new"
+
+
+def test_least_recently_used_entries_are_evicted() -> None:
+    entry_size = int(frame(100).memory_usage(index=True, deep=True).sum())
+    cache = ResultCache(max_bytes=2 * entry_size)
+    cache.put_frame("a", frame(100))
+    cache.put_frame("b", frame(100))
+    cache.get_frame("a")
+
+    cache.put_frame("c", frame(100))
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.size == 2 * entry_size
+
+
+def test_the_newest_entry_is_kept_even_when_too_large() -> None:
+    cache = ResultCache(max_bytes=1)
+
+    cache.put_frame("a", frame(100))
+
+    assert len(cache) == 1
+
+
+def test_discard_and_clear_release_the_entries() -> None:
+    cache = ResultCache()
+    cache.put_frame("a", frame(3))
+    cache.put_frame("b", frame(3))
+
+    cache.discard("a")
+    assert "a" not in cache and len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_make_cache_key_depends_on_the_inputs() -> None:
+    key = make_cache_key([b"content"], "GS SGV2", "2024-05-01 00:00:00", ["GS2", "GS1"])
+
+    assert make_cache_key([b"content"], "GS SGV2", "2024-05-01 00:00:00", ["GS1", "GS2"]) == key
+    assert make_cache_key([b"content"], "GS CA", "2024-05-01 00:00:00", ["GS1", "GS2"]) != key
+    assert make_cache_key([b"other"], "GS SGV2", "2024-05-01 00:00:00", ["GS1", "GS2"]) != key
+    assert make_cache_key([b"content"], "GS SGV2", "2024-05-01 00:00:00", ["GS1", "GS2"], add_lat_lon=True) != key
@@ -0,0 +1,100 @@
+import csv
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import cli
+from src.core.profiles import metric_profile
+
+# Cutoff of the batch runs; the first report of each export is at or before it
+CUTOFF = "2024-05-01 12:00:00"
+
+# Arguments of the batch runs: one server, CSV outputs and a single worker process
+BATCH_ARGS = ["--server", "GS SGV2", "--cutoff", CUTOFF, "--format", "csv", "--workers", "1"]
+
+
+def write_export(path: Path, serial_numbers: list) -> None:
+    """Writes a metric export with one report per serial number, an hour apart from 12:00 on."""
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=metric_profile.columns)
+        writer.writeheader()
+        for hour, serial_number in enumerate(serial_numbers):
+            time = f"2024-05-01 {12 + hour:02d}:00:00"
+            row = dict.fromkeys(metric_profile.columns, "1")
+            row.update({"S/N": serial_number, "Task start time": time, "End time": time, "Receive task report time": time})
+            writer.writerow(row)
+
+
+def run_batch(inputs: Path, output_dir: Path, *args: str) -> int:
+    """Runs the batch CLI on the given inputs with `BATCH_ARGS`."""
+    return cli.main([str(inputs), *BATCH_ARGS, "--output-dir", str(output_dir), *args])
+
+
+def test_main_transforms_every_file(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    write_export(tmp_path / "first.csv", ["GS1", "GS2", "GS3"])
+    write_export(tmp_path / "second.csv", ["GS4", "GS5"])
+    output_dir = tmp_path / "out"
+
+    code = run_batch(tmp_path, output_dir, "--exclude", "GS3")
+
+    assert code == 0
+    assert pd.read_csv(output_dir / "GS SGV2_first_transformed.csv")["serial_number"].tolist() == ["GS2"]
+    assert pd.read_csv(output_dir / "GS SGV2_second_transformed.csv")["serial_number"].tolist() == ["GS5"]
+    assert "Processed 2/2 files" in capsys.readouterr().out
+
+
+def test_main_exits_with_1_when_a_file_fails(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    write_export(tmp_path / "good.csv", ["GS1", "GS2"])
+    (tmp_path / "broken.csv").write_text("S/N,Remarks\nGS1,missing columns\n", encoding="utf-8")
+    output_dir = tmp_path / "out"
+
+    code = run_batch(tmp_path, output_dir)
+
+    assert code == 1
+    # The other files are still transformed
+    assert (output_dir / "GS SGV2_good_transformed.csv").exists()
+    assert "FAIL" in capsys.readouterr().err
+
+
+def test_main_reads_extensions_in_any_case(tmp_path: Path) -> None:
+    write_export(tmp_path / "REPORT.CSV", ["GS1", "GS2"])
+    output_dir = tmp_path / "out"
+
+    assert run_batch(tmp_path, output_dir) == 0
+    assert pd.read_csv(output_dir / "GS SGV2_REPORT_transformed.csv")["serial_number"].tolist() == ["GS2"]
+
+
+def test_main_fails_files_that_would_write_the_same_output(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        write_export(tmp_path / directory / "report.csv", ["GS1", "GS2"])
+    write_export(tmp_path / "a" / "other.csv", ["GS3", "GS4"])
+    output_dir = tmp_path / "out"
+
+    code = cli.main([str(tmp_path / "a"), str(tmp_path / "b"), *BATCH_ARGS, "--output-dir", str(output_dir)])
+
+    assert code == 1
+    # Neither colliding file is written, and the other files are still transformed
+    assert not (output_dir / "GS SGV2_report_transformed.csv").exists()
+    assert (output_dir / "GS SGV2_other_transformed.csv").exists()
+    assert capsys.readouterr().err.count("would also be written") == 2
+
+
+def test_main_fails_files_without_a_known_server(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    write_export(tmp_path / "report.csv", ["GS1", "GS2"])
+    manifest = tmp_path / "servers.csv"
+    manifest.write_text("file,server\nreport.csv,GS MARS\n", encoding="utf-8")
+
+    code = cli.main(
+        [str(tmp_path / "report.csv"), "--manifest", str(manifest), "--cutoff", CUTOFF, "--output-dir", str(tmp_path / "out")]
+    )
+
+    assert code == 1
+    assert "Unknown server 'GS MARS'" in capsys.readouterr().err
+
+
+def test_main_rejects_an_invalid_cutoff(tmp_path: Path) -> None:
+    write_export(tmp_path / "report.csv", ["GS1"])
+
+    assert cli.main([str(tmp_path), "--server", "GS SGV2", "--cutoff", "yesterday"]) == 1
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.core.datetimes import DatetimeParser, FormatCache, detect_format, parse_cutoff, parse_datetimes, to_timestamps
+
+
+def test_parse_cutoff_accepts_fractional_seconds() -> None:
+    assert parse_cutoff("2024-05-01 12:30:00") == datetime(2024, 5, 1, 12, 30)
+    assert parse_cutoff("2024-05-01 12:30:00.250000") == datetime(2024, 5, 1, 12, 30, 0, 250000)
+
+
+def test_parse_cutoff_rejects_other_layouts() -> None:
+    with pytest.raises(ValueError, match="Invalid cutoff"):
+        parse_cutoff("01/05/2024 12:30")
+
+
+def test_detect_format_picks_the_majority_layout() -> None:
+    values = pd.Series(["2024/05/01 10:00", "2024/05/02 11:30", "2024-05-03 09:00:00", None], dtype=object)
+
+    assert detect_format(values) == "%Y/%m/%d %H:%M"
+
+
+def test_parse_datetimes_caches_the_detected_format() -> None:
+    cache = FormatCache()
+    values = pd.Series(["01/05/2024 10:00:00", "02/05/2024 11:30:00"], dtype=object)
+
+    parsed = parse_datetimes(values, ("GS SGV2", "Task start time"), cache)
+
+    assert parsed.format == "%d/%m/%Y %H:%M:%S"
+    assert cache.get(("GS SGV2", "Task start time")) == parsed.format
+    assert parsed.values.tolist() == [pd.Timestamp("2024-05-01 10:00"), pd.Timestamp("2024-05-02 11:30")]
+
+
+def test_parse_datetimes_parses_minority_layouts_and_flags_invalid_cells() -> None:
+    values = pd.Series(["2024-05-01 10:00:00", "2024-05-02 11:00:00", "2024-05-03T12:00:00+08:00", "soon", None], dtype=object)
+
+    parsed = parse_datetimes(values, cache=FormatCache())
+
+    assert parsed.format == "%Y-%m-%d %H:%M:%S"
+    assert parsed.values.iloc[2] == pd.Timestamp("2024-05-03 12:00")
+    assert parsed.values.iloc[3:].isna().all()
+    assert parsed.invalid.tolist() == [False, False, False, True, False]
+
+
+def test_parse_datetimes_redetects_after_a_layout_change() -> None:
+    cache = FormatCache()
+    key = ("GS SGV2", "Receive task report time")
+    cache.set(key, "%Y-%m-%d %H:%M:%S")
+
+    parsed = parse_datetimes(pd.Series(["2024/05/01 10:00", "2024/05/01 10:05"], dtype=object), key, cache)
+
+    assert parsed.format == "%Y/%m/%d %H:%M"
+    assert cache.get(key) == "%Y/%m/%d %H:%M"
+    assert not parsed.invalid.any()
+
+
+def test_to_timestamps_reads_text_and_datetimes_only() -> None:
+    values = pd.Series(["2024-05-01 10:00:00", datetime(2024, 5, 2, 11, 0), 0, None], dtype=object)
+
+    timestamps = to_timestamps(values)
+
+    assert timestamps.iloc[:2].tolist() == [pd.Timestamp("2024-05-01 10:00"), pd.Timestamp("2024-05-02 11:00")]
+    # The 0 the "-" placeholder is written as is not a time
+    assert timestamps.iloc[2:].isna().all()
+
+
+def test_to_timestamps_returns_datetime_columns_unchanged() -> None:
+    values = pd.Series(pd.to_datetime(["2024-05-01 10:00:00"]))
+
+    assert to_timestamps(values) is values
+
+
+def test_datetime_parser_follows_the_layout_of_the_cells() -> None:
+    cache = FormatCache()
+    parser = DatetimeParser(("GS SGV2", "Task start time"), cache)
+
+    assert parser("2024-05-01 10:00:00") == datetime(2024, 5, 1, 10, 0)
+    assert parser("2024/05/01 10:05") == datetime(2024, 5, 1, 10, 5)
+    assert parser.format == "%Y/%m/%d %H:%M"
+    assert cache.get(("GS SGV2", "Task start time")) == "%Y/%m/%d %H:%M"
+
+
+def test_datetime_parser_handles_empty_and_unreadable_cells() -> None:
+    parser = DatetimeParser(cache=FormatCache())
+    timestamp = datetime(2024, 5, 1, 10, 0)
+
+    assert parser(timestamp) is timestamp
+    assert parser("") is None
+    assert parser(12.5) is None
+    assert parser("not a time") is None
+    # Unreadable cells are remembered, so they are not parsed again
+    assert parser._unmatched == {"not a time": None}
+    assert parser("not a time") is None
+    assert parser.format == "%Y-%m-%d %H:%M:%S"
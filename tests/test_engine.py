@@ -0,0 +1,23 @@
+import pandas as pd
+
+from src.core.engine import compile_profile, stamp_datetime_columns
+from src.core.profiles import get_profile
+
+
+def test_stamp_datetime_columns_rewrites_only_the_datetime_columns() -> None:
+    plan = compile_profile(get_profile("GS SGV2"))
+    df = pd.DataFrame(
+        {
+            "serial_number": ["GS1", "GS2"],
+            "created_at": ["2024-06-01 09:00:00"] * 2,
+            "updated_at": ["2024-06-01 09:00:00"] * 2,
+        }
+    )
+
+    df_stamped = stamp_datetime_columns(df, plan, "2024-06-02 10:00:00")
+
+    assert df_stamped["created_at"].tolist() == ["2024-06-02 10:00:00"] * 2
+    assert df_stamped["updated_at"].tolist() == ["2024-06-02 10:00:00"] * 2
+    # The input frame is left as it was, and the other columns are shared with it
+    assert df["created_at"].tolist() == ["2024-06-01 09:00:00"] * 2
+    assert df_stamped["serial_number"].tolist() == ["GS1", "GS2"]
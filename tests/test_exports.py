@@ -0,0 +1,138 @@
+import gzip
+import io
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from src import exports
+from src.exports import (
+    compress_clipboard_text,
+    gzip_uncompressed_size,
+    iter_clipboard_text,
+    iter_sql_script,
+    spool_sql_bytes,
+    to_clipboard_text,
+    to_excel_bytes,
+    to_sql_bytes,
+)
+
+
+def processed_frame() -> pd.DataFrame:
+    """Builds processed rows with text, missing values and numbers."""
+    return pd.DataFrame(
+        {
+            "robot_name": ["Robot, 1", "Robot 2", None],
+            "cleaning_area": [1.5, np.nan, 3.0],
+            "task_completion": [100, 50, 0],
+        }
+    )
+
+
+def test_iter_clipboard_text_chunks_join_to_the_full_text() -> None:
+    df = processed_frame()
+
+    chunks = list(iter_clipboard_text(df, batch_rows=2))
+
+    assert len(chunks) == 2
+    assert "".join(chunks) == to_clipboard_text(df)
+
+
+def test_compress_clipboard_text_round_trips_through_gzip() -> None:
+    df = processed_frame()
+
+    payload = compress_clipboard_text(df)
+
+    text = to_clipboard_text(df)
+    assert gzip.decompress(payload).decode("utf-8") == text
+    assert gzip_uncompressed_size(payload) == len(text.encode("utf-8"))
+
+
+def test_compress_clipboard_text_of_an_empty_frame() -> None:
+    payload = compress_clipboard_text(processed_frame().iloc[:0])
+
+    assert gzip.decompress(payload) == b""
+    assert gzip_uncompressed_size(payload) == 0
+
+
+def sql_frame() -> pd.DataFrame:
+    """Builds processed rows covering each kind of SQL literal."""
+    return pd.DataFrame(
+        {
+            "serial_number": pd.Categorical(["GS1", "GS2", "GS3"]),
+            "start_time": ["2024-05-01 10:00:00", "2024-05-01 11:00:00", 0],
+            "report_time": pd.to_datetime(["2024-05-01 12:00:00", None, "2024-05-01 13:00:00"]),
+            "cleaning_area": [1.5, np.nan, np.inf],
+            "plan_running_time": pd.Series([60, 120, 180], dtype="int64"),
+            "done": [True, False, True],
+            "remarks": pd.Series(["it's", "back\\slash", "NULL"], dtype=object),
+        }
+    )
+
+
+def test_iter_sql_script_renders_literals() -> None:
+    statements = list(iter_sql_script(sql_frame(), "reports", batch_rows=10))
+
+    assert statements == [
+        "INSERT INTO `reports` (`serial_number`, `start_time`, `report_time`, `cleaning_area`, `plan_running_time`, `done`, `remarks`) VALUES\n"
+        "('GS1', '2024-05-01 10:00:00', '2024-05-01 12:00:00', 1.5, 60, TRUE, 'it''s'),\n"
+        "('GS2', '2024-05-01 11:00:00', NULL, NULL, 120, FALSE, 'back\\\\slash'),\n"
+        "('GS3', '0', '2024-05-01 13:00:00', NULL, 180, TRUE, NULL);\n"
+    ]
+
+
+def test_iter_sql_script_splits_batches() -> None:
+    statements = list(iter_sql_script(sql_frame(), "reports", batch_rows=2))
+
+    assert len(statements) == 2
+    assert [statement.count("\n(") for statement in statements] == [2, 1]
+    assert all(statement.endswith(";\n") for statement in statements)
+
+
+def test_iter_sql_script_of_an_empty_frame_is_empty() -> None:
+    assert list(iter_sql_script(sql_frame().iloc[:0], "reports")) == []
+
+
+def test_to_sql_bytes_loads_into_sqlite() -> None:
+    df = sql_frame()[["serial_number", "cleaning_area", "plan_running_time"]]
+    script = to_sql_bytes(df, "reports", batch_rows=2).decode("utf-8")
+
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE reports (serial_number TEXT, cleaning_area REAL, plan_running_time INTEGER)")
+    connection.executescript(script.replace("`", '"'))
+
+    assert connection.execute("SELECT * FROM reports ORDER BY serial_number").fetchall() == [
+        ("GS1", 1.5, 60),
+        ("GS2", None, 120),
+        ("GS3", None, 180),
+    ]
+
+
+def test_spool_sql_bytes_matches_the_script_built_in_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    df = sql_frame()
+    expected = to_sql_bytes(df, "reports", batch_rows=2)
+
+    assert spool_sql_bytes(df, "reports", batch_rows=2) == expected
+    # Scripts larger than the spool are moved to a temporary file while they are written
+    monkeypatch.setattr(exports, "SQL_SPOOL_BYTES", 16)
+    assert spool_sql_bytes(df, "reports", batch_rows=2) == expected
+
+
+def test_to_excel_bytes_keeps_text_and_datetime_cells() -> None:
+    df = pd.DataFrame(
+        {
+            "start_time": pd.Series(["2024-05-01 10:00:00", datetime(2024, 5, 1, 11, 30)], dtype=object),
+            "cleaning_area": [1.5, np.nan],
+        }
+    )
+
+    worksheet = openpyxl.load_workbook(io.BytesIO(to_excel_bytes(df))).active
+
+    # Times read as text stay text; datetime cells of an uploaded Excel file stay dates
+    assert worksheet["A2"].value == "2024-05-01 10:00:00"
+    assert worksheet["A3"].value == datetime(2024, 5, 1, 11, 30)
+    assert worksheet["A3"].number_format == "yyyy-mm-dd hh:mm:ss"
+    assert worksheet["B2"].value == 1.5
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.fingerprints import DEFAULT_ERROR_RATE, BloomFilter, FingerprintIndex, row_fingerprints
+
+
+def processed_frame(serial_numbers: list, start_times: list) -> pd.DataFrame:
+    """Builds processed task reports on the same task and map."""
+    return pd.DataFrame(
+        {
+            "serial_number": serial_numbers,
+            "start_time": pd.Series(start_times, dtype=object),
+            "task_name": "Plan 1",
+            "map_name": "Map 1",
+            "cleaning_area": np.arange(len(serial_numbers), dtype="float64"),
+        }
+    )
+
+
+def test_row_fingerprints_ignore_time_layout_and_categoricals() -> None:
+    text = processed_frame(["GS1", "GS2"], ["2024-05-01 10:00:00", "2024-05-01 11:00:00"])
+    other = processed_frame(["GS1", "GS2"], ["2024/05/01 10:00", pd.Timestamp("2024-05-01 11:00")])
+    other["serial_number"] = other["serial_number"].astype("category")
+
+    fingerprints = row_fingerprints(text)
+
+    assert fingerprints.dtype == np.int64
+    assert fingerprints[0] != fingerprints[1]
+    assert row_fingerprints(other).tolist() == fingerprints.tolist()
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1_000)
+    added = np.random.default_rng(0).integers(np.iinfo(np.int64).min, np.iinfo(np.int64).max, 1_000, dtype=np.int64)
+
+    bloom.add(added)
+
+    assert bloom.might_contain(added).all()
+
+
+def test_bloom_filter_round_trips_through_bytes() -> None:
+    bloom = BloomFilter(capacity=100)
+    bloom.add(np.array([1, 2, 3], dtype=np.int64))
+
+    restored = BloomFilter.from_bytes(bloom.to_bytes(), 100, DEFAULT_ERROR_RATE)
+
+    assert restored.might_contain(np.array([1, 2, 3], dtype=np.int64)).all()
+    with pytest.raises(ValueError, match="Expected"):
+        BloomFilter.from_bytes(bloom.to_bytes(), 10_000, DEFAULT_ERROR_RATE)
+
+
+def test_index_drops_reports_already_loaded(tmp_path: Path) -> None:
+    index = FingerprintIndex(str(tmp_path / "state.db"))
+    loaded = processed_frame(["GS1", "GS2"], ["2024-05-01 10:00:00", "2024-05-01 11:00:00"])
+
+    assert index.record_loaded(loaded, "GS SGV2").tolist() == [True, True]
+    assert index.record_loaded(loaded, "GS SGV2").tolist() == [False, False]
+    assert len(index) == 2
+
+    upload = processed_frame(["GS3", "GS1", "GS2"], ["2024-05-01 12:00:00", "2024/05/01 10:00", "2024-05-01 11:00:00"])
+    remaining = index.drop_loaded(upload)
+
+    assert remaining["serial_number"].tolist() == ["GS3"]
+    assert remaining.attrs["already_loaded_rows"] == 2
+
+
+def test_index_sees_fingerprints_stored_by_another_instance(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.db")
+    index = FingerprintIndex(path)
+    df = processed_frame(["GS1"], ["2024-05-01 10:00:00"])
+    assert not index.contains(row_fingerprints(df)).any()
+
+    FingerprintIndex(path).record_loaded(df, "GS SGV2")
+
+    assert index.contains(row_fingerprints(df)).all()
+    assert FingerprintIndex(path).drop_loaded(df).empty
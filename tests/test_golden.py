@@ -0,0 +1,43 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from src.exports import frame_to_csv
+from src.core.profiles import SERVER_PROFILES
+from src.core.transform import process_uploaded_file
+
+# Exports written by `benchmarks/generate.py --rows 100 --baseline-compatible` and the output of the
+# pre-series transform for each server, written with `to_csv(index=False)` from these arguments
+GOLDEN_DIR = Path(__file__).parent / "golden"
+CUTOFF = "2024-05-10 00:00:00"
+ADJUSTED_DATETIME = "2024-06-01 09:00:00"
+EXCLUDED = ["GS000003"]
+
+# Export of each server's schema; the US server exports imperial units
+SERVER_EXPORTS = {
+    "GS SGV1": "metric_export.csv",
+    "GS SGV2": "metric_export.csv",
+    "GS AUS": "metric_export.csv",
+    "GS QA": "metric_export.csv",
+    "GS CA": "imperial_export.csv",
+}
+
+
+def golden_name(server: str) -> str:
+    """Returns the file name of a server's expected output, e.g. gs_sgv1.csv."""
+    return server.lower().replace(" ", "_") + ".csv"
+
+
+def test_every_server_has_a_golden_file() -> None:
+    assert sorted(SERVER_EXPORTS) == sorted(SERVER_PROFILES)
+
+
+@pytest.mark.parametrize("server", list(SERVER_EXPORTS))
+def test_output_matches_the_pre_series_transform(server: str) -> None:
+    file = io.BytesIO((GOLDEN_DIR / SERVER_EXPORTS[server]).read_bytes())
+    file.name = SERVER_EXPORTS[server]
+
+    df = process_uploaded_file(file, CUTOFF, ADJUSTED_DATETIME, server, EXCLUDED)
+
+    assert frame_to_csv(df) == (GOLDEN_DIR / golden_name(server)).read_text(encoding="utf-8")
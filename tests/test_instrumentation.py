@@ -0,0 +1,84 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+import pandas as pd
+import pytest
+
+from src.core.instrumentation import StageRecord, instrumented, records_to_frame, recording, stage
+
+
+@instrumented("drop_first")
+def drop_first(df: pd.DataFrame) -> pd.DataFrame:
+    """Drops the first row, as a stage."""
+    return df.iloc[1:]
+
+
+def test_instrumented_records_the_rows_in_and_out() -> None:
+    with recording() as recorder:
+        drop_first(pd.DataFrame({"value": [1, 2, 3]}))
+
+    [record] = recorder.records
+    assert (record.stage, record.rows_in, record.rows_out, record.peak_bytes) == ("drop_first", 3, 2, None)
+    assert record.seconds >= 0
+
+
+def test_instrumented_records_nothing_without_a_recorder() -> None:
+    records: list = []
+    with recording(records=records):
+        pass
+
+    df = drop_first(pd.DataFrame({"value": [1, 2]}))
+
+    assert df["value"].tolist() == [2]
+    assert records == []
+
+
+def test_nested_stages_hand_their_peak_memory_to_the_enclosing_stage() -> None:
+    with recording(track_memory=True) as recorder:
+        with stage("outer", rows_in=1):
+            with stage("inner") as inner:
+                block = bytearray(4 * 1024 * 1024)
+                inner.rows_out = len(block)
+            del block
+
+    inner_record, outer_record = recorder.records
+    assert (inner_record.stage, outer_record.stage) == ("inner", "outer")
+    assert inner_record.rows_out == 4 * 1024 * 1024
+    assert inner_record.peak_bytes is not None and inner_record.peak_bytes >= 4 * 1024 * 1024
+    assert outer_record.peak_bytes is not None and outer_record.peak_bytes >= inner_record.peak_bytes
+
+
+def test_stages_in_threads_started_with_copy_context_are_recorded() -> None:
+    with recording() as recorder:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(copy_context().run, drop_first, pd.DataFrame({"value": range(size)})) for size in (2, 3)]
+            for future in futures:
+                future.result()
+
+    assert sorted(record.rows_in for record in recorder.records) == [2, 3]
+
+
+def test_recording_logs_each_stage_with_its_labels(caplog: pytest.LogCaptureFixture) -> None:
+    records: list = [StageRecord("earlier", 1.0, None, None, None)]
+
+    with caplog.at_level(logging.INFO, logger="gs_transformation.stages"):
+        with recording(labels={"server": "GS SGV2"}, records=records) as recorder:
+            with stage("read"):
+                pass
+
+    # Records are appended to the list kept across runs
+    assert [record.stage for record in records] == ["earlier", "read"]
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["event"] == "stage"
+    assert line["run_id"] == recorder.run_id
+    assert (line["server"], line["stage"]) == ("GS SGV2", "read")
+
+
+def test_records_to_frame_converts_the_peak_memory_to_mib() -> None:
+    df = records_to_frame([StageRecord("read", 0.5, None, 10, 2 * 1024 * 1024), StageRecord("write", 0.1, 10, None, None)])
+
+    assert df.columns.tolist() == ["stage", "seconds", "rows_in", "rows_out", "peak_mib"]
+    assert df["rows_in"].tolist() == [pd.NA, 10]
+    assert df["peak_mib"].tolist() == [2.0, pd.NA]
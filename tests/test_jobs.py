@@ -0,0 +1,104 @@
+import threading
+from typing import Iterator
+
+import pytest
+
+from src.core.jobs import JobManager, JobQueueFull, checkpoint
+
+# Seconds a test waits for a job thread before failing
+TIMEOUT = 5
+
+
+@pytest.fixture
+def manager() -> Iterator[JobManager[str]]:
+    job_manager: JobManager[str] = JobManager(max_workers=1, max_pending=2)
+    yield job_manager
+    job_manager._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def blocking(started: threading.Event, release: threading.Event) -> str:
+    """Reports a first checkpoint, waits to be released, then reports a second one."""
+    checkpoint("Reading", 0.5)
+    started.set()
+    assert release.wait(TIMEOUT)
+    checkpoint("Reading", 1.0)
+    return "done"
+
+
+def test_submit_attaches_to_the_running_job_of_the_same_key(manager: JobManager[str]) -> None:
+    started, release = threading.Event(), threading.Event()
+
+    first = manager.submit("key", lambda: blocking(started, release))
+    assert started.wait(TIMEOUT)
+    second = manager.submit("key", lambda: "other")
+    release.set()
+
+    assert second is first
+    assert first.future.result(TIMEOUT) == "done"
+    # A finished job is replaced by a new one
+    assert manager.submit("key", lambda: "again").future.result(TIMEOUT) == "again"
+
+
+def test_submit_refuses_jobs_beyond_max_pending(manager: JobManager[str]) -> None:
+    started, release = threading.Event(), threading.Event()
+    running = manager.submit("running", lambda: blocking(started, release))
+    queued = manager.submit("queued", lambda: "queued")
+    assert started.wait(TIMEOUT)
+
+    with pytest.raises(JobQueueFull):
+        manager.submit("third", lambda: "third")
+
+    assert (running.state, queued.state) == ("running", "queued")
+    release.set()
+    assert queued.future.result(TIMEOUT) == "queued"
+
+
+def test_checkpoint_reports_the_progress_of_the_job(manager: JobManager[str]) -> None:
+    started, release = threading.Event(), threading.Event()
+    job = manager.submit("key", lambda: blocking(started, release))
+    assert started.wait(TIMEOUT)
+
+    assert job.progress.snapshot() == {"Reading": 0.5}
+    release.set()
+    job.future.result(TIMEOUT)
+    assert job.progress.snapshot() == {"Reading": 1.0}
+
+
+def test_cancel_stops_a_running_job_at_its_next_checkpoint(manager: JobManager[str]) -> None:
+    started, release = threading.Event(), threading.Event()
+    job = manager.submit("key", lambda: blocking(started, release))
+    assert started.wait(TIMEOUT)
+
+    job.cancel()
+    release.set()
+
+    assert job.future.exception(TIMEOUT) is not None
+    assert job.state == "cancelled"
+
+
+def test_cancel_drops_a_queued_job(manager: JobManager[str]) -> None:
+    started, release = threading.Event(), threading.Event()
+    manager.submit("running", lambda: blocking(started, release))
+    queued = manager.submit("queued", lambda: "queued")
+
+    queued.cancel()
+    release.set()
+
+    assert queued.future.cancelled()
+    assert queued.state == "cancelled"
+
+
+def test_failed_jobs_keep_their_error(manager: JobManager[str]) -> None:
+    def fail() -> str:
+        raise ValueError("broken export")
+
+    job = manager.submit("key", fail)
+
+    assert isinstance(job.future.exception(TIMEOUT), ValueError)
+    assert job.state == "failed"
+    with pytest.raises(ValueError, match="broken export"):
+        job.result()
+
+
+def test_checkpoint_does_nothing_outside_a_job() -> None:
+    checkpoint("Reading", 0.5)
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import DateTime, Engine, String, create_engine, inspect, text
+
+from src.loader import build_url, load_frame
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Engine:
+    return create_engine(build_url("sqlite", str(tmp_path / "reports.db")))
+
+
+def processed_frame(cleaning_areas: list) -> pd.DataFrame:
+    """Builds processed task reports of one robot, one per hour."""
+    return pd.DataFrame(
+        {
+            "serial_number": pd.Categorical(["GS1"] * len(cleaning_areas)),
+            "start_time": [f"2024-05-01 {10 + hour:02d}:00:00" for hour in range(len(cleaning_areas))],
+            "cleaning_area": pd.Series(cleaning_areas, dtype="float64"),
+            "remarks": pd.Series(["NULL", "ok", None][: len(cleaning_areas)], dtype=object),
+        }
+    )
+
+
+def test_load_frame_appends_in_batches(engine: Engine) -> None:
+    progress = []
+
+    result = load_frame(
+        processed_frame([1.0, np.nan, 3.0]),
+        engine,
+        "reports",
+        batch_rows=2,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert result.rows == 3
+    assert progress == [(2, 3), (3, 3)]
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text("SELECT serial_number, start_time, cleaning_area, remarks FROM reports ORDER BY start_time")
+        ).all()
+    # Missing values and the "NULL" sentinel are loaded as real NULLs
+    assert [tuple(row) for row in rows] == [
+        ("GS1", "2024-05-01 10:00:00", 1.0, None),
+        ("GS1", "2024-05-01 11:00:00", None, "ok"),
+        ("GS1", "2024-05-01 12:00:00", 3.0, None),
+    ]
+
+
+def test_load_frame_upserts_on_the_key_columns(engine: Engine) -> None:
+    load_frame(processed_frame([1.0, 2.0]), engine, "reports", mode="upsert")
+
+    load_frame(processed_frame([5.0, 6.0, 7.0]), engine, "reports", mode="upsert")
+
+    with engine.connect() as connection:
+        areas = connection.execute(text("SELECT cleaning_area FROM reports ORDER BY start_time")).scalars().all()
+    assert areas == [5.0, 6.0, 7.0]
+    # MySQL only indexes bounded text, so the text key columns are created as VARCHAR
+    key_types = {column["name"]: column["type"] for column in inspect(engine).get_columns("reports")}
+    assert isinstance(key_types["start_time"], String) and key_types["start_time"].length == 255
+
+
+def test_load_frame_parses_times_for_datetime_columns(engine: Engine) -> None:
+    existing = processed_frame([1.0]).assign(start_time=pd.to_datetime(["2024-05-01 09:00:00"]))
+    load_frame(existing, engine, "reports")
+    assert isinstance(
+        next(column for column in inspect(engine).get_columns("reports") if column["name"] == "start_time")["type"], DateTime
+    )
+
+    load_frame(processed_frame([2.0]), engine, "reports")
+
+    with engine.connect() as connection:
+        start_times = connection.execute(text("SELECT start_time FROM reports ORDER BY start_time")).scalars().all()
+    assert start_times == ["2024-05-01 09:00:00.000000", "2024-05-01 10:00:00.000000"]
+
+
+def test_load_frame_rejects_unknown_modes(engine: Engine) -> None:
+    with pytest.raises(ValueError, match="Unknown load mode"):
+        load_frame(processed_frame([1.0]), engine, "reports", mode="replace")
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from src.core.numeric import coerce_numeric
+
+
+def test_coerce_numeric_parses_text_cells() -> None:
+    result = coerce_numeric(pd.Series(["1,234.50", "-", "85%", 12.0, " 7 "], dtype=object))
+
+    assert result.values.dtype == "float64"
+    assert result.values.tolist() == [1234.5, 0.0, 85.0, 12.0, 7.0]
+    assert not result.invalid.any()
+
+
+def test_coerce_numeric_flags_unparseable_cells() -> None:
+    result = coerce_numeric(pd.Series(["12", "unknown", None, np.nan], dtype=object))
+
+    assert result.values.iloc[0] == 12.0
+    assert result.values.iloc[1:].isna().all()
+    # Missing cells are not numbers, but they are not invalid either
+    assert result.invalid.tolist() == [False, True, False, False]
+
+
+def test_coerce_numeric_keeps_numeric_columns() -> None:
+    integers = pd.Series([1, 2, 3])
+
+    result = coerce_numeric(integers)
+
+    assert result.values is integers
+    assert not result.invalid.any()
+
+
+def test_coerce_numeric_parses_boolean_columns() -> None:
+    result = coerce_numeric(pd.Series([True, False]))
+
+    assert result.values.dtype == "float64"
+    assert result.values.tolist() == [1.0, 0.0]
@@ -0,0 +1,78 @@
+from typing import Callable
+
+import pandas as pd
+import pytest
+
+from check_parity import EXCLUDED, compare_frames
+from generate import START_DATETIME, UNITS, export_columns, generate_export
+from run_benchmarks import NamedBytesIO
+from src.core.engine import SORT_COLUMN, compile_profile
+from src.core.profiles import get_profile
+from src.core.schema import matching_servers
+from src.core.transform import calculate_adjusted_datetime, process_uploaded_file
+
+# Every server whose columns match an export schema, with that schema
+SERVERS = [(unit, server) for unit in UNITS for server in matching_servers(export_columns(unit))]
+
+# Cutoff halfway through the generated reports, so the filter drops rows
+CUTOFF = (pd.Timestamp(START_DATETIME) + pd.Timedelta(days=15)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@pytest.mark.parametrize("engine", ["duckdb", "polars"])
+@pytest.mark.parametrize("unit, server", SERVERS)
+def test_engine_matches_pandas(export_bytes: Callable[[str, str], bytes], unit: str, server: str, engine: str) -> None:
+    pytest.importorskip(engine)
+    content = export_bytes(unit, "csv")
+    adjusted_datetime = calculate_adjusted_datetime(server)
+    report_column = next(step.target for step in compile_profile(get_profile(server)).steps if step.source == SORT_COLUMN)
+
+    outputs = {
+        name: process_uploaded_file(
+            NamedBytesIO(content, f"{unit}.csv"), CUTOFF, adjusted_datetime, server, EXCLUDED, engine=name
+        )
+        for name in ("pandas", engine)
+    }
+
+    assert len(outputs["pandas"]) > 0
+    assert compare_frames(outputs["pandas"], outputs[engine], report_column) == []
+
+
+@pytest.mark.parametrize("unit, server", SERVERS)
+def test_excel_matches_csv(export_bytes: Callable[[str, str], bytes], unit: str, server: str) -> None:
+    adjusted_datetime = calculate_adjusted_datetime(server)
+    report_column = next(step.target for step in compile_profile(get_profile(server)).steps if step.source == SORT_COLUMN)
+
+    outputs = {
+        file_format: process_uploaded_file(
+            NamedBytesIO(export_bytes(unit, file_format), f"{unit}.{file_format}"),
+            CUTOFF,
+            adjusted_datetime,
+            server,
+            EXCLUDED,
+            engine="pandas",
+        )
+        for file_format in ("csv", "xlsx")
+    }
+
+    assert compare_frames(outputs["csv"], outputs["xlsx"], report_column) == []
+
+
+@pytest.mark.parametrize("engine", ["duckdb", "polars"])
+def test_engine_infers_dtypes_over_the_rows_filtered_out(engine: str) -> None:
+    pytest.importorskip(engine)
+    export = generate_export(200, "metric")
+    # A text cell in the oldest report keeps the column as text in every surviving row
+    export.loc[export[SORT_COLUMN].idxmin(), "End battery level (%)"] = "unknown"
+    content = export.to_csv(index=False).encode()
+    adjusted_datetime = calculate_adjusted_datetime("GS SGV2")
+    report_column = next(step.target for step in compile_profile(get_profile("GS SGV2")).steps if step.source == SORT_COLUMN)
+
+    outputs = {
+        name: process_uploaded_file(
+            NamedBytesIO(content, "metric.csv"), CUTOFF, adjusted_datetime, "GS SGV2", EXCLUDED, engine=name
+        )
+        for name in ("pandas", engine)
+    }
+
+    assert outputs["pandas"]["end_battery_level"].dtype == object
+    assert compare_frames(outputs["pandas"], outputs[engine], report_column) == []
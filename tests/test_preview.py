@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from src.preview import matching_positions, page_count, preview_page, select_rows
+
+
+def processed_frame() -> pd.DataFrame:
+    """Builds processed rows of three robots, the serial numbers as a categorical column."""
+    return pd.DataFrame(
+        {
+            "serial_number": pd.Categorical(["GS-A1", "gs-b2", "GS-A3", None, "GS-B4"]),
+            "robot_name": ["Lobby", "Hall", None, "lobby 2", "Hall"],
+            "cleaning_area": [3.0, 1.0, np.nan, 2.0, 5.0],
+        }
+    )
+
+
+def test_matching_positions_ignores_case_in_categoricals_and_text() -> None:
+    df = processed_frame()
+
+    assert matching_positions(df["serial_number"], "gs-b").tolist() == [1, 4]
+    # Missing values never match
+    assert matching_positions(df["robot_name"], "LOBBY").tolist() == [0, 3]
+
+
+def test_matching_positions_treats_the_query_as_plain_text() -> None:
+    df = pd.DataFrame({"robot_name": ["Robot (1)", "Robot 1"]})
+
+    assert matching_positions(df["robot_name"], "(1)").tolist() == [0]
+
+
+def test_select_rows_filters_then_sorts_with_missing_values_last() -> None:
+    df = processed_frame()
+
+    assert select_rows(df).tolist() == [0, 1, 2, 3, 4]
+    assert select_rows(df, "serial_number", " gs-a ").tolist() == [0, 2]
+    assert select_rows(df, sort_column="cleaning_area").tolist() == [1, 3, 0, 4, 2]
+    assert select_rows(df, "serial_number", "GS", sort_column="cleaning_area", ascending=False).tolist() == [4, 0, 1, 2]
+
+
+def test_page_count_is_at_least_one() -> None:
+    assert page_count(0, page_rows=2) == 1
+    assert page_count(4, page_rows=2) == 2
+    assert page_count(5, page_rows=2) == 3
+
+
+def test_preview_page_takes_the_rows_of_one_page() -> None:
+    df = processed_frame()
+    positions = select_rows(df, sort_column="cleaning_area")
+
+    page = preview_page(df, positions, 2, page_rows=2)
+
+    assert page["cleaning_area"].tolist() == [3.0, 5.0]
+    # The index keeps the row numbers of the processed frame
+    assert page.index.tolist() == [0, 4]
+    # Pages out of range are clamped to the first and last page
+    assert preview_page(df, positions, 9, page_rows=2).index.tolist() == [2]
+    assert preview_page(df, positions, 0, page_rows=2).index.tolist() == [1, 3]
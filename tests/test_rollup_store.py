@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pandas as pd
+
+from src.core.rollups import ROLLUP_KEYS, ROLLUP_VALUES
+from src.rollup_store import RollupStore
+
+
+def rollups(rows: list) -> pd.DataFrame:
+    """Builds rollups of GS SGV2 from (day, serial number, task count, cleaning area) rows."""
+    return pd.DataFrame(
+        [
+            {
+                "day": day,
+                "server": "GS SGV2",
+                "serial_number": serial_number,
+                "map_name": "Lobby",
+                "task_count": count,
+                "cleaning_area": area,
+                "water_usage": 1.0,
+                "total_time": 0.5,
+                "performance_sum": 80.0,
+                "performance_count": 1,
+            }
+            for day, serial_number, count, area in rows
+        ],
+        columns=list(ROLLUP_KEYS + ROLLUP_VALUES),
+    )
+
+
+def test_merge_adds_to_the_stored_totals_of_the_same_key(tmp_path: Path) -> None:
+    store = RollupStore(str(tmp_path / "state.db"))
+
+    assert store.merge(rollups([("2024-05-01", "GS1", 2, 4.0), ("2024-05-01", "GS2", 1, 1.0)])) == 2
+    store.merge(rollups([("2024-05-01", "GS1", 1, 0.5), ("2024-05-02", "GS1", 3, 6.0)]))
+
+    stored = store.read()
+    assert stored[["day", "serial_number", "task_count", "cleaning_area", "performance_count"]].values.tolist() == [
+        ["2024-05-01", "GS1", 3, 4.5, 2],
+        ["2024-05-01", "GS2", 1, 1.0, 1],
+        ["2024-05-02", "GS1", 3, 6.0, 1],
+    ]
+
+
+def test_read_filters_by_server_and_day(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.db")
+    RollupStore(path).merge(rollups([("2024-05-01", "GS1", 1, 1.0), ("2024-05-02", "GS1", 1, 1.0)]))
+    store = RollupStore(path)
+
+    assert store.read(days=["2024-05-02"])["day"].tolist() == ["2024-05-02"]
+    assert store.read(server="GS CA").empty
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from src.core.rollups import ROLLUP_KEYS, ROLLUP_VALUES, daily_rollups, rollup_report
+
+
+def processed_frame() -> pd.DataFrame:
+    """Builds processed task reports of two robots over two days, with start times kept as read."""
+    return pd.DataFrame(
+        {
+            "serial_number": pd.Categorical(["GS1", "GS1", "GS2", "GS1", "GS3"]),
+            "map_name": pd.Categorical(["Lobby", "Lobby", "Lobby", "Hall", None]),
+            "start_time": pd.Series(
+                ["2024-05-01 10:00:00", "2024/05/01 23:30", "2024-05-01 11:00:00", "2024-05-02 08:00:00", "2024-05-02 09:00:00"],
+                dtype=object,
+            ),
+            "cleaning_area": [1.5, 2.5, 4.0, 1.0, 9.0],
+            "water_usage": ["1,000.5", "-", "2", "3", "4"],
+            "total_time": [0.5, 0.25, 1.0, 2.0, 3.0],
+            "performance": ["80%", None, "90", "70", "60"],
+        }
+    )
+
+
+def test_daily_rollups_sum_each_day_robot_and_map() -> None:
+    rollups = daily_rollups(processed_frame(), "GS SGV2")
+
+    assert rollups.columns.tolist() == list(ROLLUP_KEYS + ROLLUP_VALUES)
+    # Rows without a map are left out, and only the combinations that occur are kept
+    assert rollups[["day", "serial_number", "map_name"]].values.tolist() == [
+        ["2024-05-01", "GS1", "Lobby"],
+        ["2024-05-01", "GS2", "Lobby"],
+        ["2024-05-02", "GS1", "Hall"],
+    ]
+    assert (rollups["server"] == "GS SGV2").all()
+    first = rollups.iloc[0]
+    assert (first["task_count"], first["cleaning_area"], first["water_usage"], first["total_time"]) == (2, 4.0, 1000.5, 0.75)
+    # Work efficiency is kept as a sum and a count of the cells that are not empty
+    assert (first["performance_sum"], first["performance_count"]) == (80.0, 1)
+
+
+def test_rollup_report_replaces_the_sum_and_count_by_their_mean() -> None:
+    rollups = daily_rollups(processed_frame(), "GS SGV2")
+    rollups.loc[0, ["performance_sum", "performance_count"]] = [0.0, 0]
+    rollups.loc[1, ["performance_sum", "performance_count"]] = [200.0, 3]
+
+    report = rollup_report(rollups)
+
+    assert "performance_sum" not in report.columns
+    assert np.isnan(report.loc[0, "mean_performance"])
+    assert report.loc[1, "mean_performance"] == 66.6667
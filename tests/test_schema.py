@@ -0,0 +1,108 @@
+import io
+from typing import Callable, List
+
+import openpyxl
+import pytest
+import xlsxwriter
+
+from src.core.profiles import get_profile, imperial_columns, metric_columns
+from src.core.schema import (
+    SchemaMismatchError,
+    check_schema,
+    file_extension,
+    read_excel_header,
+    read_header,
+    suggest_server,
+)
+
+
+def csv_file(columns: List[str], name: str = "report.csv") -> io.BytesIO:
+    """Builds an uploaded CSV file with the given header and one row."""
+    file = io.BytesIO((",".join(columns) + "\n" + ",".join("1" for _ in columns) + "\n").encode())
+    file.name = name
+    return file
+
+
+def shared_strings_file(header: list) -> io.BytesIO:
+    """Writes the header to an .xlsx file with openpyxl, which stores text as shared strings."""
+    workbook = openpyxl.Workbook()
+    workbook.active.append(header)
+    workbook.active.append(["GS1"] * len(header))
+    file = io.BytesIO()
+    workbook.save(file)
+    file.seek(0)
+    file.name = "report.xlsx"
+    return file
+
+
+def inline_strings_file(header: list) -> io.BytesIO:
+    """Writes the header to an .xlsx file in constant memory mode, which stores text as inline strings."""
+    file = io.BytesIO()
+    workbook = xlsxwriter.Workbook(file, {"constant_memory": True, "in_memory": True})
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, header)
+    worksheet.write_row(1, 0, ["GS1"] * len(header))
+    workbook.close()
+    file.seek(0)
+    file.name = "report.xlsx"
+    return file
+
+
+@pytest.mark.parametrize("build", [shared_strings_file, inline_strings_file], ids=["shared", "inline"])
+def test_read_excel_header_reads_the_first_row(build: Callable[[list], io.BytesIO]) -> None:
+    assert read_excel_header(build(list(metric_columns))) == list(metric_columns)
+
+
+def test_read_excel_header_keeps_the_position_of_empty_cells() -> None:
+    file = shared_strings_file(["S/N", None, "Remarks"])
+
+    assert read_excel_header(file) == ["S/N", "", "Remarks"]
+
+
+def test_read_header_rewinds_the_file() -> None:
+    file = csv_file(list(metric_columns))
+
+    assert read_header(file) == list(metric_columns)
+    assert file.tell() == 0
+    assert read_header(csv_file(["S/N"], "report.json")) is None
+    # Extensions are matched in any case
+    assert read_header(csv_file(["S/N"], "REPORT.CSV")) == ["S/N"]
+
+
+def test_file_extension_is_lower_case() -> None:
+    assert file_extension("exports/REPORT.Xlsx") == ".xlsx"
+    assert file_extension("exports.d/report") == ""
+
+
+def test_check_schema_accepts_a_matching_file() -> None:
+    check_schema(csv_file(list(metric_columns)), get_profile("GS SGV2"))
+
+
+def test_check_schema_reports_the_detected_unit_and_matching_servers() -> None:
+    with pytest.raises(SchemaMismatchError) as error:
+        check_schema(csv_file(list(imperial_columns), "us.csv"), get_profile("GS SGV2"))
+
+    report = error.value.report
+    assert (report.file_name, report.server, report.unit, report.servers) == ("us.csv", "GS SGV2", "imperial", ("GS CA",))
+    assert "Water usage (L)" in report.missing
+    assert str(error.value).startswith("us.csv: imperial export (ft², gal) that does not match GS SGV2.")
+
+
+def test_suggest_server_switches_to_the_only_matching_server() -> None:
+    suggestion, mismatches = suggest_server([csv_file(list(imperial_columns))], "GS SGV2")
+
+    assert suggestion == "GS CA"
+    assert [report.server for report in mismatches] == ["GS SGV2"]
+
+
+def test_suggest_server_keeps_a_matching_selection() -> None:
+    assert suggest_server([csv_file(list(metric_columns))], "GS QA") == (None, [])
+
+
+def test_suggest_server_suggests_nothing_when_the_files_disagree() -> None:
+    files = [csv_file(list(metric_columns), "sg.csv"), csv_file(list(imperial_columns), "us.csv")]
+
+    suggestion, mismatches = suggest_server(files, "GS SGV1")
+
+    assert suggestion is None
+    assert [report.file_name for report in mismatches] == ["us.csv"]
@@ -0,0 +1,225 @@
+import io
+from datetime import datetime
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from src.core.profiles import metric_profile
+from src.core.transform import (
+    dedup_keys,
+    filter_report_rows,
+    process_uploaded_files,
+    read_csv_filtered,
+    read_excel_filtered,
+    read_filtered_file,
+)
+
+# Cutoff of the filter tests; the report at exactly this time is dropped
+CUTOFF = datetime(2024, 5, 1, 12, 0)
+
+# Export of five reports, one per serial number, in no particular order
+CSV_TEXT = """S/N,Receive task report time,Cleaning area,Task completion (%)
+GS0,2024-05-01 11:00:00,10,50%
+GS1,2024-05-01 13:00:00,11,60%
+GS2,2024-05-01 12:00:00,12,70%
+GS3,2024-05-01 14:00:00,13,80%
+GS4,2024-05-01 12:00:01,14,90%
+"""
+
+
+def csv_file(text: str = CSV_TEXT) -> io.BytesIO:
+    """Wraps CSV text as an uploaded .csv file."""
+    file = io.BytesIO(text.encode())
+    file.name = "report.csv"
+    return file
+
+
+def excel_file(rows: list) -> io.BytesIO:
+    """Writes a header and the given rows to the first sheet of an uploaded .xlsx file."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["S/N", "Receive task report time", "Cleaning area", "Remarks"])
+    for row in rows:
+        sheet.append(row)
+    file = io.BytesIO()
+    workbook.save(file)
+    file.seek(0)
+    file.name = "report.xlsx"
+    return file
+
+
+def metric_export(name: str, reports: list) -> io.BytesIO:
+    """Builds an uploaded metric export of (serial number, start time, report time) reports, every other cell 1."""
+    df = pd.DataFrame(dict.fromkeys(metric_profile.columns, "1"), index=range(len(reports)))
+    df["S/N"], df["Task start time"], df["Receive task report time"] = zip(*reports)
+    file = io.BytesIO(df.to_csv(index=False).encode())
+    file.name = name
+    return file
+
+
+# Sheet rows with report times as datetime cells and as text, one of them cut short before its last cells
+EXCEL_ROWS = [
+    ["GS0", datetime(2024, 5, 1, 11, 0), 10.0, "old"],
+    ["GS1", datetime(2024, 5, 1, 13, 0), 11.0, "new"],
+    ["GS2", "2024-05-01 12:00:00", 12.0, "cutoff"],
+    ["GS3", "2024-05-01 14:00:00", 13.0],
+    ["GS4", None, 14.0, "no report time"],
+]
+
+
+def test_read_csv_filtered_keeps_reports_after_the_cutoff() -> None:
+    df = read_csv_filtered(csv_file(), CUTOFF, chunksize=2)
+
+    assert df["S/N"].tolist() == ["GS1", "GS3", "GS4"]
+    assert (df["Receive task report time"] > CUTOFF).all()
+    assert df.index.tolist() == [0, 1, 2]
+
+
+def test_read_csv_filtered_excludes_serial_numbers() -> None:
+    df = read_csv_filtered(csv_file(), CUTOFF, ["GS3"], chunksize=2)
+
+    assert df["S/N"].tolist() == ["GS1", "GS4"]
+
+
+def test_read_csv_filtered_restores_numeric_columns() -> None:
+    df = read_csv_filtered(csv_file(), CUTOFF, chunksize=2)
+
+    # Chunks are read as text; columns holding only numbers are converted back as a single read would
+    assert df["Cleaning area"].dtype == "int64"
+    assert df["Cleaning area"].tolist() == [11, 13, 14]
+    assert df["Task completion (%)"].tolist() == ["60%", "80%", "90%"]
+
+
+def test_read_csv_filtered_infers_numeric_columns_over_every_row_read() -> None:
+    text = CSV_TEXT.replace("GS0,2024-05-01 11:00:00,10,", "GS0,2024-05-01 11:00:00,unknown,").replace(",11,60%", ",4.30,60%")
+
+    df = read_csv_filtered(csv_file(text), CUTOFF, chunksize=2)
+
+    # The text cell of a dropped row keeps the column as text, as in a single read
+    assert df["Cleaning area"].tolist() == ["4.30", "13", "14"]
+    assert (
+        read_csv_filtered(csv_file(CSV_TEXT.replace(",10,", ",10.5,")), CUTOFF, chunksize=2)["Cleaning area"].dtype == "float64"
+    )
+
+
+def test_read_filtered_file_matches_a_single_read() -> None:
+    expected = pd.read_csv(csv_file())
+    expected["Receive task report time"] = pd.to_datetime(expected["Receive task report time"])
+    expected = expected[expected["Receive task report time"] > CUTOFF].reset_index(drop=True)
+
+    df = read_filtered_file(csv_file(), CUTOFF)
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_read_excel_filtered_keeps_reports_after_the_cutoff() -> None:
+    df = read_excel_filtered(excel_file(EXCEL_ROWS), CUTOFF)
+
+    assert df["S/N"].tolist() == ["GS1", "GS3"]
+    assert df["Receive task report time"].tolist() == [pd.Timestamp("2024-05-01 13:00:00"), pd.Timestamp("2024-05-01 14:00:00")]
+    # Whole-number floats are read as ints, and cells past the end of a short row as missing
+    assert df["Cleaning area"].dtype == "int64"
+    assert df["Remarks"].tolist() == ["new", None]
+
+
+def test_read_excel_filtered_infers_numeric_columns_over_every_row_read() -> None:
+    rows = [["GS0", datetime(2024, 5, 1, 11, 0), "n/a", 1.5], ["GS1", datetime(2024, 5, 1, 13, 0), 11.0, 2.0]]
+
+    df = read_excel_filtered(excel_file(rows), CUTOFF)
+
+    # The text cell of a dropped row keeps the column as objects, and its float cell makes the column float
+    assert df["Cleaning area"].tolist() == [11]
+    assert df["Cleaning area"].dtype == object
+    assert df["Remarks"].dtype == "float64"
+
+
+def test_read_excel_filtered_excludes_serial_numbers_and_prunes_columns() -> None:
+    df = read_excel_filtered(excel_file(EXCEL_ROWS), CUTOFF, ["GS1"], usecols=["S/N", "Receive task report time"])
+
+    assert df.columns.tolist() == ["S/N", "Receive task report time"]
+    assert df["S/N"].tolist() == ["GS3"]
+
+
+def test_read_excel_filtered_rejects_missing_columns() -> None:
+    with pytest.raises(KeyError, match="Water usage"):
+        read_excel_filtered(excel_file(EXCEL_ROWS), CUTOFF, usecols=["S/N", "Water usage (L)"])
+
+
+def test_process_uploaded_files_drops_reports_repeated_across_files() -> None:
+    first = metric_export(
+        "first.csv",
+        [("GS1", "2024-05-01 12:30:00", "2024-05-01 13:00:00"), ("GS2", "2024-05-01 13:30:00", "2024-05-01 14:00:00")],
+    )
+    second = metric_export(
+        "second.csv",
+        [("GS2", "2024-05-01 13:30:00", "2024-05-01 14:00:00"), ("GS3", "2024-05-01 14:30:00", "2024-05-01 15:00:00")],
+    )
+
+    df = process_uploaded_files([first, second], "2024-05-01 12:00:00", datetime(2024, 6, 1, 9, 0), "GS SGV2")
+
+    assert df["serial_number"].tolist() == ["GS3", "GS2", "GS1"]
+
+
+def test_dedup_keys_match_the_same_report_read_from_csv_and_excel() -> None:
+    df = pd.DataFrame(
+        {
+            "S/N": ["GS1", " GS1 ", "GS2"],
+            "Task start time": pd.Series(["2024-05-01 12:30:00", datetime(2024, 5, 1, 12, 30), "2024/05/01 12:30"], dtype=object),
+            "Receive task report time": pd.to_datetime(["2024-05-01 13:00:00"] * 3),
+        }
+    )
+
+    keys = dedup_keys(df)
+
+    assert keys.duplicated().tolist() == [False, True, False]
+    assert keys.index.equals(df.index)
+
+
+def report_frame(report_times: list) -> pd.DataFrame:
+    """Builds a frame with one report per time, serial numbers GS0 to GSn."""
+    return pd.DataFrame(
+        {
+            "S/N": [f"GS{number}" for number in range(len(report_times))],
+            "Receive task report time": pd.to_datetime(report_times),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "report_times",
+    [
+        ["2024-05-01 11:00:00", "2024-05-01 12:00:00", "2024-05-01 12:00:01", "2024-05-01 13:00:00"],
+        ["2024-05-01 13:00:00", "2024-05-01 12:00:01", "2024-05-01 12:00:00", "2024-05-01 11:00:00"],
+        ["2024-05-01 12:00:01", "2024-05-01 11:00:00", "2024-05-01 13:00:00", "2024-05-01 12:00:00"],
+    ],
+    ids=["ascending", "descending", "unsorted"],
+)
+def test_filter_report_rows_keeps_reports_after_the_cutoff(report_times: list) -> None:
+    df = report_frame(report_times)
+
+    filtered = filter_report_rows(df, CUTOFF)
+
+    assert (filtered["Receive task report time"] > CUTOFF).all()
+    assert sorted(filtered["Receive task report time"]) == [
+        pd.Timestamp("2024-05-01 12:00:01"),
+        pd.Timestamp("2024-05-01 13:00:00"),
+    ]
+    # Surviving rows keep their order
+    assert filtered.index.is_monotonic_increasing
+
+
+def test_filter_report_rows_excludes_serial_numbers() -> None:
+    df = report_frame(["2024-05-01 13:00:00", "2024-05-01 14:00:00", "2024-05-01 15:00:00"])
+
+    filtered = filter_report_rows(df, CUTOFF, ["GS1"])
+
+    assert filtered["S/N"].tolist() == ["GS0", "GS2"]
+
+
+def test_filter_report_rows_does_not_modify_its_input() -> None:
+    df = report_frame(["2024-05-01 11:00:00", "2024-05-01 13:00:00"])
+
+    filter_report_rows(df, CUTOFF)
+
+    assert len(df) == 2
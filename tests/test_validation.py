@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.validation import (
+    REASON_COLUMN,
+    VALIDATION_RULES,
+    ValidationReport,
+    ValidationRule,
+    reason_bits,
+    reason_codes,
+    rule_mask,
+    validate_frame,
+)
+
+
+def processed_frame() -> pd.DataFrame:
+    """Builds processed rows: the first passes every rule, each other row breaks one or two."""
+    return pd.DataFrame(
+        {
+            "cleaning_area": [10.0, -1.0, 5.0, np.nan, -2.0],
+            "task_completion": pd.Series(["100", "50", "120%", "unknown", "101"], dtype=object),
+            "start_time": ["2024-05-01 10:00:00", "2024-05-01 10:00:00", "2024-05-01 10:00:00", "2024/05/01 10:00", 0],
+            "end_time": ["2024-05-01 11:00:00", "2024-05-01 11:00:00", "2024-05-01 11:00:00", "2024-05-01 09:00:00", 0],
+            "start_battery_level": pd.Series([90, 80, 70, 60, 50], dtype="int64"),
+            "end_battery_level": pd.Categorical(["50", "40", "30", "20", "10"]),
+        }
+    )
+
+
+def test_rule_mask_bounds_numbers_and_skips_unreadable_cells() -> None:
+    df = processed_frame()
+    rules = {rule.code: rule for rule in VALIDATION_RULES}
+
+    assert rule_mask(df, rules["negative_cleaning_area"]).tolist() == [False, True, False, False, True]
+    assert rule_mask(df, rules["task_completion_out_of_range"]).tolist() == [False, False, True, False, True]
+
+
+def test_rule_mask_compares_times_kept_as_read() -> None:
+    df = processed_frame()
+    rule = next(rule for rule in VALIDATION_RULES if rule.after is not None)
+
+    # Times in another layout are parsed; the 0 of a "-" placeholder never breaks the rule
+    assert rule_mask(df, rule).tolist() == [False, False, False, True, False]
+
+
+def test_reason_bits_skip_rules_on_missing_columns() -> None:
+    df = processed_frame().drop(columns=["end_time"])
+
+    bits, counts = reason_bits(df)
+
+    assert "end_before_start" not in counts
+    assert counts["negative_cleaning_area"] == 2
+    assert bits.dtype == np.uint32
+    assert bits.tolist() == [0, 0b1, 0b10, 0, 0b11]
+
+
+def test_reason_bits_rejects_too_many_rules() -> None:
+    rules = [ValidationRule(f"rule_{number}", "Too many", "cleaning_area", minimum=0.0) for number in range(33)]
+
+    with pytest.raises(ValueError, match="At most 32"):
+        reason_bits(processed_frame(), rules)
+
+
+def test_reason_codes_join_the_broken_rules() -> None:
+    codes = reason_codes(np.array([0b11, 0, 0b100, 0b11], dtype=np.uint32))
+
+    assert list(codes) == [
+        "negative_cleaning_area,task_completion_out_of_range",
+        "",
+        "end_before_start",
+        "negative_cleaning_area,task_completion_out_of_range",
+    ]
+
+
+def test_validate_frame_splits_accepted_and_rejected_rows() -> None:
+    df = processed_frame()
+    report = ValidationReport()
+
+    accepted = validate_frame(df, report=report)
+
+    assert len(accepted) == 1
+    assert accepted["cleaning_area"].tolist() == [10.0]
+    assert accepted.attrs["rejected_rows"] == {
+        "negative_cleaning_area": 2,
+        "task_completion_out_of_range": 2,
+        "end_before_start": 1,
+    }
+    assert report.total_rows == 5
+    assert report.rejected_rows == 4
+    assert report.rejected[REASON_COLUMN].tolist() == [
+        "negative_cleaning_area",
+        "task_completion_out_of_range",
+        "end_before_start",
+        "negative_cleaning_area,task_completion_out_of_range",
+    ]
+    assert "4 rows failed validation" in report.describe()
+
+
+def test_validate_frame_keeps_a_clean_frame() -> None:
+    df = processed_frame().iloc[:1]
+
+    accepted = validate_frame(df)
+
+    assert accepted is df
+    assert accepted.attrs["rejected_rows"] == {}
@@ -0,0 +1,25 @@
+from datetime import datetime
+from pathlib import Path
+
+from src.core.datetimes import parse_cutoff
+from src.watermark import WatermarkStore, format_watermark
+
+
+def test_format_watermark_keeps_fractional_seconds() -> None:
+    assert format_watermark(datetime(2024, 5, 1, 12, 30)) == "2024-05-01 12:30:00"
+    assert format_watermark(datetime(2024, 5, 1, 12, 30, 0, 250000)) == "2024-05-01 12:30:00.250000"
+
+
+def test_advance_only_moves_the_watermark_forward(tmp_path: Path) -> None:
+    store = WatermarkStore(str(tmp_path / "state.db"))
+    assert store.get("GS SGV2") is None
+
+    store.advance("GS SGV2", datetime(2024, 5, 1, 12, 30))
+    store.advance("GS SGV2", datetime(2024, 5, 1, 12, 30, 0, 500))
+    store.advance("GS SGV2", datetime(2024, 5, 1, 9, 0))
+
+    watermark = store.get("GS SGV2")
+    assert watermark == "2024-05-01 12:30:00.000500"
+    # The stored watermark is read back as the next cutoff without losing its microseconds
+    assert parse_cutoff(watermark) == datetime(2024, 5, 1, 12, 30, 0, 500)
+    assert store.get("GS CA") is None